@@ -0,0 +1,221 @@
+"""Micro-benchmarks for every registered prompt, rendered through FastMCP.
+
+Each prompt is rendered with ``PromptManager.render_prompt`` (argument
+validation, the handler and message validation, as a ``prompts/get`` request
+does) for every combination of payload size and content kind. The payload
+fills the prompt's first argument (``requirements``, ``code``,
+``article_content``, ``content``, ...) unless ``--all-arguments`` is given;
+the remaining arguments get short placeholder values.
+
+Content kinds:
+    text     plain English prose
+    code     a unified diff of Python source, one hunk line per line
+    braces   format-string look-alikes: ``{name}``, ``{{``, ``}}``, ``%s``, ``${x}``
+    unicode  CJK, emoji with modifiers and ZWJ, combining marks, RTL and
+             zero-width characters
+
+For each case the suite reports renders per second, input MB/s, p50/p95/p99
+latency and the peak bytes allocated by one render (``tracemalloc``).
+
+Usage:
+    python -m benchmarks.bench_prompts [--prompts design,review] [--sizes 1k,64k,1m]
+        [--contents text,code] [--min-time 0.2] [--all-arguments] [--cache]
+        [--instrument RATE] [--with-logging] [--json report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp.server.fastmcp import FastMCP
+
+from src.cache import RenderCacheConfig, install_render_cache
+from src.instrumentation import InstrumentationConfig, install_instrumentation
+from src.loader import register_prompts
+from src.registration import registered_prompts, sample_arguments
+
+_UNITS = {
+    "text": "The quick brown fox jumps over the lazy dog while the editor reviews the draft. ",
+    "code": (
+        "@@ -10,7 +10,9 @@ def handler(request):\n"
+        "-    data = {'id': request.id, 'items': []}\n"
+        "+    data = {'id': request.id, 'items': [i for i in request.items if i]}\n"
+        "     return render(f\"{data['id']}: {len(data['items'])}\")\n"
+    ),
+    "braces": "{name} {{escaped}} }{ {0} {!r} {content?x} {a|b} %s %(key)s ${var} {{{{ }}}} ",
+    "unicode": (
+        "naïve café — 中文内容测试，标点。 日本語のテキスト 한국어 "
+        "\U0001F600\U0001F44D\U0001F3FD \U0001F9D1‍\U0001F4BB é "
+        "​‌﻿ ‮עברית‬ العربية \U0001D54F "
+    ),
+}
+CONTENTS = tuple(_UNITS)
+DEFAULT_SIZES = "64,1k,64k,1m"
+
+
+def parse_size(text: str) -> int:
+    """Parse ``64``, ``1k`` or ``1m`` into a byte count."""
+    text = text.strip().lower()
+    multiplier = {"k": 1024, "m": 1024 * 1024}.get(text[-1:], 1)
+    return int(text[:-1] if multiplier > 1 else text) * multiplier
+
+
+def format_size(size: int) -> str:
+    for unit, scale in (("m", 1024 * 1024), ("k", 1024)):
+        if size >= scale and size % scale == 0:
+            return f"{size // scale}{unit}"
+    return str(size)
+
+
+def payload(content: str, size: int) -> str:
+    """Repeat the content unit to about ``size`` UTF-8 bytes, cut on a character."""
+    unit = _UNITS[content]
+    unit_bytes = len(unit.encode("utf-8"))
+    text = unit * (size // unit_bytes + 1)
+    chars = max(1, size * len(unit) // unit_bytes)
+    return text[:chars]
+
+
+def build_arguments(prompt, content: str, size: int, all_arguments: bool) -> Dict[str, Any]:
+    arguments = sample_arguments(prompt)
+    value = payload(content, size)
+    for index, name in enumerate(arguments):
+        if isinstance(arguments[name], str) and (all_arguments or index == 0):
+            arguments[name] = value
+    return arguments
+
+
+def argument_bytes(arguments: Dict[str, Any]) -> int:
+    return sum(len(v.encode("utf-8")) for v in arguments.values() if isinstance(v, str))
+
+
+def percentile(ordered: List[int], fraction: float) -> float:
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def measure(mcp: FastMCP, name: str, arguments: Dict[str, Any], min_time: float, min_renders: int):
+    render = mcp._prompt_manager.render_prompt
+    await render(name, arguments)  # warm up: lazy modules, caches, allocator
+
+    samples = []
+    clock = time.perf_counter_ns
+    deadline = clock() + int(min_time * 1e9)
+    while len(samples) < min_renders or clock() < deadline:
+        started = clock()
+        await render(name, arguments)
+        samples.append(clock() - started)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        await render(name, arguments)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    return samples, peak
+
+
+def summarize(name: str, content: str, size: int, arguments, samples: List[int], peak: int) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    elapsed = sum(samples) / 1e9
+    return {
+        "prompt": name,
+        "content": content,
+        "size": size,
+        "input_bytes": argument_bytes(arguments),
+        "renders": len(samples),
+        "renders_per_s": round(len(samples) / elapsed, 1),
+        "mb_per_s": round(argument_bytes(arguments) * len(samples) / elapsed / 1e6, 2),
+        "mean_us": round(statistics.fmean(samples) / 1000, 2),
+        "p50_us": round(percentile(ordered, 0.50) / 1000, 2),
+        "p95_us": round(percentile(ordered, 0.95) / 1000, 2),
+        "p99_us": round(percentile(ordered, 0.99) / 1000, 2),
+        "peak_bytes": peak,
+    }
+
+
+def build_server(cache: bool, instrument: Optional[float] = None) -> FastMCP:
+    mcp = FastMCP()
+    register_prompts(mcp, lazy=False)
+    if cache:
+        install_render_cache(mcp, RenderCacheConfig(enabled=True, max_argument_bytes=2**62))
+    if instrument is not None:
+        install_instrumentation(mcp, InstrumentationConfig(sample_rate=instrument))
+    return mcp
+
+
+async def run(options) -> List[Dict[str, Any]]:
+    mcp = build_server(options.cache, options.instrument)
+    prompts = registered_prompts(mcp)
+    if options.prompts:
+        selected = set(options.prompts.split(","))
+        unknown = selected - {p.name for p in prompts}
+        if unknown:
+            raise SystemExit(f"Unknown prompts: {', '.join(sorted(unknown))}")
+        prompts = [p for p in prompts if p.name in selected]
+    sizes = [parse_size(s) for s in options.sizes.split(",")]
+    contents = options.contents.split(",")
+    for content in contents:
+        if content not in _UNITS:
+            raise SystemExit(f"Unknown content kind: {content} (choose from {', '.join(CONTENTS)})")
+
+    header = (
+        f"{'prompt':<24}{'content':<9}{'size':>6}{'renders/s':>11}{'MB/s':>9}"
+        f"{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}{'peak B':>11}"
+    )
+    print(header)
+    print("-" * len(header))
+    results = []
+    for prompt in prompts:
+        for content in contents:
+            for size in sizes:
+                arguments = build_arguments(prompt, content, size, options.all_arguments)
+                samples, peak = await measure(mcp, prompt.name, arguments, options.min_time, options.min_renders)
+                row = summarize(prompt.name, content, size, arguments, samples, peak)
+                results.append(row)
+                print(
+                    f"{row['prompt']:<24}{content:<9}{format_size(size):>6}{row['renders_per_s']:>11.0f}"
+                    f"{row['mb_per_s']:>9.1f}{row['p50_us']:>10.1f}{row['p95_us']:>10.1f}"
+                    f"{row['p99_us']:>10.1f}{row['peak_bytes']:>11}"
+                )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--prompts", help="comma-separated prompt names (default: all)")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"payload sizes in bytes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--contents", default=",".join(CONTENTS), help="content kinds to render")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds spent per case")
+    parser.add_argument("--min-renders", type=int, default=20, help="renders per case at least")
+    parser.add_argument("--all-arguments", action="store_true", help="fill every string argument with the payload")
+    parser.add_argument("--cache", action="store_true", help="render through the render cache")
+    parser.add_argument(
+        "--instrument", type=float, metavar="RATE", help="render through the instrumentation, timing this fraction"
+    )
+    parser.add_argument("--with-logging", action="store_true", help="keep the handlers' info logging on")
+    parser.add_argument("--json", help="write results to this path")
+    options = parser.parse_args()
+
+    if not options.with_logging:
+        logging.disable(logging.INFO)
+    results = asyncio.run(run(options))
+    if options.json:
+        with open(options.json, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"\nResults written to {options.json}")
+
+
+if __name__ == "__main__":
+    main()
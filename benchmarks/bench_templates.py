@@ -0,0 +1,135 @@
+"""Benchmark compiled prompt templates against per-call f-string rendering.
+
+For every registered prompt the compiled template is compared with the
+equivalent of the previous handler body: an f-string rebuilt on each call and
+a validated ``Message`` per message.
+
+Usage:
+    python -m benchmarks.bench_templates [--number N]
+"""
+
+import argparse
+import inspect
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp.server.fastmcp.prompts.base import Message
+
+from src.prompts.article_writer import article_writer_prompt
+from src.prompts.developer import developer_prompt
+from src.prompts.english_teacher import english_teacher_prompt
+from src.prompts.ui_designer import ui_designer_prompt
+from src.prompt_store import TemplateRef
+from src.templates import PLAIN, PREFIX, PromptTemplate
+
+
+class _Capture:
+    """Stands in for FastMCP and keeps the registered handler functions."""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def prompt(self, name=None, description=None, **kwargs):
+        def decorator(fn):
+            self.handlers[name] = fn
+            return fn
+        return decorator
+
+
+def capture_templates():
+    capture = _Capture()
+    for register in (developer_prompt, ui_designer_prompt, english_teacher_prompt, article_writer_prompt):
+        register(capture)
+    templates = {}
+    for name, fn in capture.handlers.items():
+        for value in inspect.getclosurevars(fn).nonlocals.values():
+            if isinstance(value, TemplateRef):
+                value = value.current
+            if isinstance(value, PromptTemplate):
+                templates[name] = (fn, value)
+    return templates
+
+
+def _fstring_expr(segment, namespace):
+    if isinstance(segment, str):
+        return segment.replace("{", "{{").replace("}", "}}")
+    if segment.kind == PLAIN:
+        return "{%s}" % segment.name
+    # Slot texts go through the namespace: f-string expressions cannot hold backslashes.
+    text = f"_text{len(namespace)}"
+    namespace[text] = segment.text
+    if segment.kind == PREFIX:
+        return "{(%s + str(%s)) if %s else _empty}" % (text, segment.name, segment.name)
+    return "{%s if %s else %s}" % (segment.name, segment.name, text)
+
+
+def legacy_renderer(template):
+    """Generate a handler body equivalent to the pre-compiled f-string version."""
+    names = template.names
+    namespace = {"Message": Message, "_empty": ""}
+    lines = [f"def render({', '.join(names)}):", "    return ["]
+    for message in template.messages:
+        body = "".join(_fstring_expr(s, namespace) for s in message.template.segments)
+        # Message(role="system") fails validation; the cost is the same for "user".
+        lines.append(f"        Message(role='user', content=f{body!r}),")
+    lines.append("    ]")
+    exec("\n".join(lines), namespace)
+    return namespace["render"]
+
+
+def sample_arguments(fn, template):
+    """Values for the template's slots: the handler's arguments, and the
+    slots the handler computes itself (such as ``text_metrics``)."""
+    args = {}
+    for param in inspect.signature(fn).parameters.values():
+        if param.annotation is int:
+            args[param.name] = 10
+        elif param.name == "focus_areas":
+            args[param.name] = ["performance", "security"]
+        else:
+            args[param.name] = f"sample {param.name} " * 20
+    return {name: args.get(name, f"sample {name} " * 20) for name in template.names}
+
+
+def peak_bytes(fn, args):
+    tracemalloc.start()
+    try:
+        fn(**args)
+        tracemalloc.reset_peak()
+        fn(**args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="renders per measurement")
+    options = parser.parse_args()
+
+    header = f"{'prompt':<24}{'legacy us':>11}{'compiled us':>13}{'speedup':>9}{'legacy B':>10}{'compiled B':>12}"
+    print(header)
+    print("-" * len(header))
+    total_legacy = total_compiled = 0.0
+    for name, (fn, template) in capture_templates().items():
+        args = sample_arguments(fn, template)
+        legacy = legacy_renderer(template)
+        assert [m.content.text for m in legacy(**args)] == [m.content.text for m in template.render(**args)]
+        legacy_us = min(timeit.repeat(lambda: legacy(**args), number=options.number, repeat=3)) / options.number * 1e6
+        compiled_us = min(timeit.repeat(lambda: template.render(**args), number=options.number, repeat=3)) / options.number * 1e6
+        total_legacy += legacy_us
+        total_compiled += compiled_us
+        print(
+            f"{name:<24}{legacy_us:>11.2f}{compiled_us:>13.2f}{legacy_us / compiled_us:>8.1f}x"
+            f"{peak_bytes(legacy, args):>10}{peak_bytes(template.render, args):>12}"
+        )
+    print("-" * len(header))
+    print(f"{'total':<24}{total_legacy:>11.2f}{total_compiled:>13.2f}{total_legacy / total_compiled:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Cold-start profiling harness for the tobe-mcp server.
+
+Each run starts a fresh interpreter with ``-X importtime``, builds the server
+with ``src.server.create_server`` and answers ``initialize`` and
+``prompts/list`` from an in-process MCP client over memory streams (the same
+server loop ``tobe-mcp`` runs over stdio). Phase timings and per-module import
+times are aggregated over all runs and written as JSON.
+
+Usage:
+    python -m benchmarks.profile_startup [--runs N] [--output report.json]
+        [--compare baseline.json] [--eager]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PHASES = ("interpreter", "import_fastmcp", "import_server", "create_server", "initialize", "list_prompts", "total")
+REPORT_VERSION = 1
+
+
+def _child(output: str):
+    """Run inside the profiled interpreter; writes phase timings to ``output``."""
+    started = time.perf_counter()
+    timings = {}
+
+    def mark(phase, since):
+        now = time.perf_counter()
+        timings[phase] = (now - since) * 1000
+        return now
+
+    t = started
+    import mcp.server.fastmcp  # noqa: F401
+    t = mark("import_fastmcp", t)
+
+    sys.path.insert(0, str(ROOT))
+    from src.server import create_server
+    t = mark("import_server", t)
+
+    server, _ = create_server()
+    t = mark("create_server", t)
+
+    import anyio
+    from mcp.client.session import ClientSession
+    from mcp.shared.memory import create_client_server_memory_streams
+
+    async def drive():
+        nonlocal t
+        lowlevel = server._mcp_server
+        async with create_client_server_memory_streams() as (client_streams, server_streams):
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(
+                    lambda: lowlevel.run(*server_streams, lowlevel.create_initialization_options())
+                )
+                async with ClientSession(*client_streams) as session:
+                    await session.initialize()
+                    t = mark("initialize", t)
+                    result = await session.list_prompts()
+                    t = mark("list_prompts", t)
+                    timings["prompt_count"] = len(result.prompts)
+                tg.cancel_scope.cancel()
+
+    anyio.run(drive)
+    timings["total"] = (time.perf_counter() - started) * 1000
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(timings, f)
+
+
+def parse_importtime(stderr: str):
+    """Parse ``-X importtime`` output into {module: (self_us, cumulative_us)}."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        self_us, cumulative_us, name = fields
+        # Nested imports are indented; the last timing of a module wins.
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def run_once(eager: bool):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="0")
+    if eager:
+        env["TOBE_MCP_LAZY_PROMPTS"] = "0"
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "timings.json")
+        code = f"from benchmarks.profile_startup import _child; _child({output!r})"
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=str(ROOT), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        wall = (time.perf_counter() - started) * 1000
+        if proc.returncode != 0:
+            raise RuntimeError(f"profiled server failed:\n{proc.stderr[-2000:]}")
+        with open(output, "r", encoding="utf-8") as f:
+            timings = json.load(f)
+    timings["interpreter"] = max(0.0, wall - timings["total"])
+    timings["total"] = wall
+    return timings, parse_importtime(proc.stderr)
+
+
+def summarize(values):
+    return {
+        "median_ms": round(statistics.median(values), 3),
+        "min_ms": round(min(values), 3),
+        "max_ms": round(max(values), 3),
+    }
+
+
+def build_report(runs: int, eager: bool, top: int):
+    phase_values = defaultdict(list)
+    module_values = defaultdict(list)
+    prompt_count = None
+    for _ in range(runs):
+        timings, modules = run_once(eager)
+        prompt_count = timings.get("prompt_count")
+        for phase in PHASES:
+            phase_values[phase].append(timings[phase])
+        for name, (self_us, cumulative_us) in modules.items():
+            module_values[name].append((self_us, cumulative_us))
+
+    imports = {}
+    for name, samples in module_values.items():
+        imports[name] = {
+            "self_ms": round(statistics.median(s[0] for s in samples) / 1000, 3),
+            "cumulative_ms": round(statistics.median(s[1] for s in samples) / 1000, 3),
+        }
+    packages = defaultdict(float)
+    for name, timing in imports.items():
+        packages[name.split(".")[0]] += timing["self_ms"]
+
+    return {
+        "version": REPORT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "mode": "eager" if eager else "lazy",
+        "runs": runs,
+        "prompt_count": prompt_count,
+        "phases": {phase: summarize(phase_values[phase]) for phase in PHASES},
+        "packages": dict(sorted(((k, round(v, 3)) for k, v in packages.items()), key=lambda kv: -kv[1])[:top]),
+        "modules": dict(sorted(imports.items(), key=lambda kv: -kv[1]["self_ms"])[:top]),
+    }
+
+
+def print_report(report, baseline=None):
+    print(f"tobe-mcp cold start ({report['mode']}, {report['runs']} runs, {report['prompt_count']} prompts)")
+    header = f"{'phase':<16}{'median ms':>11}{'min ms':>9}{'max ms':>9}"
+    if baseline:
+        header += f"{'baseline':>10}{'delta':>9}"
+    print(header)
+    print("-" * len(header))
+    for phase, stats in report["phases"].items():
+        line = f"{phase:<16}{stats['median_ms']:>11.1f}{stats['min_ms']:>9.1f}{stats['max_ms']:>9.1f}"
+        if baseline and phase in baseline["phases"]:
+            before = baseline["phases"][phase]["median_ms"]
+            change = (stats["median_ms"] - before) / before if before else 0.0
+            line += f"{before:>10.1f}{change:>+9.1%}"
+        print(line)
+    print()
+    print("Slowest packages (self import time, ms):")
+    for name, ms in list(report["packages"].items())[:10]:
+        print(f"  {name:<30}{ms:>8.1f}")
+    print("Slowest modules (self import time, ms):")
+    for name, timing in list(report["modules"].items())[:10]:
+        print(f"  {name:<50}{timing['self_ms']:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="number of cold starts to measure")
+    parser.add_argument("--output", help="write the JSON report to this path")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--eager", action="store_true", help="register prompt modules eagerly")
+    parser.add_argument("--top", type=int, default=50, help="modules and packages kept in the report")
+    options = parser.parse_args()
+
+    report = build_report(options.runs, options.eager, options.top)
+    baseline = None
+    if options.compare:
+        with open(options.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {options.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     packages=find_packages(),
+    package_data={"src.prompts": ["data/*/*.toml", "bundle.bin"]},
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -28,6 +29,7 @@ setup(
     install_requires=[
         "mcp>=1.13.1",
         "pydantic>=2.0.0",
+        "tomli>=1.1.0; python_version < '3.11'",
     ],
     extras_require={
         "dev": [
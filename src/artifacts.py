@@ -0,0 +1,273 @@
+"""Persistent store for generated outputs, keyed by prompt and arguments.
+
+Clients save what the model produced for a prompt (a word lesson, a design
+system, an article) and look it up before generating it again. Artifacts are
+kept in a local SQLite database:
+
+- an artifact's key is a digest of the prompt name and its normalized
+  arguments (sorted keys, Unicode NFC, surrounding whitespace stripped,
+  ``None`` values dropped), so equivalent requests share a key while values
+  differing in indentation or line breaks do not;
+- contents are stored once per content digest, however many keys produce
+  the same text;
+- ``(prompt, created)`` and ``accessed`` are indexed for listing by prompt and
+  age and for eviction: when the contents exceed ``max_bytes``, the least
+  recently used artifacts are removed until the store is back under 90%.
+
+The database uses write-ahead logging, so several worker processes can share
+it. Each thread of each process opens its own connection.
+
+Environment variables:
+
+- ``TOBE_MCP_ARTIFACTS``: ``0`` disables the artifact tools (default ``1``).
+- ``TOBE_MCP_ARTIFACT_DB``: database path (default
+  ``$XDG_CACHE_HOME/tobe-mcp/artifacts.db``).
+- ``TOBE_MCP_ARTIFACT_MAX_BYTES``: content kept before eviction (default
+  256 MiB).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.logger import get_logger
+
+ARTIFACT_SCHEME = "artifact"
+# Evict down to this share of max_bytes, so eviction runs in batches.
+LOW_WATER = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contents (
+    digest TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    key TEXT PRIMARY KEY,
+    prompt TEXT NOT NULL,
+    arguments TEXT NOT NULL,
+    digest TEXT NOT NULL REFERENCES contents(digest),
+    size INTEGER NOT NULL,
+    metadata TEXT,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS artifacts_prompt_created ON artifacts (prompt, created);
+CREATE INDEX IF NOT EXISTS artifacts_created ON artifacts (created);
+CREATE INDEX IF NOT EXISTS artifacts_accessed ON artifacts (accessed);
+CREATE INDEX IF NOT EXISTS artifacts_digest ON artifacts (digest);
+"""
+
+logger = get_logger("artifacts")
+
+
+def artifacts_enabled() -> bool:
+    return os.environ.get("TOBE_MCP_ARTIFACTS", "1").lower() not in ("0", "false", "no", "off")
+
+
+def default_path() -> Path:
+    path = os.environ.get("TOBE_MCP_ARTIFACT_DB")
+    if path:
+        return Path(path)
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache) / "tobe-mcp" / "artifacts.db"
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        # Whitespace inside a value is meaningful (code, paragraphs); only the ends are not.
+        return unicodedata.normalize("NFC", value).strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def normalize_arguments(arguments: Optional[Dict[str, Any]]) -> str:
+    """Canonical JSON of the arguments, the basis of the artifact key."""
+    return json.dumps(_normalize(arguments or {}), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def artifact_key(prompt: str, arguments: Optional[Dict[str, Any]]) -> str:
+    payload = f"{prompt}\0{normalize_arguments(arguments)}"
+    return hashlib.blake2b(payload.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+def artifact_uri(key: str) -> str:
+    return f"{ARTIFACT_SCHEME}://{key}"
+
+
+class ArtifactStore:
+    """SQLite-backed artifact store; safe to share between threads and processes."""
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.path = Path(path) if path is not None else default_path()
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("TOBE_MCP_ARTIFACT_MAX_BYTES", 256 * 1024 * 1024))
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        # A connection must not cross a fork: reopen in the child.
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    def put(self, prompt: str, arguments: Optional[Dict[str, Any]], content: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Store ``content`` for the prompt and arguments, replacing any previous one."""
+        key = artifact_key(prompt, arguments)
+        encoded = content.encode("utf-8", "surrogatepass")
+        digest = hashlib.blake2b(encoded, digest_size=16).hexdigest()
+        size = len(encoded)
+        if size > self.max_bytes:
+            raise ValueError(f"Artifact is {size} bytes, over the store limit of {self.max_bytes}")
+        now = time.time()
+        connection = self._connect()
+        with _transaction(connection):
+            connection.execute(
+                "INSERT OR IGNORE INTO contents (digest, content, size) VALUES (?, ?, ?)", (digest, content, size)
+            )
+            previous = connection.execute("SELECT digest FROM artifacts WHERE key = ?", (key,)).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO artifacts (key, prompt, arguments, digest, size, metadata, created, accessed, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (key, prompt, normalize_arguments(arguments), digest, size,
+                 json.dumps(metadata) if metadata else None, now, now),
+            )
+            if previous is not None and previous["digest"] != digest:
+                _drop_orphan(connection, previous["digest"])
+            self._evict(connection)
+        return {"key": key, "uri": artifact_uri(key), "digest": digest, "size": size, "created": now}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """The artifact stored under ``key``, or ``None``; counts as a use."""
+        connection = self._connect()
+        row = connection.execute(
+            "SELECT a.key, a.prompt, a.arguments, a.digest, a.size, a.metadata, a.created, a.hits, c.content "
+            "FROM artifacts a JOIN contents c ON c.digest = a.digest WHERE a.key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        connection.execute("UPDATE artifacts SET accessed = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+        return _artifact(row, content=True)
+
+    def lookup(self, prompt: str, arguments: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        return self.get(artifact_key(prompt, arguments))
+
+    def list(self, prompt: Optional[str] = None, max_age: Optional[float] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Newest first, optionally for one prompt and no older than ``max_age`` seconds."""
+        clauses, parameters = [], []
+        if prompt:
+            clauses.append("prompt = ?")
+            parameters.append(prompt)
+        if max_age is not None:
+            clauses.append("created >= ?")
+            parameters.append(time.time() - max_age)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connect().execute(
+            "SELECT key, prompt, arguments, digest, size, metadata, created, hits FROM artifacts "
+            f"{where} ORDER BY created DESC LIMIT ?",
+            (*parameters, limit),
+        ).fetchall()
+        return [_artifact(row) for row in rows]
+
+    def delete(self, key: str) -> bool:
+        connection = self._connect()
+        with _transaction(connection):
+            row = connection.execute("SELECT digest FROM artifacts WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return False
+            connection.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+            _drop_orphan(connection, row["digest"])
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        connection = self._connect()
+        artifacts, = connection.execute("SELECT COUNT(*) FROM artifacts").fetchone()
+        contents, size = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM contents").fetchone()
+        return {"artifacts": artifacts, "contents": contents, "bytes": size, "max_bytes": self.max_bytes}
+
+    def _evict(self, connection: sqlite3.Connection):
+        total, = connection.execute("SELECT COALESCE(SUM(size), 0) FROM contents").fetchone()
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * LOW_WATER)
+        evicted = 0
+        for row in connection.execute("SELECT key, digest FROM artifacts ORDER BY accessed").fetchall():
+            if total <= target:
+                break
+            connection.execute("DELETE FROM artifacts WHERE key = ?", (row["key"],))
+            total -= _drop_orphan(connection, row["digest"])
+            evicted += 1
+        logger.info("Evicted %d artifacts, %d bytes left", evicted, total)
+
+
+def _drop_orphan(connection: sqlite3.Connection, digest: str) -> int:
+    """Delete a content no artifact refers to any more; returns its size."""
+    if connection.execute("SELECT 1 FROM artifacts WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+        return 0
+    row = connection.execute("SELECT size FROM contents WHERE digest = ?", (digest,)).fetchone()
+    connection.execute("DELETE FROM contents WHERE digest = ?", (digest,))
+    return row["size"] if row else 0
+
+
+class _transaction:
+    """``BEGIN IMMEDIATE`` ... ``COMMIT``, rolled back on error."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+def _artifact(row: sqlite3.Row, content: bool = False) -> Dict[str, Any]:
+    artifact = {
+        "key": row["key"],
+        "uri": artifact_uri(row["key"]),
+        "prompt": row["prompt"],
+        "arguments": json.loads(row["arguments"]),
+        "digest": row["digest"],
+        "size": row["size"],
+        "metadata": json.loads(row["metadata"]) if row["metadata"] else None,
+        "created": row["created"],
+        "hits": row["hits"],
+    }
+    if content:
+        artifact["content"] = row["content"]
+    return artifact
+
+
+_store: Optional[ArtifactStore] = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """The process-wide store; the database is opened on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ArtifactStore()
+    return _store
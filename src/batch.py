@@ -0,0 +1,137 @@
+"""Render many prompts in one call.
+
+:func:`render_batch` takes ``(prompt name, arguments)`` pairs and renders them
+through the server's prompt manager, exactly as ``prompts/get`` would, with
+at most ``workers`` renders running at once. Results are yielded as a stream,
+in input order or as they complete, and a failing item yields a result
+carrying its error instead of stopping the batch.
+
+Items are rendered in this process, so they share its render cache, source
+cache and metrics. An item takes microseconds of CPU, far less than shipping
+it to another process would, so with one worker the batch is rendered
+serially; more workers render in a bounded thread pool, which overlaps items
+that wait on files or ``git``. Nothing is forked: forking a multithreaded
+server from a request thread can leave locks held in the child.
+
+    from src.batch import render_batch
+    from src.server import create_server
+
+    mcp, _ = create_server(lazy=False)
+    items = [("vocabulary_builder", {"topic": topic}) for topic in syllabus]
+    for result in render_batch(mcp, items, ordered=False):
+        ...
+
+Environment variables:
+
+- ``TOBE_MCP_BATCH_WORKERS``: default number of workers (default: CPU count).
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.prompts.base import Message
+
+BatchItem = Tuple[str, Dict[str, Any]]
+
+
+class BatchResult:
+    """The outcome of one batch item: its messages, or the error it raised."""
+
+    __slots__ = ("index", "name", "messages", "error", "duration")
+
+    def __init__(
+        self,
+        index: int,
+        name: str,
+        messages: Optional[List[Message]] = None,
+        error: Optional[str] = None,
+        duration: float = 0.0,
+    ):
+        self.index = index
+        self.name = name
+        self.messages = messages
+        self.error = error
+        self.duration = duration
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "prompt": self.name,
+            "messages": [message.model_dump(mode="json") for message in self.messages or []],
+            "error": self.error,
+            "duration": round(self.duration, 6),
+        }
+
+
+def default_workers() -> int:
+    value = os.environ.get("TOBE_MCP_BATCH_WORKERS")
+    return max(1, int(value)) if value else (os.cpu_count() or 1)
+
+
+def _render(mcp: FastMCP, loop: asyncio.AbstractEventLoop, job: Tuple[int, str, Dict[str, Any]]) -> BatchResult:
+    index, name, arguments = job
+    started = time.perf_counter()
+    try:
+        messages = loop.run_until_complete(mcp._prompt_manager.render_prompt(name, arguments))
+    except Exception as e:
+        return BatchResult(index, name, error=str(e), duration=time.perf_counter() - started)
+    return BatchResult(index, name, messages, duration=time.perf_counter() - started)
+
+
+def _jobs(items: Iterable[BatchItem]) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+    for index, (name, arguments) in enumerate(items):
+        yield index, name, dict(arguments or {})
+
+
+def _render_threads(mcp: FastMCP, items: Iterable[BatchItem], workers: int, ordered: bool):
+    local = threading.local()
+    loops: List[asyncio.AbstractEventLoop] = []
+
+    def render(job):
+        loop = getattr(local, "loop", None)
+        if loop is None:
+            loop = local.loop = asyncio.new_event_loop()
+            loops.append(loop)
+        return _render(mcp, loop, job)
+
+    try:
+        with ThreadPoolExecutor(workers, thread_name_prefix="batch") as executor:
+            if ordered:
+                yield from executor.map(render, _jobs(items))
+            else:
+                for future in as_completed([executor.submit(render, job) for job in _jobs(items)]):
+                    yield future.result()
+    finally:
+        for loop in loops:
+            loop.close()
+
+
+def render_batch(
+    mcp: FastMCP,
+    items: Iterable[BatchItem],
+    workers: Optional[int] = None,
+    ordered: bool = True,
+) -> Iterator[BatchResult]:
+    """Render ``items`` with at most ``workers`` at once, yielding each result.
+
+    ``ordered`` yields results in input order; otherwise as they complete.
+    """
+    workers = workers or default_workers()
+    if workers > 1:
+        yield from _render_threads(mcp, items, workers, ordered)
+        return
+    loop = asyncio.new_event_loop()
+    try:
+        for job in _jobs(items):
+            yield _render(mcp, loop, job)
+    finally:
+        loop.close()
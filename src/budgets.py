@@ -0,0 +1,274 @@
+"""Token budgets for rendered prompts.
+
+Every render is measured with :func:`src.tokens.estimate_tokens`. A render
+over its prompt's budget is handled by the prompt's policy, applied to one
+argument: the one named in the policy, or else the longest string argument.
+
+- ``reject`` fails the request with :class:`BudgetError`, before anything is
+  sent to a model.
+- ``truncate`` keeps the start of the argument, cut at a line or word break,
+  with a note of how much was left out.
+- ``chunk`` splits the argument into parts that each fit, and adds an
+  optional ``chunk`` argument (1-based, default 1) selecting the part to
+  render. Clients render each part in turn.
+
+The first rendered message reports the outcome in
+``_meta["tobe-mcp/tokens"]``: ``prompt_tokens``, ``message_tokens`` (one
+count per message), ``budget`` and, when the policy applied, the
+``argument`` it cut with its ``argument_tokens`` and ``kept_tokens``, or
+``chunk`` and ``chunks``. Estimating costs well under a microsecond per
+kilobyte of ASCII text; only renders over budget are rendered again.
+
+Environment variables:
+
+- ``TOBE_MCP_TOKEN_BUDGETS``: ``0`` removes the wrapper (default ``1``).
+- ``TOBE_MCP_TOKEN_BUDGET``: estimated tokens allowed per rendered prompt
+  (default 150000).
+- ``TOBE_MCP_TOKEN_POLICY``: ``reject``, ``truncate`` or ``chunk`` (default
+  ``reject``).
+- ``TOBE_MCP_TOKEN_BUDGET_CONFIG``: path to a JSON file with the same
+  settings (``enabled``, ``budget``, ``policy``) and a ``prompts`` object of
+  per-prompt overrides, e.g.
+  ``{"prompts": {"review": {"budget": 50000, "policy": "chunk", "argument": "code"}}}``.
+"""
+
+import inspect
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.prompts.base import Message, Prompt, PromptArgument
+
+from src.config import parse_flag
+from src.logger import get_logger
+from src.registration import wrap_prompts
+from src.templates import with_meta
+from src.tokens import estimate_tokens, split_text, truncate
+
+REJECT = "reject"
+TRUNCATE = "truncate"
+CHUNK = "chunk"
+POLICIES = (REJECT, TRUNCATE, CHUNK)
+
+CHUNK_ARGUMENT = "chunk"
+TOKENS_META = "tobe-mcp/tokens"
+# Below this many tokens a cut argument is no longer worth sending.
+MIN_ARGUMENT_TOKENS = 64
+# Tokens kept free for the truncation note and part header.
+NOTE_TOKENS = 24
+# Renders tried before giving up on fitting an argument.
+ATTEMPTS = 4
+
+logger = get_logger("budgets")
+
+
+class BudgetError(ValueError):
+    """Raised when a prompt cannot be rendered within its token budget."""
+
+
+class PromptBudgetPolicy:
+    """Per-prompt budget settings; ``None`` falls back to the global value."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        budget: Optional[int] = None,
+        policy: Optional[str] = None,
+        argument: Optional[str] = None,
+    ):
+        if policy is not None and policy not in POLICIES:
+            raise ValueError(f"Unknown budget policy {policy!r}; choose from {', '.join(POLICIES)}")
+        self.enabled = enabled
+        self.budget = budget
+        self.policy = policy
+        self.argument = argument
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PromptBudgetPolicy":
+        return cls(
+            enabled=parse_flag(data.get("enabled", True)),
+            budget=int(data["budget"]) if data.get("budget") is not None else None,
+            policy=data.get("policy"),
+            argument=data.get("argument"),
+        )
+
+
+class BudgetConfig:
+    """Global budget and policy plus per-prompt overrides."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        budget: int = 150_000,
+        policy: str = REJECT,
+        prompts: Optional[Dict[str, PromptBudgetPolicy]] = None,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown budget policy {policy!r}; choose from {', '.join(POLICIES)}")
+        self.enabled = enabled
+        self.budget = budget
+        self.policy = policy
+        self.prompts = prompts or {}
+
+    def policy_for(self, name: str) -> PromptBudgetPolicy:
+        return self.prompts.get(name) or PromptBudgetPolicy()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BudgetConfig":
+        defaults = cls()
+        return cls(
+            enabled=parse_flag(data.get("enabled", defaults.enabled)),
+            budget=int(data.get("budget", defaults.budget)),
+            policy=data.get("policy", defaults.policy),
+            prompts={name: PromptBudgetPolicy.from_dict(policy) for name, policy in data.get("prompts", {}).items()},
+        )
+
+    @classmethod
+    def from_env(cls) -> "BudgetConfig":
+        data: Dict[str, Any] = {}
+        path = os.environ.get("TOBE_MCP_TOKEN_BUDGET_CONFIG")
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                data.update(json.load(f))
+        env_map = {
+            "TOBE_MCP_TOKEN_BUDGETS": ("enabled", parse_flag),
+            "TOBE_MCP_TOKEN_BUDGET": ("budget", int),
+            "TOBE_MCP_TOKEN_POLICY": ("policy", str.lower),
+        }
+        for var, (key, convert) in env_map.items():
+            if var in os.environ:
+                data[key] = convert(os.environ[var])
+        return cls.from_dict(data)
+
+
+def message_tokens(messages: List[Message]) -> List[int]:
+    """Estimated tokens of each message's text."""
+    return [estimate_tokens(getattr(message.content, "text", "") or "") for message in messages]
+
+
+def _target(arguments: Dict[str, Any], argument: Optional[str]) -> Optional[str]:
+    if argument is not None:
+        return argument if isinstance(arguments.get(argument), str) else None
+    texts = [(len(value), name) for name, value in arguments.items() if isinstance(value, str)]
+    return max(texts)[1] if texts else None
+
+
+def _chunk_number(value: Any, name: str) -> int:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise BudgetError(f"{name}: {CHUNK_ARGUMENT} must be a part number, not {value!r}") from None
+    if number < 1:
+        raise BudgetError(f"{name}: {CHUNK_ARGUMENT} starts at 1")
+    return number
+
+
+def _budgeted(config: BudgetConfig, prompt: Prompt, fn: Callable) -> Optional[Callable]:
+    settings = config.policy_for(prompt.name)
+    if not settings.enabled:
+        return None
+    name = prompt.name
+    budget = settings.budget if settings.budget is not None else config.budget
+    policy = settings.policy or config.policy
+    argument = settings.argument
+    if policy == CHUNK:
+        prompt.arguments = list(prompt.arguments or []) + [PromptArgument(
+            name=CHUNK_ARGUMENT,
+            description="Part to render, from 1, when the input is split to fit the token budget (default 1)",
+            required=False,
+        )]
+
+    # The budget logic is written as a generator of renders: it yields the
+    # arguments of each render and is sent back the messages, so the same
+    # steps serve handlers that render synchronously and asynchronously.
+    def fit(arguments: Dict[str, Any], chunk: int, total: int):
+        """Render with the target argument cut down until the prompt fits."""
+        target = _target(arguments, argument)
+        if target is None:
+            raise BudgetError(f"{name}: about {total} tokens, over the budget of {budget}")
+        value = arguments[target]
+        value_tokens = estimate_tokens(value)
+        # Assume the argument is rendered once; later attempts correct for more.
+        allowed = value_tokens - (total - budget) - NOTE_TOKENS
+        for _ in range(ATTEMPTS):
+            if allowed < MIN_ARGUMENT_TOKENS:
+                break
+            if policy == TRUNCATE:
+                kept = truncate(value, allowed)
+                kept_tokens = estimate_tokens(kept)
+                part = f"{kept}\n\n[... about {value_tokens - kept_tokens} of {value_tokens} tokens left out]"
+                report = {"argument": target, "argument_tokens": value_tokens, "kept_tokens": kept_tokens}
+            else:
+                parts = split_text(value, allowed)
+                if chunk > len(parts):
+                    raise BudgetError(f"{name}: {target} has {len(parts)} parts, not {chunk}")
+                part = f"[Part {chunk} of {len(parts)}]\n{parts[chunk - 1]}"
+                report = {"argument": target, "chunk": chunk, "chunks": len(parts)}
+            messages = yield {**arguments, target: part}
+            tokens = message_tokens(messages)
+            if sum(tokens) <= budget:
+                return messages, tokens, report
+            allowed -= sum(tokens) - budget
+        raise BudgetError(f"{name}: about {total} tokens, over the budget of {budget}, and {target} cannot be cut to fit")
+
+    def renders(arguments: Dict[str, Any]):
+        chunk = arguments.pop(CHUNK_ARGUMENT, None) if policy == CHUNK else None
+        chunk = _chunk_number(chunk, name) if chunk else 1
+        messages = yield arguments
+        tokens = message_tokens(messages)
+        total = sum(tokens)
+        report: Dict[str, Any] = {}
+        if total > budget:
+            if policy == REJECT:
+                raise BudgetError(f"{name}: about {total} tokens, over the budget of {budget}")
+            messages, tokens, report = yield from fit(arguments, chunk, total)
+            logger.info("%s: %s about %d tokens to %d", name, policy, total, sum(tokens))
+        elif chunk > 1:
+            raise BudgetError(f"{name}: the input fits the budget in one part, not {chunk}")
+        elif policy == CHUNK:
+            report = {"chunk": 1, "chunks": 1}
+        if not messages:
+            return messages
+        # Only the first message is copied: rendered messages may be cached.
+        meta = {"prompt_tokens": sum(tokens), "message_tokens": tokens, "budget": budget, **report}
+        return [with_meta(messages[0], TOKENS_META, meta), *messages[1:]]
+
+    if inspect.iscoroutinefunction(fn):
+        async def render(**arguments: Any):
+            steps = renders(arguments)
+            try:
+                request = next(steps)
+                while True:
+                    request = steps.send(await fn(**request))
+            except StopIteration as done:
+                return done.value
+
+        render.__wrapped__ = fn
+        return render
+
+    def render(**arguments: Any):
+        steps = renders(arguments)
+        try:
+            request = next(steps)
+            while True:
+                request = steps.send(fn(**request))
+        except StopIteration as done:
+            return done.value
+
+    render.__wrapped__ = fn
+    return render
+
+
+def install_budgets(mcp: FastMCP, config: Optional[BudgetConfig] = None) -> Optional[BudgetConfig]:
+    """Enforce token budgets on every registered prompt of ``mcp``.
+
+    Install after the render cache, so a cut argument is cached as cut, and
+    before sources, so budgets apply to the text a source reference reads.
+    """
+    config = config or BudgetConfig.from_env()
+    if not config.enabled:
+        return None
+    wrapped = wrap_prompts(mcp, lambda prompt, fn: _budgeted(config, prompt, fn))
+    logger.debug("Token budgets on: %s", wrapped)
+    return config
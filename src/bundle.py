@@ -0,0 +1,206 @@
+"""Precompiled prompt bundle: every prompt template in a single file.
+
+``python -m src.bundle`` parses, compacts and compiles every prompt data file
+and writes ``src/prompts/bundle.bin``: the segment tables and generated render
+code of each message, the argument schema, description and source of each
+prompt, in ``marshal`` format. :class:`src.prompt_store.PromptStore` loads it
+with one read instead of parsing TOML and template sources at startup.
+
+The bundle is used only if it was built by the same bundle format and Python
+version, with the same compaction and layout settings, and from data files
+and a template engine with the same contents (BLAKE2 digests, with data files
+keyed by their path relative to the data directory). Paths and modification
+times are not compared, so a bundle installed with the package or copied into
+an image stays valid. Otherwise the prompts are compiled from source.
+
+    python -m src.bundle          # build the bundle
+    python -m src.bundle --check  # exit 1 if the bundle is missing or stale
+
+Environment variables:
+
+- ``TOBE_MCP_PROMPT_BUNDLE``: bundle path, or ``0`` to always compile from
+  source.
+"""
+
+import argparse
+import hashlib
+import logging
+import marshal
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src import compaction, layout
+from src.prompt_store import DATA_DIR, PromptSpec, PromptStoreError, load_directory
+from src.templates import MessageTemplate, PromptTemplate, Template
+
+BUNDLE_FORMAT = 4
+BUNDLE_PATH = Path(__file__).parent / "prompts" / "bundle.bin"
+# A change to any of these can change compiled output.
+ENGINE_FILES = (
+    Path(__file__).parent / "templates.py",
+    Path(__file__).parent / "compaction.py",
+    Path(__file__).parent / "layout.py",
+    Path(__file__),
+)
+
+
+def bundle_path() -> Optional[Path]:
+    value = os.environ.get("TOBE_MCP_PROMPT_BUNDLE")
+    if value is None:
+        return BUNDLE_PATH
+    if value.lower() in ("", "0", "false", "no", "off"):
+        return None
+    return Path(value)
+
+
+def _digest(path: Path) -> str:
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+
+def _data_digests(directory: Path) -> Dict[str, str]:
+    """Content digest of every data file, keyed by its path relative to ``directory``."""
+    return {
+        path.relative_to(directory).as_posix(): _digest(path)
+        for path in sorted(directory.rglob("*.toml"))
+    }
+
+
+def _header(directory: Path, compact: bool, message_layout: str) -> Dict[str, Any]:
+    # Contents, not paths or modification times, so an installed or copied
+    # bundle still matches the data files installed next to it.
+    return {
+        "format": BUNDLE_FORMAT,
+        "python": sys.implementation.cache_tag,
+        "compact": compact,
+        "layout": message_layout,
+        "data": _data_digests(directory),
+        "engine": {path.name: _digest(path) for path in ENGINE_FILES},
+    }
+
+
+def build_bundle(directory: Path = DATA_DIR, compact: Optional[bool] = None) -> bytes:
+    """Compile every prompt under ``directory`` into bundle bytes."""
+    if compact is None:
+        compact = compaction.is_enabled()
+    header = _header(directory, compact, layout.get_layout())
+    previous = compaction.is_enabled()
+    compaction.set_enabled(compact)
+    try:
+        prompts = []
+        for spec in load_directory(directory).values():
+            spec.validate()
+            prompts.append({
+                "name": spec.name,
+                "title": spec.title,
+                "description": spec.description,
+                "arguments": spec.arguments,
+                "messages": spec.messages,
+                "computed": spec.computed,
+                "large": spec.large,
+                "constants": spec.constants,
+                "path": str(spec.path.relative_to(directory)) if spec.path else None,
+                "compiled": [
+                    (message.role, message.template.table(), message.template.code)
+                    for message in spec.template.messages
+                ],
+            })
+    finally:
+        compaction.set_enabled(previous)
+    return marshal.dumps({"header": header, "prompts": prompts})
+
+
+def write_bundle(path: Path = BUNDLE_PATH, directory: Path = DATA_DIR) -> int:
+    """Build the bundle and replace ``path`` atomically; returns its size."""
+    data = build_bundle(directory)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return len(data)
+
+
+def _read(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        data = path.read_bytes()
+        bundle = marshal.loads(data)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return bundle if isinstance(bundle, dict) else None
+
+
+def is_current(bundle: Optional[Dict[str, Any]], directory: Path) -> bool:
+    if bundle is None:
+        return False
+    try:
+        return bundle.get("header") == _header(directory, compaction.is_enabled(), layout.get_layout())
+    except OSError:
+        return False
+
+
+def load_bundle(directory: Path, path: Optional[Path] = None) -> Optional[Dict[str, PromptSpec]]:
+    """Prompt specs with precompiled templates, or ``None`` if missing or stale."""
+    path = path or bundle_path()
+    if path is None:
+        return None
+    bundle = _read(path)
+    if not is_current(bundle, directory):
+        return None
+    settings = (bundle["header"]["compact"], bundle["header"]["layout"])
+    specs = {}
+    for entry in bundle["prompts"]:
+        spec = PromptSpec(
+            name=entry["name"],
+            description=entry["description"],
+            arguments=[tuple(argument) for argument in entry["arguments"]],
+            messages=[tuple(message) for message in entry["messages"]],
+            constants=entry["constants"],
+            path=directory / entry["path"] if entry["path"] else None,
+            title=entry["title"],
+            computed=entry["computed"],
+            large=entry["large"],
+        )
+        spec._compiled = (settings, layout.annotate(PromptTemplate([
+            MessageTemplate(role, Template.from_table(table, code)) for role, table, code in entry["compiled"]
+        ]), settings[1]))
+        specs[spec.name] = spec
+    return specs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the precompiled prompt bundle.")
+    parser.add_argument("--check", action="store_true", help="exit 1 if the bundle is missing or stale")
+    parser.add_argument("--output", type=Path, help=f"bundle path (default: {BUNDLE_PATH})")
+    options = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    directory = Path(os.environ.get("TOBE_MCP_PROMPT_DIR") or DATA_DIR)
+    path = options.output or bundle_path() or BUNDLE_PATH
+    if options.check:
+        if not is_current(_read(path), directory):
+            print(f"{path} is missing or out of date; run python -m src.bundle")
+            sys.exit(1)
+        print(f"{path} is up to date")
+        return
+
+    try:
+        size = write_bundle(path, directory)
+    except PromptStoreError as e:
+        print(f"Cannot build the bundle: {e}")
+        sys.exit(1)
+    started = time.perf_counter()
+    for spec in load_directory(directory).values():
+        spec.template
+    source_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    specs = load_bundle(directory, path)
+    bundle_ms = (time.perf_counter() - started) * 1000
+    print(
+        f"Wrote {path}: {len(specs)} prompts, {size} bytes; "
+        f"loads in {bundle_ms:.1f} ms ({source_ms:.1f} ms from source)"
+    )
+
+
+if __name__ == "__main__":
+    main()
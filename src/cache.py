@@ -0,0 +1,308 @@
+"""Render cache for TOBE MCP prompts.
+
+Rendered prompts are cached per prompt name and arguments in a bounded LRU
+with an optional TTL. Limits apply to both entry count and total bytes held,
+and each prompt can be tuned or excluded through :class:`RenderCacheConfig`.
+
+Environment variables:
+
+- ``TOBE_MCP_CACHE_ENABLED``: ``0`` disables the cache (default ``1``).
+- ``TOBE_MCP_CACHE_MAX_ENTRIES``: maximum cached renders (default 1024).
+- ``TOBE_MCP_CACHE_MAX_BYTES``: maximum bytes held (default 64 MiB).
+- ``TOBE_MCP_CACHE_TTL``: seconds before an entry expires, ``0`` for never
+  (default 3600).
+- ``TOBE_MCP_CACHE_CONFIG``: path to a JSON file with the same settings
+  (``max_entries``, ``max_bytes``, ``ttl``, ``max_argument_bytes``) and a
+  ``prompts`` object of per-prompt overrides, e.g.
+  ``{"prompts": {"article_editor": {"enabled": false}}}``.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.prompts.base import Prompt
+
+from src.config import parse_flag
+from src.registration import wrap_prompts
+
+
+def argument_size(arguments: Dict[str, Any]) -> int:
+    """Approximate size of the arguments in characters."""
+    size = 0
+    for value in arguments.values():
+        size += len(value) if isinstance(value, (str, bytes, list, tuple)) else 8
+    return size
+
+
+def cache_key(name: str, arguments: Dict[str, Any]) -> Tuple[str, str]:
+    """Stable key for a prompt render: the prompt name plus an argument digest."""
+    payload = json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.blake2b(payload.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+    return name, digest
+
+
+def result_size(messages: List[Any]) -> int:
+    """Bytes held by the text of rendered messages."""
+    size = 0
+    for message in messages:
+        text = getattr(getattr(message, "content", None), "text", None)
+        size += sys.getsizeof(text if text is not None else message)
+    return size
+
+
+class PromptCachePolicy:
+    """Per-prompt cache settings."""
+
+    def __init__(self, enabled: bool = True, ttl: Optional[float] = None, max_argument_bytes: Optional[int] = None):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_argument_bytes = max_argument_bytes
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PromptCachePolicy":
+        return cls(
+            enabled=parse_flag(data.get("enabled", True)),
+            ttl=data.get("ttl"),
+            max_argument_bytes=data.get("max_argument_bytes"),
+        )
+
+
+class RenderCacheConfig:
+    """Global cache limits plus per-prompt policies."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 3600.0,
+        max_argument_bytes: int = 256 * 1024,
+        prompts: Optional[Dict[str, PromptCachePolicy]] = None,
+    ):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_argument_bytes = max_argument_bytes
+        self.prompts = prompts or {}
+
+    def policy(self, name: str) -> PromptCachePolicy:
+        return self.prompts.get(name) or PromptCachePolicy()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RenderCacheConfig":
+        defaults = cls()
+        return cls(
+            enabled=parse_flag(data.get("enabled", defaults.enabled)),
+            max_entries=int(data.get("max_entries", defaults.max_entries)),
+            max_bytes=int(data.get("max_bytes", defaults.max_bytes)),
+            ttl=float(data.get("ttl", defaults.ttl)),
+            max_argument_bytes=int(data.get("max_argument_bytes", defaults.max_argument_bytes)),
+            prompts={
+                name: PromptCachePolicy.from_dict(policy)
+                for name, policy in data.get("prompts", {}).items()
+            },
+        )
+
+    @classmethod
+    def from_env(cls) -> "RenderCacheConfig":
+        data: Dict[str, Any] = {}
+        path = os.environ.get("TOBE_MCP_CACHE_CONFIG")
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                data.update(json.load(f))
+        env_map = {
+            "TOBE_MCP_CACHE_ENABLED": ("enabled", parse_flag),
+            "TOBE_MCP_CACHE_MAX_ENTRIES": ("max_entries", int),
+            "TOBE_MCP_CACHE_MAX_BYTES": ("max_bytes", int),
+            "TOBE_MCP_CACHE_TTL": ("ttl", float),
+        }
+        for var, (key, convert) in env_map.items():
+            if var in os.environ:
+                data[key] = convert(os.environ[var])
+        return cls.from_dict(data)
+
+
+class RenderCache:
+    """Thread-safe LRU cache bounded by entry count and total bytes, with TTL."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Any, Tuple[Any, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.bypasses = 0
+        self.per_prompt: Dict[str, Dict[str, int]] = {}
+        # Bumped by invalidate(); a render started before it is not stored.
+        self._generations: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _count(self, name: str, counter: str):
+        counters = self.per_prompt.get(name)
+        if counters is None:
+            counters = self.per_prompt[name] = {"hits": 0, "misses": 0, "bypasses": 0}
+        counters[counter] += 1
+
+    def get(self, key: Tuple[str, str]) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                self._count(key[0], "misses")
+                return None
+            value, size, expires_at = entry
+            if expires_at and expires_at <= self._clock():
+                del self._entries[key]
+                self.bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                self._count(key[0], "misses")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._count(key[0], "hits")
+            return value
+
+    def generation(self, name: str) -> int:
+        return self._generations.get(name, 0)
+
+    def put(
+        self,
+        key: Tuple[str, str],
+        value: Any,
+        size: int,
+        ttl: Optional[float] = None,
+        generation: Optional[int] = None,
+    ):
+        """Store ``value``; skipped if ``generation`` predates an invalidation."""
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = self._clock() + ttl if ttl else 0.0
+        with self._lock:
+            if generation is not None and generation != self._generations.get(key[0], 0):
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[key] = (value, size, expires_at)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def bypass(self, name: str):
+        with self._lock:
+            self.bypasses += 1
+            self._count(name, "bypasses")
+
+    def invalidate(self, names: Iterable[str]) -> int:
+        """Drop every cached render of the named prompts; returns how many."""
+        names = set(names)
+        with self._lock:
+            for name in names:
+                self._generations[name] = self._generations.get(name, 0) + 1
+            stale = [key for key in self._entries if key[0] in names]
+            for key in stale:
+                self.bytes -= self._entries.pop(key)[1]
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "bypasses": self.bypasses,
+                "prompts": {name: dict(counters) for name, counters in self.per_prompt.items()},
+            }
+
+
+def _cached(cache: RenderCache, config: RenderCacheConfig, prompt: Prompt, fn: Callable) -> Optional[Callable]:
+    policy = config.policy(prompt.name)
+    if not policy.enabled:
+        return None
+    name = prompt.name
+    ttl = policy.ttl
+    max_argument_bytes = (
+        policy.max_argument_bytes if policy.max_argument_bytes is not None else config.max_argument_bytes
+    )
+
+    def store(key, generation, messages):
+        if not isinstance(messages, (list, tuple)):
+            return messages
+        messages = tuple(messages)
+        cache.put(key, messages, result_size(messages), ttl, generation)
+        return list(messages)
+
+    if inspect.iscoroutinefunction(fn):
+        # Prompts that analyze their input off the event loop render asynchronously.
+        async def render(**arguments):
+            if max_argument_bytes and argument_size(arguments) > max_argument_bytes:
+                cache.bypass(name)
+                return await fn(**arguments)
+            key = cache_key(name, arguments)
+            messages = cache.get(key)
+            if messages is None:
+                generation = cache.generation(name)
+                return store(key, generation, await fn(**arguments))
+            return list(messages)
+
+        render.__wrapped__ = fn
+        return render
+
+    def render(**arguments):
+        if max_argument_bytes and argument_size(arguments) > max_argument_bytes:
+            cache.bypass(name)
+            return fn(**arguments)
+        key = cache_key(name, arguments)
+        messages = cache.get(key)
+        if messages is None:
+            generation = cache.generation(name)
+            return store(key, generation, fn(**arguments))
+        return list(messages)
+
+    render.__wrapped__ = fn
+    return render
+
+
+def install_render_cache(mcp: FastMCP, config: Optional[RenderCacheConfig] = None) -> Optional[RenderCache]:
+    """Wrap every registered prompt of ``mcp`` with a shared render cache."""
+    config = config or RenderCacheConfig.from_env()
+    if not config.enabled:
+        return None
+    cache = RenderCache(max_entries=config.max_entries, max_bytes=config.max_bytes, ttl=config.ttl)
+    wrap_prompts(mcp, lambda prompt, fn: _cached(cache, config, prompt, fn))
+    return cache
@@ -0,0 +1,446 @@
+"""Incremental symbol and module map of a local codebase.
+
+``design`` takes an optional ``codebase`` path, and the ``index_codebase``
+tool indexes one on demand. The map lists each source file with its line
+count, the first line of its docstring and its top-level symbols (classes,
+functions, types) with line numbers, so the model reads the map instead of
+crawling the repository file by file.
+
+The index of each repository is kept in a SQLite database, one row per file
+keyed by modification time, size and content hash, and loaded into memory
+once per process. A refresh walks the tree and stats every file; only files
+whose stamp changed are read, only those whose hash changed are parsed
+again, and only their rows are written. Python is parsed with :mod:`ast`;
+JavaScript/TypeScript, Go, Rust, Java-family, Ruby and PHP files with one
+regular expression each.
+
+The map is rendered within a token budget. When it does not fit, the files
+most relevant to the design requirements (matching words in paths and
+symbol names) are kept. The repository must lie under one of the source
+roots (see :mod:`src.sources`).
+
+    python -m src.codeindex REPOSITORY [QUERY]
+
+Environment variables:
+
+- ``TOBE_MCP_CODE_INDEX``: ``0`` turns indexing off: ``codebase`` is
+  rejected and the tool is not registered (default ``1``).
+- ``TOBE_MCP_CODE_INDEX_DIR``: where indexes are kept (default
+  ``$XDG_CACHE_HOME/tobe-mcp/index``).
+- ``TOBE_MCP_CODE_INDEX_BUDGET``: estimated tokens of the rendered map
+  (default 4000).
+- ``TOBE_MCP_CODE_INDEX_MAX_FILE_BYTES``: larger files are listed without
+  symbols (default 1 MiB).
+"""
+
+import ast
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.prompts.base import Prompt
+
+from src.logger import get_logger
+from src.registration import render_awaited, wrap_prompts
+from src.sources import SourceError, resolve_path
+from src.tokens import estimate_tokens
+
+CODEBASE_ARGUMENT = "codebase"
+# Prompt name -> the argument whose words rank files when the map is cut.
+INDEXED_PROMPTS = {"design": "requirements"}
+INDEX_FORMAT = 1
+
+SKIP_DIRS = {
+    "node_modules", "vendor", "third_party", "dist", "build", "target", "out",
+    "venv", "env", "__pycache__", "site-packages", "coverage",
+}
+# Symbols listed per file and methods per class; the rest are counted.
+FILE_SYMBOLS = 12
+CLASS_METHODS = 6
+DOC_CHARS = 80
+
+_JS = re.compile(
+    r"^(?:export\s+(?:default\s+)?)?(?:async\s+)?(function\*?|class|interface|type|enum)\s+([A-Za-z_$][\w$]*)"
+    r"|^export\s+(?:const|let)\s+([A-Za-z_$][\w$]*)",
+    re.MULTILINE,
+)
+_GO = re.compile(r"^(func)\s+(?:\([^)]*\)\s*)?(\w+)|^(type)\s+(\w+)", re.MULTILINE)
+_RUST = re.compile(r"^\s*(?:pub(?:\([^)]*\))?\s+)?(fn|struct|enum|trait|impl|mod)\s+(\w+)", re.MULTILINE)
+_JAVA = re.compile(
+    r"^\s*(?:(?:public|private|protected|internal|abstract|final|static|sealed|data|open)\s+)*"
+    r"(class|interface|enum|record|object)\s+(\w+)",
+    re.MULTILINE,
+)
+_RUBY = re.compile(r"^\s*(class|module|def)\s+([\w:.?!]+)", re.MULTILINE)
+_PHP = re.compile(r"^\s*(?:(?:abstract|final)\s+)?(class|interface|trait|function)\s+(\w+)", re.MULTILINE)
+
+# Extension -> (language, pattern); Python is parsed with ast.
+LANGUAGES: Dict[str, Tuple[str, Optional["re.Pattern[str]"]]] = {
+    ".py": ("python", None),
+    ".js": ("javascript", _JS), ".jsx": ("javascript", _JS), ".mjs": ("javascript", _JS),
+    ".ts": ("typescript", _JS), ".tsx": ("typescript", _JS),
+    ".go": ("go", _GO),
+    ".rs": ("rust", _RUST),
+    ".java": ("java", _JAVA), ".kt": ("kotlin", _JAVA), ".cs": ("csharp", _JAVA), ".scala": ("scala", _JAVA),
+    ".rb": ("ruby", _RUBY),
+    ".php": ("php", _PHP),
+}
+
+_PYTHON = re.compile(r"^(class|def|async def)\s+(\w+)", re.MULTILINE)
+_WORDS = re.compile(r"[A-Za-z][a-z]+|[A-Z]+(?![a-z])|[0-9]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    info TEXT NOT NULL
+);
+"""
+
+logger = get_logger("codeindex")
+
+
+def index_dir() -> Path:
+    path = os.environ.get("TOBE_MCP_CODE_INDEX_DIR")
+    if path:
+        return Path(path)
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache) / "tobe-mcp" / "index"
+
+
+class CodeIndexConfig:
+    """Which repositories may be indexed, where indexes live and map size."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        roots: Optional[List[str]] = None,
+        directory: Optional[Path] = None,
+        budget: int = 4000,
+        max_file_bytes: int = 1024 * 1024,
+    ):
+        self.enabled = enabled
+        self.roots = [os.path.realpath(root) for root in roots or []]
+        self.directory = directory or index_dir()
+        self.budget = budget
+        self.max_file_bytes = max_file_bytes
+
+    @classmethod
+    def from_env(cls, roots: Optional[List[str]] = None) -> "CodeIndexConfig":
+        defaults = cls()
+        return cls(
+            enabled=os.environ.get("TOBE_MCP_CODE_INDEX", "1").lower() not in ("0", "false", "no", "off"),
+            roots=roots,
+            budget=int(os.environ.get("TOBE_MCP_CODE_INDEX_BUDGET", defaults.budget)),
+            max_file_bytes=int(os.environ.get("TOBE_MCP_CODE_INDEX_MAX_FILE_BYTES", defaults.max_file_bytes)),
+        )
+
+
+def _python_symbols(text: str) -> Tuple[str, List[List[Any]]]:
+    tree = ast.parse(text)
+    symbols: List[List[Any]] = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            methods = [
+                item.name for item in node.body
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+                and not item.name.startswith("_")
+            ]
+            if len(methods) > CLASS_METHODS:
+                methods[CLASS_METHODS:] = [f"+{len(methods) - CLASS_METHODS}"]
+            name = f"{node.name}({', '.join(methods)})" if methods else node.name
+            symbols.append(["class", name, node.lineno])
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols.append(["def", node.name, node.lineno])
+    return ast.get_docstring(tree) or "", symbols
+
+
+def _pattern_symbols(pattern: "re.Pattern[str]", text: str) -> List[List[Any]]:
+    symbols = []
+    line, position = 1, 0
+    for match in pattern.finditer(text):
+        groups = [group for group in match.groups() if group]
+        kind, name = (groups[0], groups[1]) if len(groups) > 1 else ("const", groups[0])
+        line += text.count("\n", position, match.start())
+        position = match.start()
+        symbols.append([kind, name, line])
+    return symbols
+
+
+def parse_file(suffix: str, data: bytes) -> Dict[str, Any]:
+    """Language, line count, docstring line and top-level symbols of a file."""
+    language, pattern = LANGUAGES[suffix]
+    text = data.decode("utf-8", "replace")
+    doc, symbols = "", []
+    if pattern is None:
+        try:
+            doc, symbols = _python_symbols(text)
+        except (SyntaxError, ValueError):
+            symbols = _pattern_symbols(_PYTHON, text)
+    else:
+        symbols = _pattern_symbols(pattern, text)
+    first = doc.strip().split("\n", 1)[0] if doc else ""
+    return {
+        "language": language,
+        "lines": text.count("\n") + (not text.endswith("\n") and bool(text)),
+        "doc": first[:DOC_CHARS],
+        "symbols": symbols,
+    }
+
+
+def _walk(root: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """Source files under ``root`` with their stat, skipping hidden and vendored directories."""
+    stack = [""]
+    while stack:
+        relative = stack.pop()
+        try:
+            entries = os.scandir(os.path.join(root, relative))
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if not name.startswith(".") and name not in SKIP_DIRS:
+                        stack.append(f"{relative}{name}/")
+                elif os.path.splitext(name)[1] in LANGUAGES and entry.is_file(follow_symlinks=False):
+                    yield f"{relative}{name}", entry.stat(follow_symlinks=False)
+
+
+class CodeIndex:
+    """The persisted map of one repository; safe to share between threads."""
+
+    def __init__(self, root: str, path: Path, max_file_bytes: int):
+        self.root = root
+        self.path = path
+        self.max_file_bytes = max_file_bytes
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        # Path -> (hash, map line, words), so summaries skip unchanged files' formatting.
+        self._lines: Dict[str, Tuple[str, str, List[str]]] = {}
+        self._pid = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """The index database, opened and loaded on first use; callers hold the lock."""
+        # A connection must not cross a fork: reopen in the child.
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        if connection.execute("PRAGMA user_version").fetchone()[0] != INDEX_FORMAT:
+            connection.executescript(
+                f"DROP TABLE IF EXISTS files; {_SCHEMA} PRAGMA user_version = {INDEX_FORMAT};"
+            )
+        self.files = {
+            path: {"mtime": mtime, "size": size, "hash": digest, **json.loads(info)}
+            for path, mtime, size, digest, info in connection.execute("SELECT path, mtime, size, hash, info FROM files")
+        }
+        self._connection, self._pid = connection, os.getpid()
+        return connection
+
+    def refresh(self) -> Dict[str, Any]:
+        """Bring the index up to date; re-read changed files, re-parse edited ones."""
+        started = time.perf_counter()
+        parsed = 0
+        with self.lock:
+            connection = self._connect()
+            previous = self.files
+            files: Dict[str, Dict[str, Any]] = {}
+            changed = []
+            for relative, stat in _walk(self.root):
+                entry = previous.get(relative)
+                if entry is not None and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                    files[relative] = entry
+                    continue
+                try:
+                    with open(os.path.join(self.root, relative), "rb") as f:
+                        data = f.read(self.max_file_bytes + 1)
+                except OSError:
+                    continue
+                digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+                if entry is not None and entry["hash"] == digest:
+                    info = {key: entry[key] for key in ("language", "lines", "doc", "symbols")}
+                elif len(data) > self.max_file_bytes:
+                    info = {"language": LANGUAGES[os.path.splitext(relative)[1]][0], "lines": 0, "doc": "", "symbols": []}
+                    parsed += 1
+                else:
+                    info = parse_file(os.path.splitext(relative)[1], data)
+                    parsed += 1
+                files[relative] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "hash": digest, **info}
+                changed.append((relative, stat.st_mtime_ns, stat.st_size, digest, json.dumps(info, separators=(",", ":"))))
+            removed = [(path,) for path in previous.keys() - files.keys()]
+            self.files = files
+            for path, in removed:
+                self._lines.pop(path, None)
+            # Only changed rows are written, so a small edit is a small transaction.
+            if changed or removed:
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    connection.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", changed)
+                    connection.executemany("DELETE FROM files WHERE path = ?", removed)
+                    connection.execute("COMMIT")
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+        return {
+            "files": len(files),
+            "parsed": parsed,
+            "removed": len(removed),
+            "seconds": round(time.perf_counter() - started, 4),
+        }
+
+    def summary(self, budget: int, query: str = "") -> str:
+        """The map in about ``budget`` tokens, keeping files relevant to ``query`` first."""
+        files = self.files
+        languages = Counter(entry["language"] for entry in files.values())
+        symbols = sum(len(entry["symbols"]) for entry in files.values())
+        lines = sum(entry["lines"] for entry in files.values())
+        header = (
+            f"Codebase map of {self.root}: {len(files)} files, {lines:,} lines, {symbols:,} symbols ("
+            + ", ".join(f"{language} {count}" for language, count in languages.most_common()) + ")"
+        )
+        terms = {word.lower() for word in _WORDS.findall(query) if len(word) > 2}
+        lines_cache = self._lines
+        rendered = {}
+        for path, entry in files.items():
+            cached = lines_cache.get(path)
+            if cached is None or cached[0] != entry["hash"]:
+                cached = lines_cache[path] = (entry["hash"], _file_line(path, entry), _file_words(path, entry))
+            rendered[path] = cached
+        ranked = sorted(files, key=lambda path: (-_relevance(rendered[path][2], terms), path.count("/"), path))
+        used = estimate_tokens(header) + 16
+        chosen = {}
+        for path in ranked:
+            line = rendered[path][1]
+            cost = estimate_tokens(line) + 1
+            if used + cost > budget:
+                continue
+            chosen[path] = line
+            used += cost
+        parts = [header]
+        if len(chosen) < len(files):
+            basis = "most relevant to the request" if terms else "nearest the root"
+            parts.append(f"Showing the {len(chosen)} files {basis}; {len(files) - len(chosen)} more not shown.")
+        directory = None
+        for parent, path in sorted((path.rsplit("/", 1)[0] + "/" if "/" in path else "./", path) for path in chosen):
+            if parent != directory:
+                directory = parent
+                parts.append(parent)
+            parts.append(chosen[path])
+        return "\n".join(parts)
+
+
+def _file_words(path: str, entry: Dict[str, Any]) -> List[str]:
+    """Lowercase words of the path and symbol names; path words thrice."""
+    # A match in the path says more about a file than one symbol among many.
+    words = [word.lower() for word in _WORDS.findall(path)] * 3
+    names = " ".join(symbol[1] for symbol in entry["symbols"])
+    return words + [word.lower() for word in _WORDS.findall(names)]
+
+
+def _relevance(words: List[str], terms: set) -> int:
+    if not terms:
+        return 0
+    return sum(1 for word in words if word in terms)
+
+
+def _file_line(path: str, entry: Dict[str, Any]) -> str:
+    name = path.rsplit("/", 1)[-1]
+    symbols = [f"{symbol[1]}:{symbol[2]}" for symbol in entry["symbols"][:FILE_SYMBOLS]]
+    more = len(entry["symbols"]) - FILE_SYMBOLS
+    if more > 0:
+        symbols.append(f"+{more} more")
+    doc = f" {entry['doc']}" if entry["doc"] else ""
+    listed = f" | {', '.join(symbols)}" if symbols else ""
+    return f"  {name} ({entry['lines']} lines){doc}{listed}"
+
+
+class CodeIndexer:
+    """Indexes allowed repositories, keeping each index loaded once per process."""
+
+    def __init__(self, config: CodeIndexConfig):
+        self.config = config
+        self._indexes: Dict[str, CodeIndex] = {}
+        self._lock = threading.Lock()
+
+    def index(self, repository: str) -> CodeIndex:
+        root = resolve_path(repository, self.config.roots)
+        if not os.path.isdir(root):
+            raise SourceError(f"{repository} is not a directory")
+        with self._lock:
+            index = self._indexes.get(root)
+            if index is None:
+                digest = hashlib.blake2b(root.encode("utf-8", "surrogatepass"), digest_size=8).hexdigest()
+                path = self.config.directory / f"{os.path.basename(root) or 'root'}-{digest}.db"
+                index = self._indexes[root] = CodeIndex(root, path, self.config.max_file_bytes)
+        return index
+
+    def summary(self, repository: str, query: str = "", budget: Optional[int] = None) -> Tuple[str, Dict[str, Any]]:
+        """The refreshed map of ``repository`` and the refresh statistics."""
+        index = self.index(repository)
+        stats = index.refresh()
+        logger.debug("Indexed %s: %s", index.root, stats)
+        return index.summary(budget or self.config.budget, query), stats
+
+
+def _indexed(indexer: Optional[CodeIndexer], prompt: Prompt, fn: Callable) -> Optional[Callable]:
+    query_argument = INDEXED_PROMPTS.get(prompt.name)
+    if query_argument is None:
+        return None
+    name = prompt.name
+
+    async def render(**arguments: Any):
+        repository = arguments.get(CODEBASE_ARGUMENT)
+        if repository:
+            if indexer is None:
+                raise SourceError(f"{name}: codebase indexing is disabled")
+            # A cold index takes seconds on a large tree; keep the event loop free.
+            arguments[CODEBASE_ARGUMENT], _ = await anyio.to_thread.run_sync(
+                indexer.summary, repository, str(arguments.get(query_argument) or "")
+            )
+        return await render_awaited(fn, arguments)
+
+    render.__wrapped__ = fn
+    return render
+
+
+def install_code_index(mcp: FastMCP, config: Optional[CodeIndexConfig] = None) -> Optional[CodeIndexer]:
+    """Turn the ``codebase`` path of :data:`INDEXED_PROMPTS` into a map, and add the tool."""
+    from src.tools.codeindex import code_index_tool
+
+    config = config or CodeIndexConfig.from_env([os.getcwd()])
+    indexer = CodeIndexer(config) if config.enabled else None
+    wrap_prompts(mcp, lambda prompt, fn: _indexed(indexer, prompt, fn), INDEXED_PROMPTS)
+    if indexer is not None:
+        code_index_tool(mcp, indexer)
+    return indexer
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print("usage: python -m src.codeindex REPOSITORY [QUERY]")
+        sys.exit(2)
+    repository = os.path.realpath(sys.argv[1])
+    indexer = CodeIndexer(CodeIndexConfig.from_env([repository]))
+    text, stats = indexer.summary(repository, sys.argv[2] if len(sys.argv) == 3 else "")
+    print(text)
+    print(f"\n{stats}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
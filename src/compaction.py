@@ -0,0 +1,94 @@
+"""Whitespace compaction for prompt templates.
+
+Prompt text in the data files is edited by hand, and may pick up indentation,
+trailing spaces, runs of blank lines and the line break before a closing
+``'''``. Compaction dedents it, strips trailing spaces and collapses runs of
+blank lines. It is applied to template sources and string constants at
+compile time, before any argument is substituted, so user-supplied values
+are never modified. The shipped data files are kept tidy, so on them it saves
+little; it matters for files edited in place and hot-reloaded.
+
+Compaction is on by default. Set ``TOBE_MCP_COMPACT_PROMPTS=0`` (or call
+:func:`set_enabled`) before prompts are registered to turn it off.
+
+Run ``python -m src.compaction`` for a per-prompt report of bytes and
+estimated tokens saved on the data files.
+"""
+
+import logging
+import os
+import textwrap
+
+from src.tokens import estimate_tokens
+
+_enabled = os.environ.get("TOBE_MCP_COMPACT_PROMPTS", "1").lower() not in ("0", "false", "no", "off")
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: bool):
+    """Turn compaction on or off for templates compiled after this call."""
+    global _enabled
+    _enabled = enabled
+
+
+def compact_text(text: str) -> str:
+    """Dedent ``text``, strip trailing spaces and collapse blank-line runs."""
+    lines = []
+    blank = False
+    for line in textwrap.dedent(text).split("\n"):
+        line = line.rstrip()
+        if not line:
+            blank = bool(lines)
+            continue
+        if blank:
+            lines.append("")
+            blank = False
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _render_sizes(compact: bool):
+    from src.layout import apply_layout, get_layout
+    from src.prompt_store import DATA_DIR, load_directory
+    from src.templates import compile_prompt
+
+    sizes = {}
+    for name, spec in load_directory(DATA_DIR).items():
+        messages = apply_layout(spec.messages, spec.large, get_layout(), spec.constants)
+        template = compile_prompt(messages, compact=compact, **spec.constants)
+        values = {argument: f"<{argument}>" for argument, _, _ in spec.arguments}
+        values.update({slot: f"<{slot}>" for slot in spec.computed})
+        text = "".join(text for _, text in template.render_text(**values))
+        sizes[name] = (len(text.encode("utf-8")), estimate_tokens(text))
+    return sizes
+
+
+def report():
+    """Print bytes and estimated tokens saved by compaction for each prompt."""
+    logging.disable(logging.INFO)
+    raw = _render_sizes(compact=False)
+    compact = _render_sizes(compact=True)
+    header = f"{'prompt':<24}{'raw bytes':>11}{'compact':>9}{'saved':>8}{'saved %':>9}{'tokens saved':>14}"
+    print(header)
+    print("-" * len(header))
+    totals = [0, 0, 0]
+    for name, (raw_bytes, raw_tokens) in raw.items():
+        compact_bytes, compact_tokens = compact[name]
+        saved = raw_bytes - compact_bytes
+        totals[0] += raw_bytes
+        totals[1] += compact_bytes
+        totals[2] += raw_tokens - compact_tokens
+        print(
+            f"{name:<24}{raw_bytes:>11}{compact_bytes:>9}{saved:>8}"
+            f"{saved / raw_bytes:>9.1%}{raw_tokens - compact_tokens:>14}"
+        )
+    print("-" * len(header))
+    saved = totals[0] - totals[1]
+    print(f"{'total':<24}{totals[0]:>11}{totals[1]:>9}{saved:>8}{saved / totals[0]:>9.1%}{totals[2]:>14}")
+
+
+if __name__ == "__main__":
+    report()
@@ -0,0 +1,206 @@
+"""Server configuration for TOBE MCP: transport, bind address and limits.
+
+Settings are read from an optional JSON file, then environment variables,
+then command-line options, each overriding the previous one.
+
+Environment variables:
+
+- ``TOBE_MCP_TRANSPORT``: ``stdio`` (default), ``sse`` or ``streamable-http``.
+- ``TOBE_MCP_HOST``: bind address for the network transports (default
+  ``127.0.0.1``).
+- ``TOBE_MCP_PORT``: bind port (default 8000).
+- ``TOBE_MCP_PATH``: endpoint path; defaults to ``/mcp`` for streamable HTTP
+  and ``/sse`` for SSE.
+- ``TOBE_MCP_STATELESS_HTTP``: ``1`` to serve streamable HTTP without
+  sessions, so any request can go to any process (default ``0``).
+- ``TOBE_MCP_JSON_RESPONSE``: ``1`` to answer streamable HTTP requests with
+  plain JSON instead of an SSE stream (default ``0``).
+- ``TOBE_MCP_MAX_CONCURRENCY``: connections and in-flight requests served at
+  once; beyond it clients get HTTP 503 (default unlimited).
+- ``TOBE_MCP_BACKLOG``: pending connections queued by the OS (default 2048).
+- ``TOBE_MCP_KEEP_ALIVE``: seconds an idle keep-alive connection stays open
+  (default 5).
+- ``TOBE_MCP_WORKERS``: worker processes pre-forked by the supervisor
+  (default 1, no supervisor). More than one requires stateless streamable
+  HTTP, since a session lives in a single worker.
+- ``TOBE_MCP_REUSE_PORT``: ``1`` to give each worker its own ``SO_REUSEPORT``
+  socket, balanced by the kernel, instead of one socket inherited from the
+  supervisor (default ``0``).
+- ``TOBE_MCP_GRACEFUL_TIMEOUT``: seconds workers get to finish in-flight
+  requests on shutdown before they are killed (default 30).
+- ``TOBE_MCP_SERVER_CONFIG``: path to a JSON file with the same settings as
+  keys (``transport``, ``host``, ``port``, ``path``, ``stateless_http``,
+  ``json_response``, ``max_concurrency``, ``backlog``, ``keep_alive``,
+  ``workers``, ``reuse_port``, ``graceful_timeout``).
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+TRANSPORT_STDIO = "stdio"
+TRANSPORT_SSE = "sse"
+TRANSPORT_STREAMABLE_HTTP = "streamable-http"
+TRANSPORTS = (TRANSPORT_STDIO, TRANSPORT_SSE, TRANSPORT_STREAMABLE_HTTP)
+
+
+def parse_flag(value: Any) -> bool:
+    """A boolean setting from JSON or the environment.
+
+    Real booleans pass through; strings are false when ``0``, ``false``, ``no``
+    or ``off`` (any case), so ``"false"`` in a config file means false.
+    """
+    if isinstance(value, str):
+        return value.strip().lower() not in ("0", "false", "no", "off")
+    return bool(value)
+
+
+class ServerConfig:
+    """How the server is exposed to clients."""
+
+    def __init__(
+        self,
+        transport: str = TRANSPORT_STDIO,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        path: Optional[str] = None,
+        stateless_http: bool = False,
+        json_response: bool = False,
+        max_concurrency: Optional[int] = None,
+        backlog: int = 2048,
+        keep_alive: float = 5.0,
+        workers: int = 1,
+        reuse_port: bool = False,
+        graceful_timeout: float = 30.0,
+    ):
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Unknown transport: {transport} (choose from {', '.join(TRANSPORTS)})")
+        if not 0 <= port <= 65535:
+            raise ValueError(f"Invalid port: {port}")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if workers > 1 and not (transport == TRANSPORT_STREAMABLE_HTTP and stateless_http):
+            raise ValueError("workers > 1 requires the streamable-http transport with stateless HTTP")
+        self.transport = transport
+        self.host = host
+        self.port = port
+        self.path = path
+        self.stateless_http = stateless_http
+        self.json_response = json_response
+        self.max_concurrency = max_concurrency
+        self.backlog = backlog
+        self.keep_alive = keep_alive
+        self.workers = workers
+        self.reuse_port = reuse_port
+        self.graceful_timeout = graceful_timeout
+
+    @property
+    def is_network(self) -> bool:
+        return self.transport != TRANSPORT_STDIO
+
+    def fastmcp_settings(self) -> Dict[str, Any]:
+        """Keyword arguments for ``FastMCP(...)``."""
+        settings: Dict[str, Any] = {
+            "host": self.host,
+            "port": self.port,
+            "stateless_http": self.stateless_http,
+            "json_response": self.json_response,
+        }
+        if self.path:
+            key = "sse_path" if self.transport == TRANSPORT_SSE else "streamable_http_path"
+            settings[key] = self.path
+        return settings
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "transport": self.transport,
+            "host": self.host,
+            "port": self.port,
+            "path": self.path,
+            "stateless_http": self.stateless_http,
+            "json_response": self.json_response,
+            "max_concurrency": self.max_concurrency,
+            "backlog": self.backlog,
+            "keep_alive": self.keep_alive,
+            "workers": self.workers,
+            "reuse_port": self.reuse_port,
+            "graceful_timeout": self.graceful_timeout,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ServerConfig":
+        defaults = cls()
+        max_concurrency = data.get("max_concurrency", defaults.max_concurrency)
+        return cls(
+            transport=str(data.get("transport", defaults.transport)),
+            host=str(data.get("host", defaults.host)),
+            port=int(data.get("port", defaults.port)),
+            path=data.get("path", defaults.path) or None,
+            stateless_http=parse_flag(data.get("stateless_http", defaults.stateless_http)),
+            json_response=parse_flag(data.get("json_response", defaults.json_response)),
+            max_concurrency=int(max_concurrency) if max_concurrency else None,
+            backlog=int(data.get("backlog", defaults.backlog)),
+            keep_alive=float(data.get("keep_alive", defaults.keep_alive)),
+            workers=int(data.get("workers", defaults.workers)),
+            reuse_port=parse_flag(data.get("reuse_port", defaults.reuse_port)),
+            graceful_timeout=float(data.get("graceful_timeout", defaults.graceful_timeout)),
+        )
+
+    @classmethod
+    def _env_data(cls, path: Optional[str] = None) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        path = path or os.environ.get("TOBE_MCP_SERVER_CONFIG")
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                data.update(json.load(f))
+        env_map = {
+            "TOBE_MCP_TRANSPORT": ("transport", str),
+            "TOBE_MCP_HOST": ("host", str),
+            "TOBE_MCP_PORT": ("port", int),
+            "TOBE_MCP_PATH": ("path", str),
+            "TOBE_MCP_STATELESS_HTTP": ("stateless_http", parse_flag),
+            "TOBE_MCP_JSON_RESPONSE": ("json_response", parse_flag),
+            "TOBE_MCP_MAX_CONCURRENCY": ("max_concurrency", int),
+            "TOBE_MCP_BACKLOG": ("backlog", int),
+            "TOBE_MCP_KEEP_ALIVE": ("keep_alive", float),
+            "TOBE_MCP_WORKERS": ("workers", int),
+            "TOBE_MCP_REUSE_PORT": ("reuse_port", parse_flag),
+            "TOBE_MCP_GRACEFUL_TIMEOUT": ("graceful_timeout", float),
+        }
+        for var, (key, convert) in env_map.items():
+            if var in os.environ:
+                data[key] = convert(os.environ[var])
+        return data
+
+    @classmethod
+    def from_env(cls) -> "ServerConfig":
+        return cls.from_dict(cls._env_data())
+
+    @classmethod
+    def from_args(cls, argv: Optional[List[str]] = None) -> "ServerConfig":
+        """Build the configuration from the command line, over file and env settings."""
+        parser = argparse.ArgumentParser(prog="tobe-mcp", description="Run the TOBE MCP server.")
+        parser.add_argument("--config", help="JSON file with server settings (TOBE_MCP_SERVER_CONFIG)")
+        parser.add_argument("--transport", choices=TRANSPORTS, help="transport to serve (default: stdio)")
+        parser.add_argument("--host", help="bind address for sse/streamable-http (default: 127.0.0.1)")
+        parser.add_argument("--port", type=int, help="bind port (default: 8000)")
+        parser.add_argument("--path", help="endpoint path (default: /mcp, or /sse for sse)")
+        parser.add_argument("--stateless-http", action="store_true", default=None, help="serve streamable HTTP without sessions")
+        parser.add_argument("--json-response", action="store_true", default=None, help="answer with JSON instead of SSE streams")
+        parser.add_argument("--max-concurrency", type=int, help="connections and requests served at once; 503 beyond")
+        parser.add_argument("--backlog", type=int, help="pending connections queued by the OS (default: 2048)")
+        parser.add_argument("--keep-alive", type=float, help="idle keep-alive timeout in seconds (default: 5)")
+        parser.add_argument("--workers", type=int, help="pre-forked worker processes (default: 1)")
+        parser.add_argument("--reuse-port", action="store_true", default=None, help="one SO_REUSEPORT socket per worker")
+        parser.add_argument("--graceful-timeout", type=float, help="seconds workers get to finish on shutdown (default: 30)")
+        options = vars(parser.parse_args(argv))
+
+        data = cls._env_data(options.pop("config"))
+        data.update({key: value for key, value in options.items() if value is not None})
+        try:
+            return cls.from_dict(data)
+        except ValueError as e:
+            parser.error(str(e))
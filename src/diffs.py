@@ -0,0 +1,359 @@
+"""Review input from a local git repository: only the changed hunks.
+
+``review`` takes an optional ``repository`` (a local path) and ``revisions``
+instead of ``code``. The server runs ``git diff`` with ``context_lines`` of
+context and renders only the changed hunks, grouped by file, in place of
+``code``, so the prompt grows with the size of the change rather than the
+size of the files it touches.
+
+``revisions`` is anything ``git diff`` accepts as a range: ``main..HEAD``,
+``main...feature``, ``HEAD~3`` (that commit against the working tree) or
+the default ``HEAD`` (uncommitted changes). Files left out of the diff:
+
+- binary files;
+- files marked ``linguist-generated`` or ``linguist-vendored`` in
+  ``.gitattributes``;
+- files matching :data:`EXCLUDE_PATTERNS` (lock files, vendored
+  directories, minified and generated code) or ``TOBE_MCP_DIFF_EXCLUDE``;
+- new files whose first lines say they are generated.
+
+The repository must lie under one of the source roots (see
+:mod:`src.sources`). ``git`` runs in a worker thread, never on the event
+loop. Commands a repository's configuration or ``.gitattributes`` can make
+git run are turned off on every call: the ``core.fsmonitor`` hook, hooks,
+``diff.external`` and external diff drivers, ``textconv``, and the clean,
+smudge and process commands of every configured filter driver.
+
+    python -m src.diffs REPOSITORY [REVISIONS]
+
+Environment variables:
+
+- ``TOBE_MCP_DIFFS_ENABLED``: ``0`` removes the ``repository`` argument
+  (default ``1``).
+- ``TOBE_MCP_DIFF_CONTEXT``: default context lines per hunk (default 3).
+- ``TOBE_MCP_DIFF_EXCLUDE``: extra file patterns to leave out, separated by
+  commas.
+- ``TOBE_MCP_DIFF_MAX_BYTES``: largest diff read from git (default 16 MiB).
+- ``TOBE_MCP_DIFF_TIMEOUT``: seconds before git is stopped (default 30).
+"""
+
+import fnmatch
+import os
+import re
+import subprocess
+import sys
+from typing import Any, Callable, Iterable, List, Optional
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.prompts.base import Prompt, PromptArgument
+
+from src.logger import get_logger
+from src.registration import render_awaited, wrap_prompts
+from src.sources import SourceError, resolve_path
+
+REPOSITORY_ARGUMENT = "repository"
+REVISIONS_ARGUMENT = "revisions"
+CONTEXT_ARGUMENT = "context_lines"
+# Prompt name -> the argument the diff replaces.
+DIFF_ARGUMENTS = {"review": "code"}
+
+EXCLUDE_PATTERNS = (
+    "vendor/*", "*/vendor/*", "third_party/*", "*/third_party/*",
+    "node_modules/*", "*/node_modules/*", "dist/*", "*/dist/*",
+    "*.min.js", "*.min.css", "*.map",
+    "*.lock", "package-lock.json", "pnpm-lock.yaml", "go.sum",
+    "*_pb2.py", "*_pb2_grpc.py", "*.pb.go", "*.generated.*", "*.g.dart",
+)
+MAX_CONTEXT = 100
+# Passed to every git call: no fsmonitor hook, hooks or external diff program
+# from the repository's config. Textconv is turned off with --no-textconv.
+SAFE_CONFIG = ("core.quotepath=off", "core.fsmonitor=false", "core.hooksPath=/dev/null", "diff.external=")
+# Leading lines of a new file searched for a generated-code marker.
+MARKER_LINES = 5
+
+# No option injection: revisions may not start with "-".
+_REVISIONS = re.compile(r"^[\w./@^~{}:+][\w./@^~{}:+-]*$")
+_GENERATED = re.compile(r"@generated|DO NOT EDIT|auto-?generated", re.IGNORECASE)
+_HUNK = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@")
+
+logger = get_logger("diffs")
+
+
+class DiffError(SourceError):
+    """Raised when a repository diff cannot be produced."""
+
+
+class DiffConfig:
+    """Which repositories may be diffed and how."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        roots: Optional[List[str]] = None,
+        context: int = 3,
+        exclude: Iterable[str] = (),
+        max_bytes: int = 16 * 1024 * 1024,
+        timeout: float = 30.0,
+    ):
+        self.enabled = enabled
+        self.roots = [os.path.realpath(root) for root in roots or []]
+        self.context = context
+        self.exclude = EXCLUDE_PATTERNS + tuple(exclude)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls, roots: Optional[List[str]] = None) -> "DiffConfig":
+        defaults = cls()
+        return cls(
+            enabled=os.environ.get("TOBE_MCP_DIFFS_ENABLED", "1").lower() not in ("0", "false", "no", "off"),
+            roots=roots,
+            context=int(os.environ.get("TOBE_MCP_DIFF_CONTEXT", defaults.context)),
+            exclude=[p.strip() for p in os.environ.get("TOBE_MCP_DIFF_EXCLUDE", "").split(",") if p.strip()],
+            max_bytes=int(os.environ.get("TOBE_MCP_DIFF_MAX_BYTES", defaults.max_bytes)),
+            timeout=float(os.environ.get("TOBE_MCP_DIFF_TIMEOUT", defaults.timeout)),
+        )
+
+
+class FileDiff:
+    """The hunks of one changed file."""
+
+    __slots__ = ("path", "status", "lines", "added", "removed", "binary")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.status = ""
+        self.lines: List[str] = []
+        self.added = 0
+        self.removed = 0
+        self.binary = False
+
+    @property
+    def generated(self) -> bool:
+        """A new file whose first lines mark it as generated."""
+        if self.status != "new file" or not self.lines:
+            return False
+        match = _HUNK.match(self.lines[0])
+        return bool(match) and match.group(1) == "1" and any(
+            _GENERATED.search(line) for line in self.lines[1:MARKER_LINES + 1]
+        )
+
+    def render(self) -> str:
+        status = f", {self.status}" if self.status else ""
+        body = "\n".join(self.lines)
+        return f"### {self.path} (+{self.added} -{self.removed}{status})\n```diff\n{body}\n```"
+
+
+def parse_diff(text: str) -> List[FileDiff]:
+    """Split ``git diff`` output into files, keeping hunks and dropping headers."""
+    files: List[FileDiff] = []
+    current: Optional[FileDiff] = None
+    in_hunk = False
+    for line in text.split("\n"):
+        if line.startswith("diff --git "):
+            # Replaced by the "+++ b/<path>" line, absent for deletions and binaries.
+            current = FileDiff(line.rsplit(" b/", 1)[-1])
+            files.append(current)
+            in_hunk = False
+        elif current is None:
+            continue
+        elif line.startswith("@@"):
+            in_hunk = True
+            current.lines.append(line)
+        elif in_hunk and line[:1] in (" ", "+", "-", "\\"):
+            current.lines.append(line)
+            if line[:1] == "+":
+                current.added += 1
+            elif line[:1] == "-":
+                current.removed += 1
+        elif line.startswith("+++ b/"):
+            current.path = line[len("+++ b/"):]
+        elif line.startswith(("new file", "deleted file")):
+            current.status = line.split(" mode")[0]
+        elif line.startswith("rename from "):
+            current.status = f"renamed from {line[len('rename from '):]}"
+        elif line.startswith("Binary files ") or line.startswith("GIT binary patch"):
+            current.binary = True
+    return files
+
+
+class DiffReader:
+    """Runs ``git diff`` in allowed repositories and trims the result."""
+
+    def __init__(self, config: DiffConfig):
+        self.config = config
+
+    def _run(self, repository: str, args: List[str], stdin: Optional[str] = None) -> "subprocess.CompletedProcess[str]":
+        try:
+            return subprocess.run(
+                ["git", "-C", repository, *args], input=stdin, capture_output=True, text=True,
+                encoding="utf-8", errors="replace", timeout=self.config.timeout,
+            )
+        except FileNotFoundError:
+            raise DiffError("git is not installed") from None
+        except subprocess.TimeoutExpired:
+            raise DiffError(f"git took longer than {self.config.timeout:g} seconds") from None
+
+    def _overrides(self, repository: str) -> List[str]:
+        """``-c`` options turning off every program the repository's config could make git run."""
+        options = []
+        for setting in SAFE_CONFIG:
+            options += ["-c", setting]
+        # Clean filters run on working-tree files, under names the repository
+        # chooses, so each configured driver is blanked by name.
+        listed = self._run(repository, ["config", "-z", "--get-regexp", r"^filter\."])
+        drivers = {entry.split("\n", 1)[0].rsplit(".", 1)[0] for entry in listed.stdout.split("\0") if entry}
+        for driver in sorted(drivers):
+            for key, value in (("clean", ""), ("smudge", ""), ("process", ""), ("required", "false")):
+                options += ["-c", f"{driver}.{key}={value}"]
+        return options
+
+    def _git(self, repository: str, *args: str, stdin: Optional[str] = None) -> str:
+        result = self._run(repository, [*self._overrides(repository), *args], stdin)
+        if result.returncode != 0:
+            raise DiffError(f"git {args[0]} failed: {result.stderr.strip() or result.returncode}")
+        return result.stdout
+
+    def _attributes(self, repository: str, paths: List[str]) -> set:
+        """Paths marked generated or vendored in ``.gitattributes``."""
+        if not paths:
+            return set()
+        output = self._git(
+            repository, "check-attr", "-z", "--stdin", "linguist-generated", "linguist-vendored",
+            stdin="\0".join(paths) + "\0",
+        )
+        fields = output.split("\0")
+        return {
+            fields[i] for i in range(0, len(fields) - 2, 3) if fields[i + 2] in ("set", "true")
+        }
+
+    def _excluded(self, path: str) -> bool:
+        return any(fnmatch.fnmatch(path, pattern) for pattern in self.config.exclude)
+
+    def read(self, repository: str, revisions: str = "HEAD", context: Optional[int] = None) -> str:
+        """The changed hunks between ``revisions``, grouped by file."""
+        real = resolve_path(repository, self.config.roots)
+        revisions = (revisions or "HEAD").strip()
+        if not _REVISIONS.match(revisions):
+            raise DiffError(f"Invalid revision range {revisions!r}")
+        context = self.config.context if context is None else context
+        if not 0 <= context <= MAX_CONTEXT:
+            raise DiffError(f"{CONTEXT_ARGUMENT} must be between 0 and {MAX_CONTEXT}")
+        text = self._git(real, "diff", "--no-color", "--no-ext-diff", "--no-textconv", f"-U{context}", revisions, "--")
+        if len(text) > self.config.max_bytes:
+            raise DiffError(f"The diff of {revisions} is over the {self.config.max_bytes} byte limit")
+        files = parse_diff(text)
+        marked = self._attributes(real, [f.path for f in files])
+        kept, skipped = [], []
+        for diff in files:
+            if diff.binary or diff.path in marked or self._excluded(diff.path) or diff.generated:
+                skipped.append(diff.path)
+            else:
+                kept.append(diff)
+        logger.debug("Diff of %s in %s: %d files kept, %d skipped", revisions, real, len(kept), len(skipped))
+        return summarize(revisions, kept, skipped)
+
+
+def summarize(revisions: str, kept: List[FileDiff], skipped: List[str]) -> str:
+    added = sum(f.added for f in kept)
+    removed = sum(f.removed for f in kept)
+    lines = [f"Changes in {revisions}: {len(kept)} files, +{added} -{removed}"]
+    if skipped:
+        lines.append(f"Skipped (generated, vendored or binary): {', '.join(skipped)}")
+    if not kept:
+        lines.append("No reviewable changes.")
+    return "\n\n".join(["\n".join(lines)] + [diff.render() for diff in kept])
+
+
+def _context_lines(value: Any, name: str) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise DiffError(f"{name}: {CONTEXT_ARGUMENT} must be a number, not {value!r}") from None
+
+
+def _diffed(reader: DiffReader, prompt: Prompt, fn: Callable) -> Optional[Callable]:
+    target = DIFF_ARGUMENTS.get(prompt.name)
+    if target is None:
+        return None
+    name = prompt.name
+    arguments = list(prompt.arguments or [])
+    for argument in arguments:
+        if argument.name == target:
+            argument.required = False
+    arguments += [
+        PromptArgument(
+            name=REPOSITORY_ARGUMENT,
+            description=f"Local git repository whose changes replace {target}",
+            required=False,
+        ),
+        PromptArgument(
+            name=REVISIONS_ARGUMENT,
+            description="Revision range to review, e.g. main..HEAD (default HEAD: uncommitted changes)",
+            required=False,
+        ),
+        PromptArgument(
+            name=CONTEXT_ARGUMENT,
+            description=f"Unchanged lines shown around each change (default {reader.config.context})",
+            required=False,
+        ),
+    ]
+    prompt.arguments = arguments
+
+    async def render(**arguments: Any):
+        repository = arguments.pop(REPOSITORY_ARGUMENT, None)
+        revisions = arguments.pop(REVISIONS_ARGUMENT, None)
+        context = _context_lines(arguments.pop(CONTEXT_ARGUMENT, None), name)
+        if repository:
+            if arguments.get(target):
+                raise DiffError(f"{name}: pass either {target} or {REPOSITORY_ARGUMENT}, not both")
+            # git may take seconds on a large repository; keep the event loop free.
+            arguments[target] = await anyio.to_thread.run_sync(reader.read, repository, revisions, context)
+        elif revisions or context is not None:
+            raise DiffError(f"{name}: {REVISIONS_ARGUMENT} and {CONTEXT_ARGUMENT} need {REPOSITORY_ARGUMENT}")
+        return await render_awaited(fn, arguments)
+
+    render.__wrapped__ = fn
+    return render
+
+
+def install_diffs(mcp: FastMCP, config: Optional[DiffConfig] = None) -> Optional[DiffReader]:
+    """Let the prompts in :data:`DIFF_ARGUMENTS` review a repository's changes.
+
+    Install after the token budgets, so budgets apply to the trimmed diff,
+    and after sources, which then see the diff as an inline argument.
+    """
+    config = config or DiffConfig.from_env([os.getcwd()])
+    if not config.enabled:
+        return None
+    reader = DiffReader(config)
+    wrap_prompts(mcp, lambda prompt, fn: _diffed(reader, prompt, fn), DIFF_ARGUMENTS)
+    return reader
+
+
+def _file_sizes(repository: str, paths: List[str]) -> int:
+    return sum(os.path.getsize(os.path.join(repository, p)) for p in paths if os.path.isfile(os.path.join(repository, p)))
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print("usage: python -m src.diffs REPOSITORY [REVISIONS]")
+        sys.exit(2)
+    repository = os.path.realpath(sys.argv[1])
+    revisions = sys.argv[2] if len(sys.argv) == 3 else "HEAD"
+    reader = DiffReader(DiffConfig.from_env([repository]))
+    try:
+        text = reader.read(repository, revisions)
+    except DiffError as e:
+        print(e)
+        sys.exit(1)
+    print(text)
+    changed = reader._git(repository, "diff", "--name-only", "--no-ext-diff", "--no-textconv", revisions, "--").split("\n")
+    print(f"\n{len(text)} characters of diff; the changed files hold {_file_sizes(repository, changed)} bytes", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Instrumentation applied to every registered prompt at server start.
+
+Each render is counted per prompt. A sample of renders is also timed with
+``time.perf_counter_ns`` and sized (argument and output characters) into
+:mod:`src.metrics`, and a separate sample is logged through
+``log_tool_call``. Sampling is by count, every Nth render, so deciding costs
+a counter increment; with sampling off a render pays for one extra call and
+a counter update.
+
+Environment variables:
+
+- ``TOBE_MCP_INSTRUMENT_ENABLED``: ``0`` removes the wrapper (default ``1``).
+- ``TOBE_MCP_INSTRUMENT_SAMPLE_RATE``: fraction of renders timed and sized
+  (default ``1``).
+- ``TOBE_MCP_INSTRUMENT_LOG_RATE``: fraction of renders logged (default
+  ``0``).
+- ``TOBE_MCP_INSTRUMENT_CONFIG``: path to a JSON file with the same settings
+  (``enabled``, ``sample_rate``, ``log_rate``) and a ``prompts`` object of
+  per-prompt overrides, e.g.
+  ``{"prompts": {"content_analysis": {"sample_rate": 0.01}}}``.
+"""
+
+import inspect
+import itertools
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.prompts.base import Prompt
+
+from src.cache import argument_size
+from src.config import parse_flag
+from src.logger import get_logger
+from src.metrics import PromptMetrics, add_metrics_route, get_metrics, message_chars, metrics_enabled
+from src.registration import wrap_prompts
+
+logger = get_logger("instrumentation")
+
+
+def sample_period(rate: float) -> int:
+    """Record every Nth render for ``rate``; ``0`` means never."""
+    if rate <= 0:
+        return 0
+    return max(1, round(1 / min(rate, 1.0)))
+
+
+class PromptInstrumentationPolicy:
+    """Per-prompt instrumentation settings; ``None`` falls back to the global rate."""
+
+    def __init__(self, enabled: bool = True, sample_rate: Optional[float] = None, log_rate: Optional[float] = None):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.log_rate = log_rate
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PromptInstrumentationPolicy":
+        return cls(
+            enabled=parse_flag(data.get("enabled", True)),
+            sample_rate=data.get("sample_rate"),
+            log_rate=data.get("log_rate"),
+        )
+
+
+class InstrumentationConfig:
+    """Global sampling rates plus per-prompt policies."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        sample_rate: float = 1.0,
+        log_rate: float = 0.0,
+        prompts: Optional[Dict[str, PromptInstrumentationPolicy]] = None,
+    ):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.log_rate = log_rate
+        self.prompts = prompts or {}
+
+    def policy(self, name: str) -> PromptInstrumentationPolicy:
+        return self.prompts.get(name) or PromptInstrumentationPolicy()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "InstrumentationConfig":
+        defaults = cls()
+        return cls(
+            enabled=parse_flag(data.get("enabled", defaults.enabled)),
+            sample_rate=float(data.get("sample_rate", defaults.sample_rate)),
+            log_rate=float(data.get("log_rate", defaults.log_rate)),
+            prompts={
+                name: PromptInstrumentationPolicy.from_dict(policy)
+                for name, policy in data.get("prompts", {}).items()
+            },
+        )
+
+    @classmethod
+    def from_env(cls) -> "InstrumentationConfig":
+        data: Dict[str, Any] = {}
+        path = os.environ.get("TOBE_MCP_INSTRUMENT_CONFIG")
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                data.update(json.load(f))
+        env_map = {
+            "TOBE_MCP_INSTRUMENT_ENABLED": ("enabled", parse_flag),
+            "TOBE_MCP_INSTRUMENT_SAMPLE_RATE": ("sample_rate", float),
+            "TOBE_MCP_INSTRUMENT_LOG_RATE": ("log_rate", float),
+        }
+        for var, (key, convert) in env_map.items():
+            if var in os.environ:
+                data[key] = convert(os.environ[var])
+        return cls.from_dict(data)
+
+
+def _instrumented(metrics: Optional[PromptMetrics], config: InstrumentationConfig, prompt: Prompt, fn):
+    policy = config.policy(prompt.name)
+    if not policy.enabled:
+        return None
+    sample_every = sample_period(config.sample_rate if policy.sample_rate is None else policy.sample_rate)
+    log_every = sample_period(config.log_rate if policy.log_rate is None else policy.log_rate)
+    if metrics is None:
+        sample_every = 0
+        if not log_every:
+            return None
+    name = prompt.name
+    ticks = itertools.count()
+    clock = time.perf_counter_ns
+
+    def finish(arguments, messages, success: bool, started: int, timed: bool, logged: bool):
+        duration_ns = clock() - started
+        input_size = argument_size(arguments)
+        output_size = message_chars(messages) if success else 0
+        if timed:
+            metrics.observe(name, duration_ns, input_size, output_size, error=not success)
+        elif metrics is not None:
+            metrics.count(name, error=not success)
+        if logged:
+            logger.log_tool_call(
+                f"prompt:{name}",
+                {"input_chars": input_size, "output_chars": output_size},
+                success,
+                duration_ns / 1e9,
+            )
+
+    if inspect.iscoroutinefunction(fn):
+        # Wrappers that wait on git or the file system render asynchronously.
+        async def render(**arguments):
+            tick = next(ticks)
+            timed = sample_every and tick % sample_every == 0
+            logged = log_every and tick % log_every == 0
+            messages = None
+            success = False
+            started = clock()
+            try:
+                messages = await fn(**arguments)
+                success = True
+                return messages
+            finally:
+                if timed or logged:
+                    finish(arguments, messages, success, started, timed, logged)
+                elif metrics is not None:
+                    metrics.count(name, error=not success)
+
+        render.__wrapped__ = fn
+        return render
+
+    def render(**arguments):
+        tick = next(ticks)
+        timed = sample_every and tick % sample_every == 0
+        logged = log_every and tick % log_every == 0
+        if not (timed or logged):
+            try:
+                messages = fn(**arguments)
+            except BaseException:
+                if metrics is not None:
+                    metrics.count(name, error=True)
+                raise
+            if metrics is not None:
+                metrics.count(name)
+            return messages
+
+        messages = None
+        success = False
+        started = clock()
+        try:
+            messages = fn(**arguments)
+            success = True
+            return messages
+        finally:
+            finish(arguments, messages, success, started, timed, logged)
+
+    render.__wrapped__ = fn
+    return render
+
+
+def install_instrumentation(mcp: FastMCP, config: Optional[InstrumentationConfig] = None) -> Optional[PromptMetrics]:
+    """Wrap every registered prompt of ``mcp`` with counting, timing and logging.
+
+    Install after the render cache so cache hits are measured too. Returns
+    the metrics sink, or ``None`` when metrics are disabled.
+    """
+    config = config or InstrumentationConfig.from_env()
+    if not config.enabled:
+        return None
+    metrics = get_metrics() if metrics_enabled() else None
+    wrapped = wrap_prompts(mcp, lambda prompt, fn: _instrumented(metrics, config, prompt, fn))
+    if metrics is not None:
+        add_metrics_route(mcp, metrics)
+    logger.debug("Instrumented prompts: %s", wrapped)
+    return metrics
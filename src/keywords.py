@@ -0,0 +1,238 @@
+"""Keyword usage report for ``seo_optimization``.
+
+:func:`analyze_keywords` parses the target keywords, builds an Aho-Corasick
+automaton over them and scans the content once, whatever the number of
+keywords: every occurrence of every keyword (overlapping ones included) is
+found in time linear in the content plus the matches. For each keyword it
+reports the count, density, first position and where it appears: headings,
+the introduction (first ``INTRO_WORDS`` words) or the body.
+
+Matching is case-insensitive. Keywords that start or end with a letter or
+digit only match whole words; Chinese keywords match anywhere.
+
+    python -m src.keywords article.md "seo, content marketing"
+"""
+
+import re
+import sys
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Markdown ATX headings and HTML heading tags, at the start of a line.
+_HEADING = re.compile(r"[ \t]{0,3}(?:#{1,6}(?:[ \t]|$)|<h[1-6][\s>])", re.IGNORECASE)
+_SEPARATORS = re.compile(r"[,;\n，；、]+")
+# Same convention as src.text_stats: every Han character is a word.
+_WORD = re.compile(r"[㐀-䶿一-鿿豈-﫿]|[^\W_㐀-䶿一-鿿豈-﫿]+(?:['’-][^\W_]+)*")
+
+INTRO_WORDS = 100
+MAX_KEYWORDS = 1000
+# Keywords listed individually in the summary; the rest are counted.
+SUMMARY_KEYWORDS = 50
+
+
+def parse_keywords(target_keywords: str) -> List[str]:
+    """Split on commas, semicolons and new lines; drop blanks and duplicates."""
+    keywords: Dict[str, str] = {}
+    for keyword in _SEPARATORS.split(target_keywords or ""):
+        keyword = " ".join(keyword.split()).strip("\"'“”")
+        if keyword and keyword.lower() not in keywords:
+            keywords[keyword.lower()] = keyword
+    return list(keywords.values())[:MAX_KEYWORDS]
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over lowercased keywords."""
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = keywords
+        self.patterns = [keyword.lower() for keyword in keywords]
+        self.bounded = [(p[0].isalnum() and not _is_han(p[0]), p[-1].isalnum() and not _is_han(p[-1])) for p in self.patterns]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        for index, pattern in enumerate(self.patterns):
+            node = 0
+            for char in pattern:
+                following = self._goto[node].get(char)
+                if following is None:
+                    following = self._goto[node][char] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = following
+            self._out[node] += (index,)
+        # Breadth-first: a node's failure link points to a shallower node,
+        # whose outputs are already complete.
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, following in self._goto[node].items():
+                queue.append(following)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[following] = target if target != following else 0
+                self._out[following] += self._out[self._fail[following]]
+
+    def scan(self, text: str):
+        """Yield ``(keyword index, start, end)`` for every occurrence in ``text``."""
+        goto, fail, out, bounded = self._goto, self._fail, self._out, self.bounded
+        lengths = [len(pattern) for pattern in self.patterns]
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters lowercase to two; keep offsets aligned.
+            lowered = "".join(c if len(c) == 1 else c[0] for c in map(str.lower, text))
+        size = len(lowered)
+        node = 0
+        for i, char in enumerate(lowered):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                for index in out[node]:
+                    start = i + 1 - lengths[index]
+                    left, right = bounded[index]
+                    if left and start > 0 and lowered[start - 1].isalnum():
+                        continue
+                    if right and i + 1 < size and lowered[i + 1].isalnum():
+                        continue
+                    yield index, start, i + 1
+
+
+def _is_han(char: str) -> bool:
+    return "㐀" <= char <= "䶿" or "一" <= char <= "鿿" or "豈" <= char <= "﫿"
+
+
+@lru_cache(maxsize=32)
+def _automaton(keywords: Tuple[str, ...]) -> KeywordAutomaton:
+    return KeywordAutomaton(list(keywords))
+
+
+class KeywordUsage:
+    """Where one keyword occurs."""
+
+    def __init__(self, keyword: str):
+        self.keyword = keyword
+        self.count = 0
+        self.headings = 0
+        self.intro = 0
+        self.first_offset: Optional[int] = None
+        self.first_line: Optional[int] = None
+        self.words = len(_WORD.findall(keyword)) or 1
+
+    @property
+    def body(self) -> int:
+        return self.count - self.headings - self.intro
+
+
+class KeywordReport:
+    """Per-keyword usage plus the content size it is measured against."""
+
+    def __init__(self, usages: List[KeywordUsage], words: int, characters: int):
+        self.usages = usages
+        self.words = words
+        self.characters = characters
+
+    def density(self, usage: KeywordUsage) -> float:
+        """Share of the content's words taken by the keyword, in percent."""
+        return 100.0 * usage.count * usage.words / self.words if self.words else 0.0
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "words": self.words,
+            "keywords": [
+                {
+                    "keyword": usage.keyword,
+                    "count": usage.count,
+                    "density": round(self.density(usage), 3),
+                    "headings": usage.headings,
+                    "intro": usage.intro,
+                    "body": usage.body,
+                    "first_offset": usage.first_offset,
+                    "first_line": usage.first_line,
+                }
+                for usage in self.usages
+            ],
+        }
+
+    def summary(self) -> str:
+        """A compact Markdown block for a prompt."""
+        if not self.usages:
+            return "- No target keywords given."
+        found = [usage for usage in self.usages if usage.count]
+        missing = [usage.keyword for usage in self.usages if not usage.count]
+        lines = [f"- Content: {self.words:,} words; keywords found: {len(found)} of {len(self.usages)}"]
+        for usage in found[:SUMMARY_KEYWORDS]:
+            position = 100 * usage.first_offset // max(self.characters, 1)
+            lines.append(
+                f'- "{usage.keyword}": {usage.count} (density {self.density(usage):.2f}%); '
+                f"first at line {usage.first_line} ({position}% in); headings {usage.headings}, "
+                f"intro {usage.intro}, body {usage.body}"
+            )
+        if len(found) > SUMMARY_KEYWORDS:
+            lines.append(f"- ... {len(found) - SUMMARY_KEYWORDS} more keywords found")
+        if missing:
+            shown = ", ".join(f'"{keyword}"' for keyword in missing[:SUMMARY_KEYWORDS])
+            more = f" and {len(missing) - SUMMARY_KEYWORDS} more" if len(missing) > SUMMARY_KEYWORDS else ""
+            lines.append(f"- Not found: {shown}{more}")
+        return "\n".join(lines)
+
+
+def _line_starts(text: str) -> List[int]:
+    starts = [0]
+    find = text.find
+    position = find("\n")
+    while position != -1:
+        starts.append(position + 1)
+        position = find("\n", position + 1)
+    return starts
+
+
+def analyze_keywords(content: str, target_keywords: str) -> KeywordReport:
+    """Count and place every target keyword in one scan of ``content``."""
+    keywords = parse_keywords(target_keywords)
+    usages = [KeywordUsage(keyword) for keyword in keywords]
+    words = 0
+    intro_end = 0
+    for match in _WORD.finditer(content):
+        words += 1
+        if words == INTRO_WORDS:
+            intro_end = match.end()
+    if words < INTRO_WORDS:
+        intro_end = len(content)
+    if not keywords:
+        return KeywordReport(usages, words, len(content))
+
+    line_starts = _line_starts(content)
+    headings = [bool(_HEADING.match(content, start)) for start in line_starts]
+    line = 0
+    for index, start, end in _automaton(tuple(keywords)).scan(content):
+        # Keywords never span lines and matches arrive in order of their end,
+        # so the line only moves forward.
+        while line + 1 < len(line_starts) and line_starts[line + 1] <= start:
+            line += 1
+        usage = usages[index]
+        usage.count += 1
+        if usage.first_offset is None or start < usage.first_offset:
+            usage.first_offset = start
+            usage.first_line = line + 1
+        if headings[line]:
+            usage.headings += 1
+        elif start < intro_end:
+            usage.intro += 1
+    return KeywordReport(usages, words, len(content))
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("usage: python -m src.keywords FILE KEYWORDS")
+        sys.exit(2)
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        content = f.read()
+    print(analyze_keywords(content, sys.argv[2]).summary())
+
+
+if __name__ == "__main__":
+    main()
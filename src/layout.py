@@ -0,0 +1,256 @@
+"""Message layouts: where a prompt's arguments are placed among its messages.
+
+Layouts are applied to template sources at compile time, like compaction, so
+they cost nothing per request.
+
+- ``standard`` renders the messages as written in the data files. Several
+  prompts repeat their main input in the system message and again in the
+  trailing user message.
+- ``single`` embeds every argument listed in a prompt's ``large`` key once,
+  where it first appears; later messages refer back to it instead. On long
+  documents this halves the bytes rendered and the input tokens billed.
+- ``stable`` puts every argument last. Each slot in the written messages is
+  replaced by a ``[name]`` reference (optional ``{name?prefix}`` slots are
+  dropped) and the values follow in one final user message. All messages
+  before it are then byte-identical across requests, a prefix that
+  provider-side prompt caches can reuse. Every rendered message carries
+  ``_meta["tobe-mcp/cache"]``: ``static`` for prefix messages, plus
+  ``breakpoint``, ``prefix_chars`` and ``prefix_digest`` on the last of them
+  and ``static_chars`` on the first message that varies.
+
+Select a layout with ``TOBE_MCP_PROMPT_LAYOUT`` (default ``standard``) or
+:func:`set_layout` before prompts are compiled.
+
+Run ``python -m src.layout`` for a per-prompt report of the bytes and
+estimated tokens each layout renders, and ``python -m src.layout
+--check-prefix`` to check that the ``stable`` prefix of every prompt is the
+same whatever the argument values.
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.templates import PLAIN, PREFIX, MessageTemplate, PromptTemplate, Slot, fold_optional_lines, parse, unparse
+
+STANDARD = "standard"
+SINGLE = "single"
+STABLE = "stable"
+LAYOUTS = (STANDARD, SINGLE, STABLE)
+
+# Replaces a repeated large argument; "{role}" is the message holding it.
+REFERENCE = "(provided in the {role} message above)"
+# Opens the final message of the stable layout.
+INPUTS_HEADER = "Inputs referenced above by name:"
+CACHE_META = "tobe-mcp/cache"
+
+_layout = os.environ.get("TOBE_MCP_PROMPT_LAYOUT", STANDARD).lower()
+if _layout not in LAYOUTS:
+    raise ValueError(f"TOBE_MCP_PROMPT_LAYOUT must be one of {', '.join(LAYOUTS)}, not {_layout!r}")
+
+
+def get_layout() -> str:
+    return _layout
+
+
+def set_layout(layout: str):
+    """Use ``layout`` for templates compiled after this call."""
+    global _layout
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}; choose from {', '.join(LAYOUTS)}")
+    _layout = layout
+
+
+def embed_once(messages: Sequence[Tuple[str, str]], large: Iterable[str]) -> List[Tuple[str, str]]:
+    """Keep the first occurrence of each ``large`` slot and refer back to it after."""
+    large = set(large)
+    if not large:
+        return list(messages)
+    placed: Dict[str, str] = {}
+    result = []
+    for role, source in messages:
+        segments = []
+        for segment in parse(source):
+            if isinstance(segment, Slot) and segment.name in large and segment.kind == PLAIN:
+                if segment.name in placed:
+                    segment = REFERENCE.format(role=placed[segment.name])
+                else:
+                    placed[segment.name] = role
+            segments.append(segment)
+        result.append((role, unparse(segments)))
+    return result
+
+
+def arguments_last(messages: Sequence[Tuple[str, str]], constants: Iterable[str] = ()) -> List[Tuple[str, str]]:
+    """Replace argument slots with references and append their values as a user message.
+
+    Slots named in ``constants`` are folded in at compile time and stay put.
+    """
+    constants = set(constants)
+    moved: Dict[str, Slot] = {}
+    result = []
+    for role, source in messages:
+        segments = []
+        # A dropped optional slot then takes its own line break with it.
+        for segment in parse(fold_optional_lines(source)):
+            if isinstance(segment, Slot) and segment.name not in constants:
+                # The value is shown unconditionally if any occurrence does so.
+                if segment.name not in moved or moved[segment.name].kind == PREFIX:
+                    moved[segment.name] = segment
+                if segment.kind == PREFIX:
+                    continue
+                segment = f"[{segment.name}]"
+            segments.append(segment)
+        result.append((role, unparse(segments)))
+    if moved:
+        inputs: List[Any] = [INPUTS_HEADER]
+        for slot in moved.values():
+            label = f"\n\n[{slot.name}]\n"
+            if slot.kind == PREFIX:
+                inputs.append(Slot(slot.name, PREFIX, label))
+            else:
+                inputs += [label, slot]
+        result.append(("user", unparse(inputs)))
+    return result
+
+
+def apply_layout(
+    messages: Sequence[Tuple[str, str]],
+    large: Iterable[str],
+    layout: Optional[str] = None,
+    constants: Iterable[str] = (),
+) -> List[Tuple[str, str]]:
+    """Message sources rearranged for ``layout`` (default: the current one)."""
+    layout = layout or _layout
+    if layout == SINGLE:
+        return embed_once(messages, large)
+    if layout == STABLE:
+        return arguments_last(messages, constants)
+    return list(messages)
+
+
+def annotate(template: PromptTemplate, layout: Optional[str] = None) -> PromptTemplate:
+    """Attach cache-boundary metadata to a template compiled for ``layout``."""
+    if (layout or _layout) != STABLE:
+        return template
+    static, static_chars = template.static_prefix()
+    prefix = [(m.role, m.template.render({})) for m in template.messages[:static]]
+    digest = hashlib.blake2b(repr(prefix).encode("utf-8"), digest_size=16).hexdigest()
+    messages = []
+    for index, message in enumerate(template.messages):
+        meta: Dict[str, Any] = {"static": index < static}
+        if index == static - 1:
+            meta.update(breakpoint=True, prefix_chars=sum(len(text) for _, text in prefix), prefix_digest=digest)
+        elif index == static:
+            meta["static_chars"] = static_chars
+        messages.append(MessageTemplate(message.role, message.template, {CACHE_META: meta}))
+    return PromptTemplate(messages)
+
+
+def compile_spec(spec, layout: str) -> PromptTemplate:
+    """``spec``'s template compiled for ``layout``, whatever the current one."""
+    from src.templates import compile_prompt
+
+    messages = apply_layout(spec.messages, spec.large, layout, spec.constants)
+    return annotate(compile_prompt(messages, **spec.constants), layout)
+
+
+def _render_sizes(layout: str, payload: int) -> Dict[str, Tuple[int, int]]:
+    from src.tokens import estimate_tokens
+    from src.prompt_store import load_directory, DATA_DIR
+
+    sizes = {}
+    for name, spec in load_directory(DATA_DIR).items():
+        template = compile_spec(spec, layout)
+        values = {argument: f"<{argument}>" for argument, _, _ in spec.arguments}
+        values.update({argument: values[argument].ljust(payload, ".") for argument in spec.large})
+        values.update({slot: "" for slot in spec.computed})
+        text = "".join(text for _, text in template.render_text(**values))
+        sizes[name] = (len(text.encode("utf-8")), estimate_tokens(text))
+    return sizes
+
+
+def report(payload: int):
+    """Print bytes and estimated tokens rendered per layout for each prompt."""
+    logging.disable(logging.INFO)
+    standard = _render_sizes(STANDARD, payload)
+    single = _render_sizes(SINGLE, payload)
+    print(f"Large arguments filled with {payload} characters\n")
+    header = f"{'prompt':<24}{'standard B':>12}{'single B':>12}{'saved':>8}{'tokens saved':>14}"
+    print(header)
+    print("-" * len(header))
+    totals = [0, 0, 0]
+    for name in standard:
+        before, before_tokens = standard[name]
+        after, after_tokens = single[name]
+        totals[0] += before
+        totals[1] += after
+        totals[2] += before_tokens - after_tokens
+        print(f"{name:<24}{before:>12}{after:>12}{(before - after) / before:>8.0%}{before_tokens - after_tokens:>14}")
+    print("-" * len(header))
+    print(f"{'total':<24}{totals[0]:>12}{totals[1]:>12}{(totals[0] - totals[1]) / totals[0]:>8.0%}{totals[2]:>14}")
+
+
+def _prefix_samples(spec) -> List[Dict[str, str]]:
+    """Argument values differing in content, length and emptiness."""
+    names = [argument for argument, _, _ in spec.arguments] + spec.computed
+    required = {argument for argument, _, required in spec.arguments if required}
+    return [
+        {name: f"<{name}>" for name in names},
+        {name: f"another {name}, longer\n[{name}] {{with braces}}" for name in names},
+        {name: "x" if name in required else "" for name in names},
+    ]
+
+
+def check_prefix() -> bool:
+    """Check that each prompt's ``stable`` prefix is identical across argument values."""
+    from src.prompt_store import load_directory, DATA_DIR
+
+    logging.disable(logging.INFO)
+    header = f"{'prompt':<24}{'standard prefix':>16}{'stable prefix':>15}  result"
+    print(header)
+    print("-" * len(header))
+    passed = True
+    for name, spec in load_directory(DATA_DIR).items():
+        standard = compile_spec(spec, STANDARD)
+        stable = compile_spec(spec, STABLE)
+        static, static_chars = stable.static_prefix()
+        problems = []
+        if static < len(spec.messages):
+            problems.append(f"only {static} of {len(spec.messages)} messages are static")
+        prefixes = set()
+        for values in _prefix_samples(spec):
+            rendered = stable.render_text(**values)
+            prefixes.add((tuple(rendered[:static]), rendered[static][1][:static_chars] if static < len(rendered) else ""))
+            if any(str(value) in text for _, text in rendered[:static] for value in values.values() if len(value) > 1):
+                problems.append("an argument value appears in the prefix")
+        if len(prefixes) != 1:
+            problems.append("prefix differs between argument values")
+        meta = [message.prototype.content.meta[CACHE_META] for message in stable.messages]
+        if not meta[static - 1].get("breakpoint"):
+            problems.append("no cache breakpoint on the last static message")
+        passed = passed and not problems
+        print(f"{name:<24}{_prefix_chars(standard):>16}{_prefix_chars(stable):>15}  {'; '.join(problems) or 'ok'}")
+    return passed
+
+
+def _prefix_chars(template: PromptTemplate) -> int:
+    static, static_chars = template.static_prefix()
+    return sum(len(m.template.render({})) for m in template.messages[:static]) + static_chars
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare rendered sizes per message layout.")
+    parser.add_argument("--payload", type=int, default=10_000, help="characters per argument (default 10000)")
+    parser.add_argument("--check-prefix", action="store_true", help="exit 1 unless every stable prefix is fixed")
+    options = parser.parse_args()
+    if options.check_prefix:
+        sys.exit(0 if check_prefix() else 1)
+    report(options.payload)
+
+
+if __name__ == "__main__":
+    main()
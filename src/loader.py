@@ -0,0 +1,194 @@
+"""Prompt registration for TOBE MCP Server: eager or lazy from a manifest.
+
+In lazy mode (the default) prompts are registered from the static manifest in
+:mod:`src.prompts.manifest`, so listing prompts imports none of the prompt
+modules. A module is imported, and its handlers built, the first time one of
+its prompts is rendered. Set ``TOBE_MCP_LAZY_PROMPTS=0`` to register every
+prompt module eagerly at startup.
+
+Regenerate the manifest after adding or changing a prompt:
+
+    python -m src.loader          # rewrite src/prompts/manifest.py
+    python -m src.loader --check  # exit 1 if the manifest is stale
+"""
+
+import argparse
+import importlib
+import inspect
+import logging
+import os
+import pprint
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.prompts.base import Prompt, PromptArgument
+
+# (module, registration function) for every prompt module, in registration order
+PROMPT_MODULES: Tuple[Tuple[str, str], ...] = (
+    ("src.prompts.developer", "developer_prompt"),
+    ("src.prompts.ui_designer", "ui_designer_prompt"),
+    ("src.prompts.english_teacher", "english_teacher_prompt"),
+    ("src.prompts.article_writer", "article_writer_prompt"),
+)
+
+MANIFEST_PATH = Path(__file__).parent / "prompts" / "manifest.py"
+
+
+def lazy_enabled() -> bool:
+    return os.environ.get("TOBE_MCP_LAZY_PROMPTS", "1").lower() not in ("0", "false", "no", "off")
+
+
+class PromptCollector:
+    """Stands in for FastMCP to capture the prompts a module registers."""
+
+    def __init__(self):
+        self.prompts: Dict[str, Prompt] = {}
+
+    def prompt(self, name: Optional[str] = None, title: Optional[str] = None, description: Optional[str] = None, **kwargs):
+        def decorator(fn):
+            prompt = Prompt.from_function(fn, name=name, title=title, description=description)
+            self.prompts[prompt.name] = prompt
+            return fn
+        return decorator
+
+
+def collect_module(module: str, registrar: str) -> Dict[str, Prompt]:
+    """Import ``module`` and run its registration function against a collector."""
+    collector = PromptCollector()
+    getattr(importlib.import_module(module), registrar)(collector)
+    return collector.prompts
+
+
+def register_eager(mcp: FastMCP):
+    """Import every prompt module and register its prompts on ``mcp``."""
+    for module, registrar in PROMPT_MODULES:
+        getattr(importlib.import_module(module), registrar)(mcp)
+
+
+class LazyModule:
+    """Loads a prompt module's handlers once, on first use, thread-safely."""
+
+    def __init__(self, module: str, registrar: str):
+        self.module = module
+        self.registrar = registrar
+        self._prompts: Optional[Dict[str, Prompt]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._prompts is not None
+
+    def get(self, name: str) -> Prompt:
+        prompts = self._prompts
+        if prompts is None:
+            with self._lock:
+                if self._prompts is None:
+                    self._prompts = collect_module(self.module, self.registrar)
+                prompts = self._prompts
+        return prompts[name]
+
+
+def _lazy_render(module: LazyModule, name: str, is_async: bool = False) -> Callable:
+    target: List[Optional[Callable]] = [None]
+
+    def render(**arguments):
+        fn = target[0]
+        if fn is None:
+            fn = target[0] = module.get(name).fn
+        return fn(**arguments)
+
+    if not is_async:
+        return render
+
+    # Wrappers check for a coroutine function to choose their async path.
+    async def render_async(**arguments):
+        return await render(**arguments)
+
+    return render_async
+
+
+def register_lazy(mcp: FastMCP, manifest: Optional[List[Dict[str, Any]]] = None) -> Dict[str, LazyModule]:
+    """Register stub prompts from the manifest; modules load on first render."""
+    if manifest is None:
+        from src.prompts.manifest import PROMPTS as manifest
+    modules: Dict[str, LazyModule] = {}
+    for entry in manifest:
+        module = modules.get(entry["module"])
+        if module is None:
+            module = modules[entry["module"]] = LazyModule(entry["module"], entry["registrar"])
+        mcp.add_prompt(
+            Prompt(
+                name=entry["name"],
+                title=entry.get("title"),
+                description=entry["description"],
+                arguments=[
+                    PromptArgument(name=arg_name, description=arg_description, required=required)
+                    for arg_name, arg_description, required in entry["arguments"]
+                ],
+                fn=_lazy_render(module, entry["name"], entry.get("async", False)),
+            )
+        )
+    return modules
+
+
+def register_prompts(mcp: FastMCP, lazy: Optional[bool] = None):
+    """Register all prompts on ``mcp``, lazily unless disabled."""
+    if lazy is None:
+        lazy = lazy_enabled()
+    if lazy:
+        register_lazy(mcp)
+    else:
+        register_eager(mcp)
+
+
+def build_manifest() -> List[Dict[str, Any]]:
+    """Build manifest entries by registering every prompt module."""
+    manifest = []
+    for module, registrar in PROMPT_MODULES:
+        for prompt in collect_module(module, registrar).values():
+            manifest.append({
+                "name": prompt.name,
+                "title": prompt.title,
+                "description": prompt.description,
+                "module": module,
+                "registrar": registrar,
+                "arguments": [
+                    (arg.name, arg.description, arg.required) for arg in prompt.arguments or []
+                ],
+                "async": inspect.iscoroutinefunction(prompt.fn),
+            })
+    return manifest
+
+
+def render_manifest(manifest: List[Dict[str, Any]]) -> str:
+    return (
+        '"""Prompt manifest for lazy registration.\n\n'
+        "Generated by ``python -m src.loader``; do not edit by hand.\n"
+        '"""\n\n'
+        f"PROMPTS = {pprint.pformat(manifest, sort_dicts=False, width=100)}\n"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the lazy prompt manifest.")
+    parser.add_argument("--check", action="store_true", help="exit 1 if the manifest is out of date")
+    options = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    content = render_manifest(build_manifest())
+    current = MANIFEST_PATH.read_text(encoding="utf-8") if MANIFEST_PATH.exists() else ""
+    if options.check:
+        if content != current:
+            print(f"{MANIFEST_PATH} is out of date; run python -m src.loader")
+            sys.exit(1)
+        print(f"{MANIFEST_PATH} is up to date")
+        return
+    MANIFEST_PATH.write_text(content, encoding="utf-8")
+    print(f"Wrote {MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,100 +1,374 @@
 """Centralized logging component for TOBE MCP Server."""
 
+import atexit
+import hashlib
 import logging
+import os
+import queue
 import sys
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
+
+# Overflow policies for the async logging queue
+OVERFLOW_DROP = "drop"
+OVERFLOW_BLOCK = "block"
+OVERFLOW_SAMPLE = "sample"
+
+ASYNC_ENABLED = os.environ.get("TOBE_MCP_LOG_ASYNC", "1").lower() not in ("0", "false", "no", "off")
+ASYNC_QUEUE_SIZE = int(os.environ.get("TOBE_MCP_LOG_QUEUE_SIZE", "10000"))
+ASYNC_OVERFLOW = os.environ.get("TOBE_MCP_LOG_OVERFLOW", OVERFLOW_DROP).lower()
+ASYNC_SAMPLE_RATE = int(os.environ.get("TOBE_MCP_LOG_SAMPLE_RATE", "10"))
+MAX_FIELD_CHARS = int(os.environ.get("TOBE_MCP_LOG_MAX_FIELD", "256"))
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Queue handler that applies an overflow policy when the queue is full.
+
+    Records are enqueued unformatted; the listener thread does the formatting.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        overflow: str = OVERFLOW_DROP,
+        sample_rate: int = 10,
+        sinks: Tuple[str, ...] = (),
+    ):
+        super().__init__(log_queue)
+        if overflow not in (OVERFLOW_DROP, OVERFLOW_BLOCK, OVERFLOW_SAMPLE):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.overflow = overflow
+        self.sinks = sinks
+        self.sample_rate = max(1, sample_rate)
+        self.dropped = 0
+        self._overflowed = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info and not record.exc_text:
+            # Tracebacks reference live frames; render them before handing off.
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.tobe_sinks = self.sinks
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.overflow == OVERFLOW_BLOCK:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._overflowed += 1
+            if self.overflow == OVERFLOW_SAMPLE and (self._overflowed - 1) % self.sample_rate == 0:
+                # Keep one in every sample_rate overflowing records, waiting for room.
+                self.queue.put(record)
+            else:
+                self.dropped += 1
+
+
+class _SinkDispatcher(logging.Handler):
+    """Listener-side handler that routes each record to the sinks it was tagged with."""
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        for key in getattr(record, "tobe_sinks", ()):
+            sink = _sinks.get(key)
+            if sink is not None:
+                sink.handle(record)
+        return True
+
+    def emit(self, record: logging.LogRecord):
+        self.handle(record)
+
+
+class _FlushingQueueListener(QueueListener):
+    """Queue listener whose stop() waits for the queue to drain, even when full."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+STDOUT_SINK = "<stdout>"
+
+_FORMATTER = logging.Formatter(
+    "%(asctime)s | %(levelname)-8s | %(name)s | %(filename)s:%(lineno)d | %(message)s",
+    "%Y-%m-%d %H:%M:%S"
+)
+
+# Process-wide registry: one handler per destination, one async pipeline, one
+# TOBELogger per name.
+_registry_lock = threading.RLock()
+_sinks: Dict[str, logging.Handler] = {}
+_loggers: Dict[str, "TOBELogger"] = {}
+_queue: Optional[queue.Queue] = None
+_listener: Optional[_FlushingQueueListener] = None
+
+
+def _get_sink(destination: str) -> Optional[logging.Handler]:
+    """Return the shared handler for ``destination``, creating it on first use."""
+    with _registry_lock:
+        sink = _sinks.get(destination)
+        if sink is not None:
+            return sink
+        if destination == STDOUT_SINK:
+            sink = logging.StreamHandler(sys.stdout)
+        else:
+            try:
+                Path(destination).parent.mkdir(parents=True, exist_ok=True)
+                sink = logging.FileHandler(destination, encoding='utf-8')
+            except Exception as e:
+                sys.stderr.write(f"Failed to setup file logging: {e}\n")
+                return None
+        sink.setFormatter(_FORMATTER)
+        _sinks[destination] = sink
+        return sink
+
+
+def _get_queue() -> queue.Queue:
+    """Return the shared async logging queue, starting its listener on first use."""
+    global _queue, _listener
+    with _registry_lock:
+        if _queue is None:
+            _queue = queue.Queue(maxsize=ASYNC_QUEUE_SIZE)
+        if _listener is None:
+            _listener = _FlushingQueueListener(_queue, _SinkDispatcher())
+            _listener.start()
+        return _queue
+
+
+def open_sink_count() -> int:
+    """Number of sink handlers (open streams and files) shared by all loggers."""
+    with _registry_lock:
+        return len(_sinks)
+
+
+def flush_logging():
+    """Block until every queued record has been written to its sinks."""
+    with _registry_lock:
+        if _listener is not None and _listener._thread is not None:
+            _listener.stop()
+            _listener.start()
+        for sink in _sinks.values():
+            sink.flush()
+
+
+def shutdown_logging():
+    """Drain the async queue, then flush and close every sink.
+
+    Runs at exit, when a sink's stream may already be closed (pytest closes
+    the stdout it captured): such a sink is skipped, not raised from.
+    """
+    global _listener, _default_logger
+    with _registry_lock:
+        # Stop the listener first, so no record is written to a closed sink.
+        if _listener is not None and _listener._thread is not None:
+            _listener.stop()
+        _listener = None
+        for sink in _sinks.values():
+            try:
+                sink.flush()
+                sink.close()
+            except (ValueError, OSError):
+                pass
+        _sinks.clear()
+        for tobe_logger in _loggers.values():
+            tobe_logger.logger.handlers.clear()
+        _loggers.clear()
+        _default_logger = None
+
+
+atexit.register(shutdown_logging)
+
+
+def _reinit_after_fork():
+    """Give a forked child its own queue and listener; threads do not survive fork."""
+    global _registry_lock, _queue, _listener
+    _registry_lock = threading.RLock()
+    if _queue is None:
+        return
+    # The parent's queue may be locked by its listener thread; start over.
+    _queue = queue.Queue(maxsize=ASYNC_QUEUE_SIZE)
+    _listener = None
+    for tobe_logger in _loggers.values():
+        if tobe_logger.queue_handler is not None:
+            tobe_logger.queue_handler.queue = _queue
+    _get_queue()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
+class LogPayload:
+    """Log argument rendered lazily, with oversized values replaced by a digest.
+
+    ``str()`` runs only when a record is formatted, on the listener thread in
+    async mode. Values longer than ``limit`` characters become
+    ``<N chars #digest>``; dict values are capped one by one.
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value, limit: int = 256):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        value = self.value
+        if isinstance(value, dict):
+            return "{" + ", ".join(f"{key!r}: {LogPayload(item, self.limit)!r}" for key, item in value.items()) + "}"
+        text = value if isinstance(value, str) else str(value)
+        if self.limit and len(text) > self.limit:
+            digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=4).hexdigest()
+            return f"<{len(text)} chars #{digest}>"
+        return text
+
+    def __repr__(self) -> str:
+        if isinstance(self.value, str) and (not self.limit or len(self.value) <= self.limit):
+            return repr(self.value)
+        return str(self)
+
+
+_PAYLOAD_TYPES = (str, bytes, dict, list, tuple)
 
 
 class TOBELogger:
     """Centralized logger for TOBE MCP Server."""
     
-    def __init__(self, name: str = "tobe-mcp", level: int = logging.INFO, log_file: Optional[str] = None):
+    def __init__(
+        self,
+        name: str = "tobe-mcp",
+        level: int = logging.INFO,
+        log_file: Optional[str] = None,
+        async_mode: Optional[bool] = None,
+        overflow: Optional[str] = None,
+    ):
         self.name = name
         self.level = level
         self.log_file = log_file
+        self.async_mode = ASYNC_ENABLED if async_mode is None else async_mode
+        self.queue_handler: Optional[BoundedQueueHandler] = None
+        self.max_field_chars = MAX_FIELD_CHARS
         
         # Create logger
         self.logger = logging.getLogger(name)
         self.logger.setLevel(level)
         self.logger.handlers.clear()
         
-        # Formatter
-        formatter = logging.Formatter(
-            "%(asctime)s | %(levelname)-8s | %(name)s | %(filename)s:%(lineno)d | %(message)s",
-            "%Y-%m-%d %H:%M:%S"
-        )
-        
-        # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(level)
-        console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
-        
-        # File handler
+        # Shared console and file sinks
+        destinations = [STDOUT_SINK]
         if log_file:
-            self._setup_file_handler(log_file, formatter)
+            destinations.append(str(Path(log_file).resolve()))
+        sinks = tuple(d for d in destinations if _get_sink(d) is not None)
+        
+        if self.async_mode:
+            self.queue_handler = BoundedQueueHandler(
+                _get_queue(),
+                ASYNC_OVERFLOW if overflow is None else overflow,
+                ASYNC_SAMPLE_RATE,
+                sinks,
+            )
+            self.queue_handler.setLevel(level)
+            self.logger.addHandler(self.queue_handler)
+        else:
+            for destination in sinks:
+                self.logger.addHandler(_sinks[destination])
         
         self.logger.propagate = False
     
-    def _setup_file_handler(self, log_file: str, formatter: logging.Formatter):
-        try:
-            log_path = Path(log_file)
-            log_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(self.level)
-            file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
-        except Exception as e:
-            self.logger.error(f"Failed to setup file logging: {e}")
+    def set_level(self, level: int):
+        self.level = level
+        self.logger.setLevel(level)
+        if self.queue_handler is not None:
+            self.queue_handler.setLevel(level)
+    
+    def flush(self):
+        """Block until queued records are written."""
+        flush_logging()
+    
+    def is_enabled_for(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+    
+    def _log(self, level: int, message: str, args: tuple, kwargs: dict):
+        # Level guard first: nothing below is evaluated for disabled levels.
+        if not self.logger.isEnabledFor(level):
+            return
+        if args:
+            args = tuple(
+                LogPayload(arg, self.max_field_chars) if isinstance(arg, _PAYLOAD_TYPES) else arg
+                for arg in args
+            )
+        kwargs.setdefault("stacklevel", 3)
+        self.logger.log(level, message, *args, **kwargs)
     
     def debug(self, message: str, *args, **kwargs):
-        self.logger.debug(message, *args, **kwargs)
+        self._log(logging.DEBUG, message, args, kwargs)
     
     def info(self, message: str, *args, **kwargs):
-        self.logger.info(message, *args, **kwargs)
+        self._log(logging.INFO, message, args, kwargs)
     
     def warning(self, message: str, *args, **kwargs):
-        self.logger.warning(message, *args, **kwargs)
+        self._log(logging.WARNING, message, args, kwargs)
     
     def error(self, message: str, *args, **kwargs):
-        self.logger.error(message, *args, **kwargs)
+        self._log(logging.ERROR, message, args, kwargs)
     
     def critical(self, message: str, *args, **kwargs):
-        self.logger.critical(message, *args, **kwargs)
+        self._log(logging.CRITICAL, message, args, kwargs)
     
     def exception(self, message: str, *args, **kwargs):
-        self.logger.exception(message, *args, **kwargs)
+        kwargs.setdefault("exc_info", True)
+        self._log(logging.ERROR, message, args, kwargs)
     
     def log_tool_call(self, tool_name: str, arguments: dict, success: bool, duration: float = None):
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         status = "SUCCESS" if success else "FAILED"
-        duration_str = f" ({duration:.3f}s)" if duration is not None else ""
-        self.info(f"Tool call: {tool_name} | Status: {status} | Args: {arguments}{duration_str}")
+        if duration is not None:
+            self.info("Tool call: %s | Status: %s | Args: %s (%.3fs)", tool_name, status, arguments, duration, stacklevel=4)
+        else:
+            self.info("Tool call: %s | Status: %s | Args: %s", tool_name, status, arguments, stacklevel=4)
     
     def log_server_event(self, event: str, details: dict = None):
-        details_str = f" | Details: {details}" if details else ""
-        self.info(f"Server event: {event}{details_str}")
+        if details:
+            self.info("Server event: %s | Details: %s", event, details, stacklevel=4)
+        else:
+            self.info("Server event: %s", event, stacklevel=4)
     
     def log_performance(self, operation: str, duration: float, additional_info: dict = None):
         """Log performance metrics."""
-        info_str = f" | Info: {additional_info}" if additional_info else ""
-        self.info(f"Performance: {operation} | Duration: {duration:.3f}s{info_str}")
-
-
-# Global logger instance
-_logger_instance: Optional[TOBELogger] = None
+        if additional_info:
+            self.info("Performance: %s | Duration: %.3fs | Info: %s", operation, duration, additional_info, stacklevel=4)
+        else:
+            self.info("Performance: %s | Duration: %.3fs", operation, duration, stacklevel=4)
 
 
-def get_logger(name: str = "tobe-mcp", level: int = logging.INFO, log_file: Optional[str] = None) -> TOBELogger:
+def get_logger(
+    name: str = "tobe-mcp",
+    level: int = logging.INFO,
+    log_file: Optional[str] = None,
+    async_mode: Optional[bool] = None,
+) -> TOBELogger:
+    """Return the shared TOBELogger for ``name``, creating it on first use."""
     if log_file is None:
         log_file = Path(__file__).parent.parent / "logs" / "tobe-mcp.log"
+    log_file = str(log_file)
+    async_mode = ASYNC_ENABLED if async_mode is None else async_mode
     
-    return TOBELogger(name=name, level=level, log_file=str(log_file))
+    with _registry_lock:
+        existing = _loggers.get(name)
+        if existing is not None and existing.log_file == log_file and existing.async_mode == async_mode:
+            if existing.level != level:
+                existing.set_level(level)
+            return existing
+        tobe_logger = TOBELogger(name=name, level=level, log_file=log_file, async_mode=async_mode)
+        _loggers[name] = tobe_logger
+        return tobe_logger
 
 
-def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> TOBELogger:
+def setup_logging(level: str = "INFO", log_file: Optional[str] = None, async_mode: Optional[bool] = None) -> TOBELogger:
     level_map = {
         "DEBUG": logging.DEBUG,
         "INFO": logging.INFO,
@@ -104,7 +378,7 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> TOBELo
     }
     
     log_level = level_map.get(level.upper(), logging.INFO)
-    return get_logger("tobe-mcp", log_level, log_file)
+    return get_logger("tobe-mcp", log_level, log_file, async_mode)
 
 
 # Global default logger for convenience functions
@@ -113,29 +387,37 @@ _default_logger = None
 def _get_default_logger():
     global _default_logger
     if _default_logger is None:
-        _default_logger = get_logger()
+        with _registry_lock:
+            if _default_logger is None:
+                _default_logger = get_logger()
     return _default_logger
 
 # Convenience functions
 def debug(message: str, *args, **kwargs):
+    kwargs.setdefault("stacklevel", 4)
     _get_default_logger().debug(message, *args, **kwargs)
 
 
 def info(message: str, *args, **kwargs):
+    kwargs.setdefault("stacklevel", 4)
     _get_default_logger().info(message, *args, **kwargs)
 
 
 def warning(message: str, *args, **kwargs):
+    kwargs.setdefault("stacklevel", 4)
     _get_default_logger().warning(message, *args, **kwargs)
 
 
 def error(message: str, *args, **kwargs):
+    kwargs.setdefault("stacklevel", 4)
     _get_default_logger().error(message, *args, **kwargs)
 
 
 def critical(message: str, *args, **kwargs):
+    kwargs.setdefault("stacklevel", 4)
     _get_default_logger().critical(message, *args, **kwargs)
 
 
 def exception(message: str, *args, **kwargs):
+    kwargs.setdefault("stacklevel", 4)
     _get_default_logger().exception(message, *args, **kwargs) 
\ No newline at end of file
@@ -0,0 +1,294 @@
+"""Per-prompt metrics: request and error counters plus size and latency histograms.
+
+Renders are recorded by :mod:`src.instrumentation`: every render is counted,
+and sampled ones add their latency and the size of their arguments and of
+the rendered messages, in characters. Updates go to a shard owned by
+the calling thread, so the hot path takes no lock. A snapshot sums the
+shards; it may miss renders that are still being recorded.
+
+Metrics are exposed in the Prometheus text format:
+
+- on the SSE and streamable HTTP transports at ``TOBE_MCP_METRICS_PATH``;
+- in a snapshot file rewritten every ``TOBE_MCP_METRICS_INTERVAL`` seconds
+  and when the server stops, for stdio or any other transport. A ``.json``
+  path gets JSON instead.
+
+Values are per process: with several workers, each one serves and writes its
+own.
+
+Environment variables:
+
+- ``TOBE_MCP_METRICS``: ``0`` disables metrics (default ``1``).
+- ``TOBE_MCP_METRICS_PATH``: HTTP path of the text endpoint (default
+  ``/metrics``).
+- ``TOBE_MCP_METRICS_FILE``: snapshot file path; ``{pid}`` is replaced by the
+  process id (default: no file).
+- ``TOBE_MCP_METRICS_INTERVAL``: seconds between snapshots (default 60).
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from mcp.server.fastmcp import FastMCP
+
+from src.logger import get_logger
+
+# Histogram bucket upper bounds; the last bucket is +Inf.
+LATENCY_BOUNDS_NS = (
+    50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000,
+    10_000_000, 25_000_000, 50_000_000, 100_000_000, 250_000_000, 1_000_000_000,
+)
+SIZE_BOUNDS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Layout of a per-prompt row: counters, then each histogram's buckets and sum.
+_REQUESTS = 0
+_ERRORS = 1
+_LATENCY = 2
+_LATENCY_SUM = _LATENCY + len(LATENCY_BOUNDS_NS) + 1
+_INPUT = _LATENCY_SUM + 1
+_INPUT_SUM = _INPUT + len(SIZE_BOUNDS) + 1
+_OUTPUT = _INPUT_SUM + 1
+_OUTPUT_SUM = _OUTPUT + len(SIZE_BOUNDS) + 1
+_ROW_WIDTH = _OUTPUT_SUM + 1
+
+logger = get_logger("metrics")
+
+
+def metrics_enabled() -> bool:
+    return os.environ.get("TOBE_MCP_METRICS", "1").lower() not in ("0", "false", "no", "off")
+
+
+class PromptMetrics:
+    """Process-wide per-prompt counters and histograms, sharded by thread."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Dict[str, List[int]]] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> Dict[str, List[int]]:
+        shard: Dict[str, List[int]] = {}
+        self._local.shard = shard
+        with self._lock:
+            self._shards.append(shard)
+        return shard
+
+    def observe(self, name: str, duration_ns: int, input_size: int, output_size: int, error: bool = False):
+        """Record one render of ``name``."""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._shard()
+        row = shard.get(name)
+        if row is None:
+            row = shard[name] = [0] * _ROW_WIDTH
+        row[_REQUESTS] += 1
+        if error:
+            row[_ERRORS] += 1
+        row[_LATENCY + bisect_left(LATENCY_BOUNDS_NS, duration_ns)] += 1
+        row[_LATENCY_SUM] += duration_ns
+        row[_INPUT + bisect_left(SIZE_BOUNDS, input_size)] += 1
+        row[_INPUT_SUM] += input_size
+        row[_OUTPUT + bisect_left(SIZE_BOUNDS, output_size)] += 1
+        row[_OUTPUT_SUM] += output_size
+
+    def count(self, name: str, error: bool = False):
+        """Record a render without timing or sizes (counters only)."""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._shard()
+        row = shard.get(name)
+        if row is None:
+            row = shard[name] = [0] * _ROW_WIDTH
+        row[_REQUESTS] += 1
+        if error:
+            row[_ERRORS] += 1
+
+    def _merged(self) -> Dict[str, List[int]]:
+        with self._lock:
+            shards = list(self._shards)
+        totals: Dict[str, List[int]] = {}
+        for shard in shards:
+            for name, row in list(shard.items()):
+                total = totals.get(name)
+                if total is None:
+                    totals[name] = list(row)
+                else:
+                    for i, value in enumerate(row):
+                        total[i] += value
+        return totals
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-prompt totals; histogram buckets are per bucket, not cumulative."""
+        snapshot = {}
+        for name, row in sorted(self._merged().items()):
+            snapshot[name] = {
+                "requests": row[_REQUESTS],
+                "errors": row[_ERRORS],
+                "latency_ns": _histogram(row, _LATENCY, LATENCY_BOUNDS_NS),
+                "input_chars": _histogram(row, _INPUT, SIZE_BOUNDS),
+                "output_chars": _histogram(row, _OUTPUT, SIZE_BOUNDS),
+            }
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+
+    def exposition(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines: List[str] = []
+        for metric, key, help_text in (
+            ("tobe_mcp_prompt_requests_total", "requests", "Prompt renders."),
+            ("tobe_mcp_prompt_errors_total", "errors", "Prompt renders that raised an error."),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for name, stats in snapshot.items():
+                lines.append(f'{metric}{{prompt="{name}"}} {stats[key]}')
+        for metric, key, help_text, scale in (
+            ("tobe_mcp_prompt_render_seconds", "latency_ns", "Prompt render latency.", 1e-9),
+            ("tobe_mcp_prompt_input_chars", "input_chars", "Characters in prompt arguments.", 1),
+            ("tobe_mcp_prompt_output_chars", "output_chars", "Characters in rendered messages.", 1),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, stats in snapshot.items():
+                histogram = stats[key]
+                cumulative = 0
+                for bound, count in zip(histogram["bounds"], histogram["buckets"]):
+                    cumulative += count
+                    le = "+Inf" if bound is None else _number(bound * scale)
+                    lines.append(f'{metric}_bucket{{prompt="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{prompt="{name}"}} {_number(histogram["sum"] * scale)}')
+                lines.append(f'{metric}_count{{prompt="{name}"}} {histogram["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+def _histogram(row: List[int], start: int, bounds: Sequence[int]) -> Dict[str, Any]:
+    buckets = row[start:start + len(bounds) + 1]
+    return {
+        "bounds": list(bounds) + [None],
+        "buckets": buckets,
+        "sum": row[start + len(bounds) + 1],
+        "count": sum(buckets),
+    }
+
+
+def _number(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(value)
+
+
+def message_chars(messages: Any) -> int:
+    """Characters of text in rendered prompt messages."""
+    if not isinstance(messages, (list, tuple)):
+        messages = [messages]
+    size = 0
+    for message in messages:
+        content = getattr(message, "content", message)
+        text = getattr(content, "text", content)
+        if isinstance(text, str):
+            size += len(text)
+    return size
+
+
+_metrics: Optional[PromptMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> PromptMetrics:
+    """The process-wide metrics registry."""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = PromptMetrics()
+    return _metrics
+
+
+def write_snapshot(metrics: PromptMetrics, path: Path):
+    """Write the metrics to ``path`` atomically (JSON for ``.json`` paths)."""
+    if path.suffix == ".json":
+        content = json.dumps({"time": time.time(), "pid": os.getpid(), "prompts": metrics.snapshot()}, indent=2)
+    else:
+        content = metrics.exposition()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(content, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class SnapshotWriter:
+    """Rewrites a metrics snapshot file periodically from a daemon thread."""
+
+    def __init__(self, metrics: PromptMetrics, path_template: str, interval: float = 60.0):
+        self.metrics = metrics
+        self.path_template = path_template
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def path(self) -> Path:
+        return Path(self.path_template.replace("{pid}", str(os.getpid())))
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the thread and write a final snapshot."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
+
+    def write(self):
+        try:
+            write_snapshot(self.metrics, self.path)
+        except OSError as e:
+            logger.error("Failed to write metrics snapshot %s: %s", self.path, e)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+
+def _reinit_after_fork():
+    # The parent's snapshot may have held the lock while forking.
+    if _metrics is not None:
+        _metrics._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
+def add_metrics_route(mcp: FastMCP, metrics: PromptMetrics, path: Optional[str] = None):
+    """Serve the text exposition at ``path`` on the HTTP transports."""
+    from starlette.responses import PlainTextResponse
+
+    path = path or os.environ.get("TOBE_MCP_METRICS_PATH", "/metrics")
+
+    @mcp.custom_route(path, methods=["GET"], include_in_schema=False)
+    async def metrics_endpoint(request):
+        return PlainTextResponse(metrics.exposition(), media_type="text/plain; version=0.0.4")
+
+
+def start_snapshot_writer(metrics: PromptMetrics) -> Optional[SnapshotWriter]:
+    """Start the snapshot file writer if ``TOBE_MCP_METRICS_FILE`` is set."""
+    path = os.environ.get("TOBE_MCP_METRICS_FILE")
+    if not path:
+        return None
+    writer = SnapshotWriter(metrics, path, float(os.environ.get("TOBE_MCP_METRICS_INTERVAL", "60")))
+    writer.start()
+    return writer
+
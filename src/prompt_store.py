@@ -0,0 +1,410 @@
+"""Prompt templates loaded from data files, with hot reload.
+
+Every prompt is described by one TOML file under ``src/prompts/data/<group>/``:
+
+    name = "design"
+    description = "design a feature"
+
+    [[arguments]]
+    name = "requirements"
+    required = true
+
+    [[messages]]
+    role = "system"
+    text = '''
+    {role_profile}
+    You are required to design a software system ...
+    '''
+
+``text`` uses the :mod:`src.templates` syntax. Slots the handler fills itself
+rather than from an argument (e.g. locally computed metrics) are listed in a
+top-level ``computed = ["text_metrics"]``; arguments that may be large, and
+are embedded once in the ``single`` layout (see :mod:`src.layout`), in
+``large``. A ``_shared.toml`` file in the same directory holds a
+``[constants]`` table folded into each of its templates at compile time. The handlers in :mod:`src.prompts` keep argument
+types, defaults and logging, and render through :meth:`PromptStore.template`.
+
+With reloading on, a background thread polls the files. Once a change has
+settled, the whole directory is re-parsed and compiled off the request path
+and swapped in with a single assignment: a render uses either the old or the
+new template, never a mix. A directory that fails to load is logged and
+ignored, and the previous templates stay in service.
+
+Environment variables:
+
+- ``TOBE_MCP_PROMPT_DIR``: directory to load instead of ``src/prompts/data``.
+- ``TOBE_MCP_PROMPT_RELOAD``: seconds between polls, ``0`` to turn reloading
+  off (default 0).
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+from mcp.server.fastmcp import FastMCP
+
+from src import compaction, layout
+from src.logger import get_logger
+from src.registration import registered_prompts
+from src.templates import PromptTemplate, compile_prompt
+
+DATA_DIR = Path(__file__).parent / "prompts" / "data"
+SHARED_FILE = "_shared.toml"
+ROLES = ("system", "user", "assistant")
+
+logger = get_logger("prompt_store")
+
+
+class PromptStoreError(ValueError):
+    """Raised when a prompt data file is missing, malformed or inconsistent."""
+
+
+def reload_interval() -> float:
+    return float(os.environ.get("TOBE_MCP_PROMPT_RELOAD", "0"))
+
+
+class PromptSpec:
+    """One prompt as read from its data file; compiles its template on demand."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        arguments: List[Tuple[str, Optional[str], bool]],
+        messages: List[Tuple[str, str]],
+        constants: Dict[str, Any],
+        path: Optional[Path] = None,
+        title: Optional[str] = None,
+        computed: Optional[List[str]] = None,
+        large: Optional[List[str]] = None,
+    ):
+        self.name = name
+        self.title = title
+        self.description = description
+        self.arguments = arguments
+        self.messages = messages
+        self.constants = constants
+        self.path = path
+        self.computed = list(computed or [])
+        self.large = list(large or [])
+        self.digest = hashlib.blake2b(
+            repr((
+                title, description, arguments, messages, self.computed, self.large, sorted(constants.items())
+            )).encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        self._compiled: Optional[Tuple[Tuple[bool, str], PromptTemplate]] = None
+
+    @property
+    def template(self) -> PromptTemplate:
+        settings = (compaction.is_enabled(), layout.get_layout())
+        compiled = self._compiled
+        if compiled is None or compiled[0] != settings:
+            messages = layout.apply_layout(self.messages, self.large, settings[1], self.constants)
+            template = layout.annotate(compile_prompt(messages, compact=settings[0], **self.constants), settings[1])
+            compiled = self._compiled = (settings, template)
+        return compiled[1]
+
+    def validate(self):
+        """Compile the template and check its slots against the arguments."""
+        declared = {name for name, _, _ in self.arguments} | set(self.computed)
+        unknown = [name for name in self.template.names if name not in declared]
+        if unknown:
+            raise PromptStoreError(f"{self.path}: template uses undeclared arguments {unknown}")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], constants: Dict[str, Any], path: Optional[Path] = None) -> "PromptSpec":
+        try:
+            arguments = [
+                (arg["name"], arg.get("description"), bool(arg.get("required", True)))
+                for arg in data.get("arguments", [])
+            ]
+            messages = [(message["role"], message["text"]) for message in data["messages"]]
+            spec = cls(
+                name=data["name"],
+                description=data.get("description", ""),
+                arguments=arguments,
+                messages=messages,
+                constants=constants,
+                path=path,
+                title=data.get("title"),
+                computed=data.get("computed"),
+                large=data.get("large"),
+            )
+        except (KeyError, TypeError) as e:
+            raise PromptStoreError(f"{path}: missing or invalid field {e}") from e
+        for role, _ in messages:
+            if role not in ROLES:
+                raise PromptStoreError(f"{path}: unknown role {role!r}")
+        return spec
+
+
+def _read_toml(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    except tomllib.TOMLDecodeError as e:
+        raise PromptStoreError(f"{path}: {e}") from e
+
+
+def scan_directory(directory: Path) -> Dict[str, Tuple[int, int]]:
+    """Modification time and size of every data file, to detect changes."""
+    stamps = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith(".toml"):
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                stamps[os.path.relpath(path, directory)] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+
+def load_directory(directory: Path) -> Dict[str, PromptSpec]:
+    """Parse every prompt file under ``directory``; raises PromptStoreError."""
+    if not directory.is_dir():
+        raise PromptStoreError(f"Prompt directory not found: {directory}")
+    specs: Dict[str, PromptSpec] = {}
+    shared: Dict[Path, Dict[str, Any]] = {}
+    for path in sorted(directory.rglob("*.toml")):
+        if path.name.startswith("_"):
+            continue
+        constants = shared.get(path.parent)
+        if constants is None:
+            shared_path = path.parent / SHARED_FILE
+            constants = _read_toml(shared_path).get("constants", {}) if shared_path.exists() else {}
+            shared[path.parent] = constants
+        spec = PromptSpec.from_dict(_read_toml(path), constants, path)
+        if spec.name in specs:
+            raise PromptStoreError(f"{path}: prompt {spec.name!r} is also defined in {specs[spec.name].path}")
+        specs[spec.name] = spec
+    return specs
+
+
+class TemplateRef:
+    """Renders the store's current template for one prompt.
+
+    Each render looks the template up once, so a reload swaps whole templates
+    between renders and never during one.
+    """
+
+    __slots__ = ("store", "name")
+
+    def __init__(self, store: "PromptStore", name: str):
+        self.store = store
+        self.name = name
+
+    @property
+    def current(self) -> PromptTemplate:
+        return self.store.get(self.name).template
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return self.current.names
+
+    @property
+    def messages(self):
+        return self.current.messages
+
+    def render(self, **values: Any):
+        return self.current.render(**values)
+
+    def render_text(self, **values: Any):
+        return self.current.render_text(**values)
+
+
+# Stores with a running watcher; restarted in forked children.
+_watching: "weakref.WeakSet[PromptStore]" = weakref.WeakSet()
+
+
+class PromptStore:
+    """Prompt specs from a data directory, swapped atomically on reload."""
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory or os.environ.get("TOBE_MCP_PROMPT_DIR") or DATA_DIR)
+        self.version = 0
+        self._specs: Optional[Dict[str, PromptSpec]] = None
+        self._stamps: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[List[str]], None]] = []
+        self._interval = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def specs(self) -> Dict[str, PromptSpec]:
+        specs = self._specs
+        if specs is None:
+            with self._lock:
+                if self._specs is None:
+                    from src.bundle import load_bundle
+
+                    stamps = scan_directory(self.directory) if self.directory.is_dir() else {}
+                    self._specs = load_bundle(self.directory) or load_directory(self.directory)
+                    self._stamps = stamps
+                    self.version += 1
+                specs = self._specs
+        return specs
+
+    def names(self) -> List[str]:
+        return list(self.specs)
+
+    def get(self, name: str) -> PromptSpec:
+        try:
+            return self.specs[name]
+        except KeyError:
+            raise PromptStoreError(f"No data file defines prompt {name!r} in {self.directory}") from None
+
+    def template(self, name: str) -> TemplateRef:
+        self.get(name).validate()
+        return TemplateRef(self, name)
+
+    def description(self, name: str) -> str:
+        return self.get(name).description
+
+    def add_listener(self, listener: Callable[[List[str]], None]):
+        """Call ``listener(names)`` with the changed prompt names after each reload."""
+        self._listeners.append(listener)
+
+    def reload(self, force: bool = False) -> List[str]:
+        """Re-read the directory if any file changed; returns the changed prompt names."""
+        with self._lock:
+            stamps = scan_directory(self.directory) if self.directory.is_dir() else {}
+            if not force and self._specs is not None and stamps == self._stamps:
+                return []
+            try:
+                specs = load_directory(self.directory)
+                for spec in specs.values():
+                    spec.validate()
+            except (PromptStoreError, OSError) as e:
+                # Keep serving the previous templates until the files are fixed.
+                self._stamps = stamps
+                logger.error("Prompt reload failed, keeping version %d: %s", self.version, e)
+                return []
+            previous = self._specs or {}
+            changed = sorted(
+                name for name in set(previous) | set(specs)
+                if name not in previous or name not in specs or previous[name].digest != specs[name].digest
+            )
+            self._specs = specs
+            self._stamps = stamps
+            self.version += 1
+        if changed:
+            logger.log_server_event("Prompts reloaded", {"version": self.version, "changed": changed})
+            for listener in self._listeners:
+                try:
+                    listener(changed)
+                except Exception:
+                    logger.exception("Prompt reload listener failed")
+        return changed
+
+    def watch(self, interval: float):
+        """Poll the directory every ``interval`` seconds in a daemon thread."""
+        self.specs  # load before the first poll
+        self._interval = interval
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch_loop, name="prompt-store-watch", daemon=True)
+        self._thread.start()
+        _watching.add(self)
+
+    def stop(self):
+        self._stop.set()
+        _watching.discard(self)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _watch_loop(self):
+        pending = None
+        while not self._stop.wait(self._interval):
+            try:
+                stamps = scan_directory(self.directory) if self.directory.is_dir() else {}
+            except OSError:
+                continue
+            if stamps == self._stamps:
+                pending = None
+            elif stamps == pending:
+                # Unchanged for a whole interval: the editor is done writing.
+                self.reload()
+                pending = None
+            else:
+                pending = stamps
+
+    def _restart_after_fork(self):
+        self._lock = threading.Lock()
+        if self._interval > 0:
+            self.watch(self._interval)
+
+
+def _restart_watchers():
+    for store in list(_watching):
+        store._restart_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_watchers)
+
+
+_default_store: Optional[PromptStore] = None
+_default_lock = threading.Lock()
+
+
+def get_prompt_store() -> PromptStore:
+    """The process-wide store the prompt modules render from."""
+    global _default_store
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                _default_store = PromptStore()
+    return _default_store
+
+
+def apply_metadata(mcp: FastMCP, store: PromptStore, names: Optional[Iterable[str]] = None):
+    """Copy titles and descriptions from the data files onto registered prompts."""
+    selected = set(names) if names is not None else None
+    for prompt in registered_prompts(mcp):
+        if selected is not None and prompt.name not in selected:
+            continue
+        spec = store.specs.get(prompt.name)
+        if spec is None:
+            continue
+        prompt.title = spec.title
+        prompt.description = spec.description
+        descriptions = {name: description for name, description, _ in spec.arguments}
+        for argument in prompt.arguments or []:
+            if argument.name in descriptions:
+                argument.description = descriptions[argument.name]
+
+
+def install_prompt_reload(
+    mcp: FastMCP, on_change: Optional[Callable[[List[str]], None]] = None, interval: Optional[float] = None
+) -> Optional[PromptStore]:
+    """Start polling the prompt directory when reloading is enabled.
+
+    Changed templates take effect on the next render; descriptions are updated
+    on the registered prompts and ``on_change(names)`` is called, e.g. to drop
+    cached renders.
+    """
+    interval = reload_interval() if interval is None else interval
+    if interval <= 0:
+        return None
+    store = get_prompt_store()
+    apply_metadata(mcp, store)
+
+    def changed(names: List[str]):
+        apply_metadata(mcp, store, names)
+        if on_change is not None:
+            on_change(names)
+
+    store.add_listener(changed)
+    store.watch(interval)
+    logger.log_server_event("Watching prompt files", {"directory": str(store.directory), "interval": interval})
+    return store
@@ -1,414 +1,74 @@
+import anyio
 from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.prompts.base import Message
+from src.keywords import analyze_keywords
 from src.logger import get_logger
+from src.prompt_store import get_prompt_store
+from src.text_stats import analyze
 
 def article_writer_prompt(mcp: FastMCP):
 
     logger = get_logger("article_writer_prompt")
+    store = get_prompt_store()
 
-    role_profile = """
-        You are a senior content writer and article creator with 10 years of experience in professional writing, named Alex.
-        You are a master of content creation, SEO optimization, storytelling, and multilingual writing in both English and Chinese.
-        You are able to create engaging, well-structured articles, blog posts, technical content, and creative writing pieces.
-        You have deep knowledge of content marketing, audience engagement, readability optimization, and effective communication strategies.
-        You specialize in creating high-quality, SEO-friendly content that resonates with target audiences across different cultures and languages.
-        """
+    article_generator_template = store.template("article_generator")
 
     @mcp.prompt(
          name="article_generator",
-         description="Generate an article based on a draft idea"
+         description=store.description("article_generator")
       )
     def article_generator(draft_idea: str, language: str = "english", article_type: str = "blog", target_audience: str = "general", word_count: int = 800) -> list[Message]:
-        logger.info(f"Generating article for draft idea: {draft_idea}, language: {language}, type: {article_type}")
-        return [Message(role="system", content=f"""
-            {role_profile}
-            Please provide the following:
-            1. **Article Overview:**
-               - **Title**: [Engaging, SEO-friendly title]
-               - **Meta Description**: [Brief summary for search engines]
-               - **Target Keywords**: [Primary and secondary keywords]
-               - **Reading Level**: [Beginner/Intermediate/Advanced]
-               - **Estimated Reading Time**: [Based on word count]
-            
-            2. **Article Structure:**
-               - **Introduction**: [Hook the reader and introduce the topic]
-               - **Main Content**: [Organized into clear sections with headings]
-               - **Conclusion**: [Summarize key points and call to action]
-               - **Subheadings**: [Clear, descriptive section headings]
-            
-            3. **Content Development:**
-               - **Key Points**: [Main arguments or information to cover]
-               - **Supporting Evidence**: [Examples, statistics, or references]
-               - **Storytelling Elements**: [Narrative flow and engagement]
-               - **Expert Insights**: [Professional perspective and analysis]
-            
-            4. **Language and Style:**
-               - **Tone**: [Professional, conversational, academic, etc.]
-               - **Voice**: [Active vs passive voice considerations]
-               - **Vocabulary**: [Appropriate for target audience]
-               - **Cultural Sensitivity**: [Respectful of cultural differences]
-            
-            5. **SEO Optimization:**
-               - **Keyword Placement**: [Natural integration of keywords]
-               - **Internal Linking**: [Suggestions for related content]
-               - **Image Alt Text**: [Descriptive alt text suggestions]
-               - **Schema Markup**: [Structured data recommendations]
-            
-            6. **Quality Assurance:**
-               - **Grammar and Spelling**: [Ensure accuracy]
-               - **Readability**: [Clear and accessible writing]
-               - **Fact-Checking**: [Verify information accuracy]
-               - **Plagiarism Prevention**: [Original content creation]
-            
-            7. **Multilingual Considerations:**
-               - **Translation Quality**: [If bilingual, ensure natural flow]
-               - **Cultural Adaptation**: [Adjust for cultural context]
-               - **Local SEO**: [Region-specific optimization]
-               - **Language-Specific Keywords**: [Relevant terms in target language]
-            
-            Remember to:
-            - Create engaging, original content that provides value to readers
-            - Use clear, accessible language appropriate for the target audience
-            - Include relevant examples and supporting evidence
-            - Optimize for both human readers and search engines
-            - Maintain consistent tone and style throughout
-            - Consider cultural nuances when writing in different languages
-        """), Message(role="user", content=f"""
-            Draft Idea: {draft_idea}
-            Language: {language}
-            Article Type: {article_type}
-            Target Audience: {target_audience}
-            Target Word Count: {word_count}
-        """)]
+        logger.info("Generating article for draft idea: %s, language: %s, type: %s", draft_idea, language, article_type)
+        return article_generator_template.render(draft_idea=draft_idea, language=language, article_type=article_type, target_audience=target_audience, word_count=word_count)
     
+    content_outline_template = store.template("content_outline")
+
     @mcp.prompt(
          name="content_outline",
-         description="Create a detailed content outline for a topic"
+         description=store.description("content_outline")
       )
     def content_outline(topic: str, content_type: str = "article", target_length: str = "medium", audience: str = "general") -> list[Message]:
-        logger.info(f"Creating content outline for topic: {topic}, type: {content_type}")
-        return [Message(role="system", content=f"""
-            {role_profile}
-            You are required to create a detailed content outline for the topic: "{topic}"
-            Content Type: {content_type}
-            Target Length: {target_length}
-            Target Audience: {audience}
-            
-            Please provide the following:
-            
-            1. **Content Strategy:**
-               - **Main Objective**: [What the content aims to achieve]
-               - **Key Message**: [Central theme or takeaway]
-               - **Target Audience Profile**: [Detailed audience description]
-               - **Content Goals**: [Specific outcomes to achieve]
-            
-            2. **Outline Structure:**
-               - **Introduction Section**: [How to open the content]
-               - **Main Body Sections**: [Organized content blocks]
-               - **Conclusion Section**: [How to wrap up]
-               - **Call-to-Action**: [What you want readers to do]
-            
-            3. **Section Breakdown:**
-               - **Section 1**: [Title, key points, estimated word count]
-               - **Section 2**: [Title, key points, estimated word count]
-               - **Section 3**: [Title, key points, estimated word count]
-               - **Additional Sections**: [As needed for content type]
-            
-            4. **Content Elements:**
-               - **Key Statistics**: [Data points to include]
-               - **Expert Quotes**: [Authoritative sources to reference]
-               - **Case Studies**: [Real-world examples]
-               - **Visual Elements**: [Charts, images, infographics]
-            
-            5. **Research Requirements:**
-               - **Primary Sources**: [Key research materials needed]
-               - **Expert Interviews**: [People to consult]
-               - **Data Sources**: [Statistics and facts to verify]
-               - **Competitive Analysis**: [What others are writing about]
-            
-            6. **SEO Framework:**
-               - **Primary Keywords**: [Main search terms]
-               - **Secondary Keywords**: [Supporting search terms]
-               - **Long-tail Keywords**: [Specific search phrases]
-               - **Related Topics**: [Additional content opportunities]
-            
-            7. **Content Calendar:**
-               - **Research Phase**: [Time needed for preparation]
-               - **Writing Phase**: [Estimated writing time]
-               - **Review Phase**: [Editing and revision time]
-               - **Publication Timeline**: [When to publish]
-        """), Message(role="user", content=f"""
-            Topic: {topic}
-            Content Type: {content_type}
-            Target Length: {target_length}
-            Target Audience: {audience}
-        """)]
+        logger.info("Creating content outline for topic: %s, type: %s", topic, content_type)
+        return content_outline_template.render(topic=topic, content_type=content_type, target_length=target_length, audience=audience)
     
+    article_editor_template = store.template("article_editor")
+
     @mcp.prompt(
          name="article_editor",
-         description="Edit and improve an article"
+         description=store.description("article_editor")
       )
-    def article_editor(article_content: str, editing_focus: str = "general", target_audience: str = "general") -> list[Message]:
-        logger.info(f"Editing article with focus: {editing_focus}")
-        return [Message(role="system", content=f"""
-            {role_profile}
-            You are required to edit and improve the following article content:
-            
-            **Original Content:**
-            {article_content}
-            
-            Editing Focus: {editing_focus}
-            Target Audience: {target_audience}
-            
-            Please provide the following:
-            
-            1. **Content Analysis:**
-               - **Overall Quality**: [Assessment of current content]
-               - **Strengths**: [What works well in the article]
-               - **Areas for Improvement**: [Specific issues to address]
-               - **Target Audience Fit**: [How well it matches audience needs]
-            
-            2. **Structural Improvements:**
-               - **Organization**: [Better flow and structure suggestions]
-               - **Paragraph Breaks**: [Improved readability]
-               - **Transition Words**: [Better connections between ideas]
-               - **Logical Flow**: [Clearer argument progression]
-            
-            3. **Language Enhancements:**
-               - **Grammar Corrections**: [Fix grammatical errors]
-               - **Style Improvements**: [Better word choices and phrasing]
-               - **Clarity**: [Clearer explanations and examples]
-               - **Conciseness**: [Remove unnecessary words]
-            
-            4. **Content Additions:**
-               - **Missing Information**: [What should be added]
-               - **Supporting Evidence**: [Additional examples or data]
-               - **Expert Opinions**: [Authoritative sources to include]
-               - **Real-world Applications**: [Practical examples]
-            
-            5. **SEO Optimization:**
-               - **Keyword Integration**: [Better keyword placement]
-               - **Meta Description**: [Improved search snippet]
-               - **Internal Links**: [Related content suggestions]
-               - **Image Optimization**: [Alt text and captions]
-            
-            6. **Engagement Improvements:**
-               - **Hook Enhancement**: [Better opening]
-               - **Storytelling**: [More engaging narrative]
-               - **Call-to-Action**: [Stronger conclusion]
-               - **Reader Interaction**: [Questions or prompts]
-            
-            7. **Final Recommendations:**
-               - **Priority Changes**: [Most important edits to make]
-               - **Optional Improvements**: [Nice-to-have enhancements]
-               - **Follow-up Content**: [Related articles to write]
-               - **Performance Tracking**: [How to measure success]
-        """), Message(role="user", content=f"""
-            Article Content: {article_content}
-            Editing Focus: {editing_focus}
-            Target Audience: {target_audience}
-        """)]
+    async def article_editor(article_content: str, editing_focus: str = "general", target_audience: str = "general") -> list[Message]:
+        logger.info("Editing article with focus: %s", editing_focus)
+        metrics = await anyio.to_thread.run_sync(analyze, article_content)
+        return article_editor_template.render(article_content=article_content, editing_focus=editing_focus, target_audience=target_audience, text_metrics=metrics.summary())
     
+    multilingual_content_template = store.template("multilingual_content")
+
     @mcp.prompt(
          name="multilingual_content",
-         description="Create multilingual content"
+         description=store.description("multilingual_content")
       )
     def multilingual_content(original_content: str, target_language: str, cultural_context: str = "") -> list[Message]:
-        logger.info(f"Creating multilingual content for language: {target_language}")
-        return [Message(role="system", content=f"""
-            {role_profile}
-            You are required to create multilingual content based on the original content:
-            
-            **Original Content:**
-            {original_content}
-            
-            Target Language: {target_language}
-            Cultural Context: {cultural_context if cultural_context else "General"}
-            
-            Please provide the following:
-            
-            1. **Translation Strategy:**
-               - **Translation Approach**: [Literal vs. adaptive translation]
-               - **Cultural Adaptation**: [How to adjust for cultural differences]
-               - **Language Nuances**: [Specific considerations for target language]
-               - **Audience Expectations**: [What readers expect in this language]
-            
-            2. **Content Adaptation:**
-               - **Cultural References**: [Adjust for local context]
-               - **Examples and Analogies**: [Use culturally relevant examples]
-               - **Humor and Tone**: [Adapt for cultural sensibilities]
-               - **Formal vs. Informal**: [Appropriate language register]
-            
-            3. **Language-Specific Optimization:**
-               - **SEO Keywords**: [Relevant search terms in target language]
-               - **Local SEO**: [Region-specific optimization]
-               - **Reading Patterns**: [How people read in this language]
-               - **Visual Preferences**: [Cultural design preferences]
-            
-            4. **Quality Assurance:**
-               - **Native Speaker Review**: [Ensure natural language flow]
-               - **Cultural Sensitivity**: [Avoid cultural missteps]
-               - **Technical Accuracy**: [Maintain precision in translation]
-               - **Brand Consistency**: [Maintain brand voice across languages]
-            
-            5. **Localization Elements:**
-               - **Date and Time Formats**: [Local conventions]
-               - **Currency and Measurements**: [Local units and formats]
-               - **Contact Information**: [Local business practices]
-               - **Legal Considerations**: [Local regulations and requirements]
-            
-            6. **Performance Optimization:**
-               - **Loading Speed**: [Optimize for local internet conditions]
-               - **Mobile Experience**: [Local mobile usage patterns]
-               - **Social Media Integration**: [Popular platforms in target region]
-               - **Analytics Setup**: [Track performance in target market]
-            
-            7. **Distribution Strategy:**
-               - **Local Platforms**: [Where to publish content]
-               - **Social Media**: [Platforms popular in target region]
-               - **Email Marketing**: [Local email preferences]
-               - **Partnership Opportunities**: [Local collaboration possibilities]
-        """), Message(role="user", content=f"""
-            Original Content: {original_content}
-            Target Language: {target_language}
-            Cultural Context: {cultural_context if cultural_context else "General"}
-        """)]
+        logger.info("Creating multilingual content for language: %s", target_language)
+        return multilingual_content_template.render(original_content=original_content, target_language=target_language, cultural_context=cultural_context)
     
+    seo_optimization_template = store.template("seo_optimization")
+
     @mcp.prompt(
          name="seo_optimization",
-         description="Optimize content for SEO"
+         description=store.description("seo_optimization")
       )
-    def seo_optimization(content: str, target_keywords: str, content_type: str = "article") -> list[Message]:
-        logger.info(f"Optimizing content for SEO with keywords: {target_keywords}")
-        return [Message(role="system", content=f"""
-            {role_profile}
-            You are required to optimize the following content for search engines:
-            
-            **Original Content:**
-            {content}
-            
-            Target Keywords: {target_keywords}
-            Content Type: {content_type}
-            
-            Please provide the following:
-            
-            1. **Keyword Analysis:**
-               - **Primary Keywords**: [Main target terms]
-               - **Secondary Keywords**: [Supporting terms]
-               - **Long-tail Keywords**: [Specific phrases]
-               - **Keyword Density**: [Optimal usage frequency]
-               - **Semantic Keywords**: [Related terms and concepts]
-            
-            2. **On-Page SEO:**
-               - **Title Tag**: [Optimized page title]
-               - **Meta Description**: [Compelling search snippet]
-               - **Header Tags**: [H1, H2, H3 optimization]
-               - **URL Structure**: [SEO-friendly URL suggestions]
-               - **Image Optimization**: [Alt text and file names]
-            
-            3. **Content Optimization:**
-               - **Keyword Placement**: [Strategic keyword positioning]
-               - **Content Structure**: [Better organization for SEO]
-               - **Internal Linking**: [Related content connections]
-               - **External Linking**: [Authoritative source links]
-               - **Content Length**: [Optimal word count for topic]
-            
-            4. **Technical SEO:**
-               - **Schema Markup**: [Structured data implementation]
-               - **Page Speed**: [Loading time optimization]
-               - **Mobile Optimization**: [Responsive design considerations]
-               - **Core Web Vitals**: [Performance metrics]
-               - **XML Sitemap**: [Search engine indexing]
-            
-            5. **User Experience:**
-               - **Readability**: [Clear, accessible content]
-               - **Navigation**: [Easy-to-follow structure]
-               - **Call-to-Action**: [Clear next steps for users]
-               - **Engagement Metrics**: [Time on page, bounce rate]
-               - **Social Sharing**: [Encourage content sharing]
-            
-            6. **Competitive Analysis:**
-               - **Competitor Content**: [What others are ranking for]
-               - **Content Gaps**: [Opportunities to fill]
-               - **Unique Value Proposition**: [What makes this content special]
-               - **Featured Snippet Opportunities**: [Answer box optimization]
-            
-            7. **Performance Tracking:**
-               - **Key Metrics**: [What to measure]
-               - **Analytics Setup**: [How to track performance]
-               - **A/B Testing**: [Content optimization testing]
-               - **ROI Measurement**: [Return on content investment]
-        """), Message(role="user", content=f"""
-            Content: {content}
-            Target Keywords: {target_keywords}
-            Content Type: {content_type}
-        """)]
+    async def seo_optimization(content: str, target_keywords: str, content_type: str = "article") -> list[Message]:
+        logger.info("Optimizing content for SEO with keywords: %s", target_keywords)
+        report = await anyio.to_thread.run_sync(analyze_keywords, content, target_keywords)
+        return seo_optimization_template.render(content=content, target_keywords=target_keywords, content_type=content_type, keyword_report=report.summary())
+
+    content_analysis_template = store.template("content_analysis")
 
     @mcp.prompt(
          name="content_analysis",
-         description="Analyze content")
-    def content_analysis(content: str, analysis_type: str = "comprehensive") -> list[Message]:
-        logger.info(f"Analyzing content with type: {analysis_type}")
-        return [Message(role="system", content=f"""
-            {role_profile}
-            You are required to analyze the following content:
-            
-            **Content to Analyze:**
-            {content}
-            
-            Analysis Type: {analysis_type}
-            
-            Please provide the following:
-            
-            1. **Content Quality Assessment:**
-               - **Overall Score**: [1-10 rating with explanation]
-               - **Strengths**: [What the content does well]
-               - **Weaknesses**: [Areas that need improvement]
-               - **Uniqueness**: [How original and valuable the content is]
-               - **Accuracy**: [Fact-checking and reliability]
-            
-            2. **Readability Analysis:**
-               - **Reading Level**: [Target audience complexity]
-               - **Sentence Structure**: [Variety and flow]
-               - **Vocabulary Usage**: [Appropriateness for audience]
-               - **Paragraph Length**: [Optimal for readability]
-               - **Transition Quality**: [Smoothness between ideas]
-            
-            3. **SEO Performance:**
-               - **Keyword Optimization**: [How well keywords are used]
-               - **Content Structure**: [Header hierarchy and organization]
-               - **Meta Information**: [Title and description quality]
-               - **Internal Linking**: [Cross-referencing opportunities]
-               - **Technical SEO**: [Page speed, mobile-friendliness]
-            
-            4. **Engagement Potential:**
-               - **Hook Effectiveness**: [How well it captures attention]
-               - **Storytelling Elements**: [Narrative quality]
-               - **Call-to-Action**: [Clear next steps for readers]
-               - **Social Sharing Potential**: [Viral content elements]
-               - **Comment Generation**: [Discussion-provoking elements]
-            
-            5. **Target Audience Fit:**
-               - **Audience Alignment**: [How well it matches intended readers]
-               - **Pain Point Addressal**: [Problem-solving effectiveness]
-               - **Value Delivery**: [Useful information provided]
-               - **Tone Appropriateness**: [Language style for audience]
-               - **Cultural Sensitivity**: [Respectful and inclusive content]
-            
-            6. **Content Strategy Alignment:**
-               - **Brand Voice Consistency**: [Matches brand personality]
-               - **Content Goals Achievement**: [Meets stated objectives]
-               - **Competitive Positioning**: [Stand out from competitors]
-               - **Content Calendar Fit**: [Timing and relevance]
-               - **Long-term Value**: [Evergreen vs. timely content]
-            
-            7. **Actionable Recommendations:**
-               - **Immediate Improvements**: [Quick fixes to implement]
-               - **Strategic Enhancements**: [Long-term improvements]
-               - **Content Expansion**: [Additional topics to cover]
-               - **Distribution Optimization**: [Better promotion strategies]
-               - **Performance Monitoring**: [Metrics to track]
-         """), Message(role="user", content=f"""
-            Content: {content}
-            Analysis Type: {analysis_type}
-        """)]
\ No newline at end of file
+         description=store.description("content_analysis"))
+    async def content_analysis(content: str, analysis_type: str = "comprehensive") -> list[Message]:
+        logger.info("Analyzing content with type: %s", analysis_type)
+        metrics = await anyio.to_thread.run_sync(analyze, content)
+        return content_analysis_template.render(content=content, analysis_type=analysis_type, text_metrics=metrics.summary())
\ No newline at end of file
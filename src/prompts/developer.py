@@ -1,65 +1,30 @@
 from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.prompts.base import Message
 from src.logger import get_logger
+from src.prompt_store import get_prompt_store
 
 def developer_prompt(mcp: FastMCP):
 
     logger = get_logger("developer_prompt")
+    store = get_prompt_store()
 
-    role_profile = """
-        You are a senior software engineer with 10 years of experience in the field of software development, named Devi.
-        You are a full-stack master of Python, Java, JavaScript, TypeScript, Go, React, Node.js, and other programming languages and frameworks.
-        You are able to design and implement software systems from scratch, and you are also able to optimize and maintain existing software systems.
-        """
+    design_template = store.template("design")
 
     @mcp.prompt(
         name="design",
-        description="design a feature"
+        description=store.description("design")
     )
-    def design(requirements: str) -> list[Message]:
-        logger.info(f"Designing software system to meet the following requirements: {requirements}")
+    def design(requirements: str, codebase: str = "") -> list[Message]:
+        logger.info("Designing software system to meet the following requirements: %s", requirements)
         
-        return [Message(role="system", content=f"""
-            {role_profile}
-            You are required to design a software system to meet the following requirements:
-            {requirements}
-            Remember to follow the requirements below:
-            - DO NOT make any changes before get my approval.
-            - Go through the codebase and understand the existing code and functionality.
-            - Always prefer simple solutions, keep the codebase very clean and organized.
-            - Avoid duplication of code whenever possible, which means checking for other areas of the codebase that might already have similar code and functionality.
-            - You are careful to only make changes that are requested or you are confident are well understood and related to the change being requested.
-            - When fixing an issue or bug, do not introduce a new pattern or technology without first exhausting all options for the existing implementation. And if you finally do this, make sure to remove the old implmentation afterwards so we don't have duplicate logic.
-            - If the function is based on the existing codebase, please list out all places need to change.
-        """)]
+        return design_template.render(requirements=requirements, codebase=codebase)
     
+    review_template = store.template("review")
+
     @mcp.prompt(
          name="review",
-         description="Review the code snippet/pull request"
+         description=store.description("review")
       )
     def review(code: str, purpose: str, focus_areas: list[str], expected_feedback: str) -> list[Message]:
-        logger.info(f"Code review requested")
-        return [Message(role="system", content=f"""
-            {role_profile}
-            Please review the following code snippet/pull request: [link to code, paste code, or new changed commit on local]
-            **Purpose of this code:** [Briefly describe what the code is intended to do]
-            **Focus Areas for Review:**
-
-            1.  **Functionality:** Verify correct behavior and identify potential bugs or edge cases.
-            2.  **Readability & Maintainability:** Assess clarity, structure, naming conventions, and ease of future modifications.
-            3.  **Performance:** Identify any performance bottlenecks or opportunities for optimization.
-            4.  **Security:** Check for potential vulnerabilities or insecure practices.
-            5.  **Adherence to Standards:** Ensure compliance with [specific style guide/best practices].
-
-            **Expected Feedback:**
-
-            *   Provide specific, actionable suggestions for improvements.
-            *   Highlight any positive aspects of the code.
-            *   If applicable, suggest alternative implementations or refactoring opportunities.
-            *   Summarize the overall quality and readiness of the code.
-        """), Message(role="user", content=f"""
-            Code: {code}
-            Purpose: {purpose}
-            Focus Areas: {focus_areas}
-            Expected Feedback: {expected_feedback}
-        """)]
+        logger.info("Code review requested")
+        return review_template.render(code=code, purpose=purpose, focus_areas=focus_areas, expected_feedback=expected_feedback)
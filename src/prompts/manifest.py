@@ -0,0 +1,126 @@
+"""Prompt manifest for lazy registration.
+
+Generated by ``python -m src.loader``; do not edit by hand.
+"""
+
+PROMPTS = [{'name': 'design',
+  'title': None,
+  'description': 'design a feature',
+  'module': 'src.prompts.developer',
+  'registrar': 'developer_prompt',
+  'arguments': [('requirements', None, True), ('codebase', None, False)],
+  'async': False},
+ {'name': 'review',
+  'title': None,
+  'description': 'Review the code snippet/pull request',
+  'module': 'src.prompts.developer',
+  'registrar': 'developer_prompt',
+  'arguments': [('code', None, True),
+                ('purpose', None, True),
+                ('focus_areas', None, True),
+                ('expected_feedback', None, True)],
+  'async': False},
+ {'name': 'ui_design',
+  'title': None,
+  'description': 'Create a comprehensive UI design solution',
+  'module': 'src.prompts.ui_designer',
+  'registrar': 'ui_designer_prompt',
+  'arguments': [('requirements', None, True)],
+  'async': False},
+ {'name': 'design_system',
+  'title': None,
+  'description': 'Create a comprehensive design system',
+  'module': 'src.prompts.ui_designer',
+  'registrar': 'ui_designer_prompt',
+  'arguments': [('project_name', None, True), ('brand_guidelines', None, False)],
+  'async': False},
+ {'name': 'accessibility_audit',
+  'title': None,
+  'description': 'Conduct a comprehensive accessibility audit',
+  'module': 'src.prompts.ui_designer',
+  'registrar': 'ui_designer_prompt',
+  'arguments': [('design_description', None, True)],
+  'async': False},
+ {'name': 'word_lesson',
+  'title': None,
+  'description': 'Create a detailed word lesson',
+  'module': 'src.prompts.english_teacher',
+  'registrar': 'english_teacher_prompt',
+  'arguments': [('word', None, True), ('context', None, False)],
+  'async': False},
+ {'name': 'vocabulary_builder',
+  'title': None,
+  'description': 'Create a comprehensive vocabulary lesson',
+  'module': 'src.prompts.english_teacher',
+  'registrar': 'english_teacher_prompt',
+  'arguments': [('topic', None, True), ('level', None, False), ('word_count', None, False)],
+  'async': False},
+ {'name': 'conversation_practice',
+  'title': None,
+  'description': 'Create a conversation practice session',
+  'module': 'src.prompts.english_teacher',
+  'registrar': 'english_teacher_prompt',
+  'arguments': [('scenario', None, True), ('level', None, False), ('participants', None, False)],
+  'async': False},
+ {'name': 'reading_comprehension',
+  'title': None,
+  'description': 'Create a reading comprehension lesson',
+  'module': 'src.prompts.english_teacher',
+  'registrar': 'english_teacher_prompt',
+  'arguments': [('topic', None, True), ('level', None, False), ('text_length', None, False)],
+  'async': False},
+ {'name': 'article_generator',
+  'title': None,
+  'description': 'Generate an article based on a draft idea',
+  'module': 'src.prompts.article_writer',
+  'registrar': 'article_writer_prompt',
+  'arguments': [('draft_idea', None, True),
+                ('language', None, False),
+                ('article_type', None, False),
+                ('target_audience', None, False),
+                ('word_count', None, False)],
+  'async': False},
+ {'name': 'content_outline',
+  'title': None,
+  'description': 'Create a detailed content outline for a topic',
+  'module': 'src.prompts.article_writer',
+  'registrar': 'article_writer_prompt',
+  'arguments': [('topic', None, True),
+                ('content_type', None, False),
+                ('target_length', None, False),
+                ('audience', None, False)],
+  'async': False},
+ {'name': 'article_editor',
+  'title': None,
+  'description': 'Edit and improve an article',
+  'module': 'src.prompts.article_writer',
+  'registrar': 'article_writer_prompt',
+  'arguments': [('article_content', None, True),
+                ('editing_focus', None, False),
+                ('target_audience', None, False)],
+  'async': True},
+ {'name': 'multilingual_content',
+  'title': None,
+  'description': 'Create multilingual content',
+  'module': 'src.prompts.article_writer',
+  'registrar': 'article_writer_prompt',
+  'arguments': [('original_content', None, True),
+                ('target_language', None, True),
+                ('cultural_context', None, False)],
+  'async': False},
+ {'name': 'seo_optimization',
+  'title': None,
+  'description': 'Optimize content for SEO',
+  'module': 'src.prompts.article_writer',
+  'registrar': 'article_writer_prompt',
+  'arguments': [('content', None, True),
+                ('target_keywords', None, True),
+                ('content_type', None, False)],
+  'async': True},
+ {'name': 'content_analysis',
+  'title': None,
+  'description': 'Analyze content',
+  'module': 'src.prompts.article_writer',
+  'registrar': 'article_writer_prompt',
+  'arguments': [('content', None, True), ('analysis_type', None, False)],
+  'async': True}]
@@ -1,185 +1,39 @@
 from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.prompts.base import Message
 from src.logger import get_logger
+from src.prompt_store import get_prompt_store
 
 def ui_designer_prompt(mcp: FastMCP):
 
     logger = get_logger("ui_designer_prompt")
+    store = get_prompt_store()
 
-    role_profile = """
-        You are a senior UI/UX designer with 10 years of experience in the field of user interface and user experience design, named Uiki.
-        You are a master of modern design principles, design systems, accessibility standards, and design tools like Figma, Sketch, Adobe XD, and other design platforms.
-        You are able to create comprehensive design prototypes, design requirement documents (DRD), and detailed specifications for developers.
-        You have deep knowledge of typography, color theory, layout principles, responsive design, and user-centered design methodologies.
-        """
+    ui_design_template = store.template("ui_design")
 
     @mcp.prompt(
          name="ui_design",
-         description="Create a comprehensive UI design solution"
+         description=store.description("ui_design")
       )
     def ui_design(requirements: str) -> list[Message]:
-        logger.info(f"Creating UI design prototype and DRD for the following requirements: {requirements}")
-        return [Message(role="system", content=f"""
-            {role_profile}
-            You are required to create a comprehensive UI design solution to meet the following requirements:
-            {requirements}
-            
-            Please provide the following deliverables:
-            
-            1. **Design Prototype Description:**
-               - Detailed layout structure and component hierarchy
-               - User flow and interaction patterns
-               - Responsive design considerations
-               - Accessibility features and considerations
-            
-            2. **Design Requirements Document (DRD):**
-               - **Typography Specifications:**
-                 * Font families and weights
-                 * Font sizes for different text elements (headings, body, captions)
-                 * Line heights and letter spacing
-                 * Color codes for text elements
-               
-               - **Color Palette:**
-                 * Primary, secondary, and accent color codes (HEX/RGB)
-                 * Background colors
-                 * Border and divider colors
-                 * Status colors (success, warning, error, info)
-               
-               - **Layout Specifications:**
-                 * Grid system and spacing units
-                 * Component dimensions and padding/margins
-                 * Breakpoints for responsive design
-                 * Container widths and max-widths
-               
-               - **Component Specifications:**
-                 * Button styles, sizes, and states
-                 * Form elements and input styles
-                 * Navigation components
-                 * Card and container styles
-                 * Icon specifications and usage guidelines
-            
-            3. **Implementation Guidelines:**
-               - CSS class naming conventions
-               - Component structure recommendations
-               - Asset requirements (images, icons, fonts)
-               - Animation and transition specifications
-               - Browser compatibility requirements
-            
-            Remember to follow these design principles:
-            - Focus on user-centered design and accessibility
-            - Ensure consistency across all design elements
-            - Provide clear, actionable specifications for developers
-            - Consider mobile-first responsive design
-            - Include accessibility standards (WCAG guidelines)
-            - Use modern design patterns and best practices
-            - Provide specific measurements and color codes
-            - Include interactive states and micro-interactions
-        """), Message(role="user", content=f"""
-            Requirements: {requirements}
-        """)]
+        logger.info("Creating UI design prototype and DRD for the following requirements: %s", requirements)
+        return ui_design_template.render(requirements=requirements)
     
+    design_system_template = store.template("design_system")
+
     @mcp.prompt(
          name="design_system",
-         description="Create a comprehensive design system"
+         description=store.description("design_system")
       )
     def design_system(project_name: str, brand_guidelines: str = "") -> list[Message]:
-        logger.info(f"Creating design system for project: {project_name}")
-        return [Message(role="system", content=f"""
-            {role_profile}
-            You are required to create a comprehensive design system for the project: {project_name}
-            
-            {f"Brand Guidelines: {brand_guidelines}" if brand_guidelines else ""}
-            
-            Please create a complete design system including:
-            0. **Core Page and Interaction:**
-               - Core page structure and interaction patterns
-               - Core interaction patterns
-               - Core page components
-               - Core page interactions
-               - Core page states
-               - Core page transitions
-            
-            1. **Design Tokens:**
-               - Color tokens (primary, secondary, neutral, semantic)
-               - Typography tokens (font families, sizes, weights, line heights)
-               - Spacing tokens (margins, padding, gaps)
-               - Border radius tokens
-               - Shadow and elevation tokens
-               - Animation duration and easing tokens
-            
-            2. **Component Library:**
-               - Atomic design principles (atoms, molecules, organisms)
-               - Button components (primary, secondary, tertiary, ghost)
-               - Form components (inputs, selects, checkboxes, radio buttons)
-               - Navigation components (menus, breadcrumbs, pagination)
-               - Feedback components (alerts, notifications, modals)
-               - Data display components (tables, cards, lists)
-            
-            3. **Documentation:**
-               - Component usage guidelines
-               - Accessibility requirements
-               - Responsive behavior specifications
-               - Code examples and implementation notes
-               - Design principles and best practices
-            
-            4. **Implementation Assets:**
-               - CSS/SCSS variables and custom properties
-               - Icon library specifications
-               - Image and illustration guidelines
-               - Animation specifications
-        """), Message(role="user", content=f"""
-            Project Name: {project_name}
-            Brand Guidelines: {brand_guidelines}
-        """)]
+        logger.info("Creating design system for project: %s", project_name)
+        return design_system_template.render(project_name=project_name, brand_guidelines=brand_guidelines)
     
+    accessibility_audit_template = store.template("accessibility_audit")
+
     @mcp.prompt(
          name="accessibility_audit",
-         description="Conduct a comprehensive accessibility audit"
+         description=store.description("accessibility_audit")
       )
     def accessibility_audit(design_description: str) -> list[Message]:
-        logger.info(f"Conducting accessibility audit for design: {design_description}")
-        return [Message(role="system", content=f"""
-            {role_profile}
-            You are required to conduct a comprehensive accessibility audit for the following design:
-            {design_description}
-            
-            Please provide a detailed accessibility assessment covering:
-            
-            1. **WCAG 2.1 Compliance:**
-               - Level A, AA, and AAA requirements
-               - Perceivable, Operable, Understandable, and Robust principles
-               - Specific guideline violations and recommendations
-            
-            2. **Color and Contrast:**
-               - Color contrast ratios for all text combinations
-               - Color-blind friendly design considerations
-               - High contrast mode compatibility
-            
-            3. **Typography and Readability:**
-               - Font size and line height recommendations
-               - Text scaling and zoom compatibility
-               - Readable font choices and spacing
-            
-            4. **Navigation and Interaction:**
-               - Keyboard navigation support
-               - Focus indicators and tab order
-               - Screen reader compatibility
-               - Alternative input methods support
-            
-            5. **Content and Media:**
-               - Alt text requirements for images
-               - Caption and transcript needs for media
-               - Semantic HTML structure recommendations
-            
-            6. **Mobile and Touch:**
-               - Touch target sizes
-               - Gesture alternatives
-               - Mobile screen reader optimization
-            
-            7. **Remediation Plan:**
-               - Priority fixes (critical, high, medium, low)
-               - Implementation recommendations
-               - Testing strategies and tools
-        """), Message(role="user", content=f"""
-            Design Description: {design_description}
-        """)]
\ No newline at end of file
+        logger.info("Conducting accessibility audit for design: %s", design_description)
+        return accessibility_audit_template.render(design_description=design_description)
\ No newline at end of file
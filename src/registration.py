@@ -0,0 +1,62 @@
+"""Helpers for post-processing prompts registered on a FastMCP server."""
+
+import inspect
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.prompts.base import Prompt
+
+
+def registered_prompts(mcp: FastMCP) -> List[Prompt]:
+    """Return the prompts currently registered on ``mcp``."""
+    return mcp._prompt_manager.list_prompts()
+
+
+def wrap_prompts(
+    mcp: FastMCP,
+    wrapper: Callable[[Prompt, Callable], Optional[Callable]],
+    names: Optional[Iterable[str]] = None,
+) -> List[str]:
+    """Replace each prompt's render function with ``wrapper(prompt, fn)``.
+
+    The wrapper may return ``None`` to leave a prompt untouched. Returns the
+    names of the prompts that were wrapped.
+    """
+    selected = set(names) if names is not None else None
+    wrapped = []
+    for prompt in registered_prompts(mcp):
+        if selected is not None and prompt.name not in selected:
+            continue
+        fn = wrapper(prompt, prompt.fn)
+        if fn is not None:
+            prompt.fn = fn
+            wrapped.append(prompt.name)
+    return wrapped
+
+
+async def render_awaited(fn: Callable, arguments: Dict[str, Any]) -> Any:
+    """Call a render function from an async wrapper, awaiting its result if
+    the function it wraps renders asynchronously."""
+    result = fn(**arguments)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+def sample_arguments(prompt: Prompt, size: int = 0) -> Dict[str, Any]:
+    """Build placeholder arguments for ``prompt`` based on its signature.
+
+    String arguments are ``<name>`` padded to ``size`` characters when given.
+    """
+    arguments: Dict[str, Any] = {}
+    for param in inspect.signature(prompt.fn).parameters.values():
+        annotation = param.annotation
+        origin = getattr(annotation, "__origin__", None)
+        if annotation is int:
+            arguments[param.name] = 10
+        elif annotation is list or origin is list:
+            arguments[param.name] = [f"<{param.name}>"]
+        else:
+            value = f"<{param.name}>"
+            arguments[param.name] = value.ljust(size, ".") if size else value
+    return arguments
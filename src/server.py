@@ -1,23 +1,104 @@
 """Main MCP server implementation for TOBE MCP."""
 
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+import os
+from typing import List, Optional, Tuple
+
+import anyio
 from mcp.server.fastmcp import FastMCP
 
-from src.prompts.developer import developer_prompt
-from src.prompts.ui_designer import ui_designer_prompt
-from src.prompts.english_teacher import english_teacher_prompt
-from src.prompts.article_writer import article_writer_prompt
+from src.budgets import install_budgets
+from src.cache import RenderCache, install_render_cache
+from src.config import TRANSPORT_SSE, ServerConfig
+from src.codeindex import CodeIndexConfig, install_code_index
+from src.diffs import DiffConfig, install_diffs
+from src.loader import register_prompts
+from src.instrumentation import install_instrumentation
+from src.metrics import get_metrics, start_snapshot_writer
+from src.prompt_store import install_prompt_reload
+from src.sources import SourceConfig, install_sources
+from src.tools import register_tools
+from src.logger import get_logger, shutdown_logging
+
+
+def create_server(
+    config: Optional[ServerConfig] = None, lazy: Optional[bool] = None
+) -> Tuple[FastMCP, Optional[RenderCache]]:
+    """Build the FastMCP server with all prompts registered."""
+    if config is None:
+        config = ServerConfig.from_env()
+    tobe_mcp = FastMCP(**config.fastmcp_settings())
+    register_prompts(tobe_mcp, lazy=lazy)
+    register_tools(tobe_mcp)
+    render_cache = install_render_cache(tobe_mcp)
+    install_prompt_reload(tobe_mcp, render_cache.invalidate if render_cache is not None else None)
+    install_budgets(tobe_mcp)
+    # Remote clients may read files only from directories allowed explicitly.
+    sources = SourceConfig.from_env([] if config.is_network else [os.getcwd()])
+    install_sources(tobe_mcp, sources)
+    install_diffs(tobe_mcp, DiffConfig.from_env(sources.roots))
+    install_code_index(tobe_mcp, CodeIndexConfig.from_env(sources.roots))
+    install_instrumentation(tobe_mcp)
+    return tobe_mcp, render_cache
+
+
+def http_app(tobe_mcp: FastMCP, config: ServerConfig):
+    """The ASGI app for the configured network transport."""
+    if config.transport == TRANSPORT_SSE:
+        return tobe_mcp.sse_app()
+    return tobe_mcp.streamable_http_app()
+
 
-def main():
+def uvicorn_server(app, tobe_mcp: FastMCP, config: ServerConfig):
+    """A uvicorn server for ``app`` with the configured connection limits."""
+    import uvicorn
+
+    uvicorn_config = uvicorn.Config(
+        app,
+        host=config.host,
+        port=config.port,
+        log_level=tobe_mcp.settings.log_level.lower(),
+        limit_concurrency=config.max_concurrency,
+        backlog=config.backlog,
+        timeout_keep_alive=config.keep_alive,
+    )
+    return uvicorn.Server(uvicorn_config)
+
+
+async def serve_http(tobe_mcp: FastMCP, config: ServerConfig):
+    """Serve SSE or streamable HTTP with uvicorn in this process."""
+    await uvicorn_server(http_app(tobe_mcp, config), tobe_mcp, config).serve()
+
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point for the MCP server."""
-    tobe_mcp = FastMCP()
-    developer_prompt(tobe_mcp)
-    ui_designer_prompt(tobe_mcp)
-    english_teacher_prompt(tobe_mcp)
-    article_writer_prompt(tobe_mcp)
-    tobe_mcp.run()
+    config = ServerConfig.from_args(argv)
+    logger = get_logger("server")
+    if config.workers > 1:
+        # Imported here: the supervisor needs os.fork and is only used with workers.
+        from src.supervisor import Supervisor
+
+        # Register every prompt before forking so workers share it copy-on-write.
+        tobe_mcp, _ = create_server(config, lazy=False)
+        try:
+            Supervisor(tobe_mcp, config).run()
+        finally:
+            shutdown_logging()
+        return
+    tobe_mcp, render_cache = create_server(config)
+    snapshot_writer = start_snapshot_writer(get_metrics())
+    try:
+        if config.is_network:
+            logger.log_server_event("Serving", config.as_dict())
+            anyio.run(serve_http, tobe_mcp, config)
+        else:
+            tobe_mcp.run()
+    finally:
+        if render_cache is not None:
+            logger.log_server_event("Render cache stats", render_cache.stats())
+        if snapshot_writer is not None:
+            snapshot_writer.stop()
+        shutdown_logging()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,225 @@
+"""Large prompt inputs passed by reference instead of inline.
+
+The prompts in :data:`SOURCE_ARGUMENTS` take an optional ``source`` argument:
+a local file path or a resource URI whose text replaces their payload
+argument, so multi-megabyte documents do not travel through JSON-RPC. The
+reference is resolved before the render cache and the handler run, which see
+the text as if it had been passed inline. References are read in a worker
+thread, off the event loop.
+
+- Paths and ``file://`` URIs are read through ``mmap`` and decoded as UTF-8
+  in one step, must lie under one of the configured roots and are limited to
+  ``max_bytes``. Decoded text is cached by real path, modification time and
+  size, within ``cache_bytes``.
+- Other URI schemes are read by the readers registered with
+  :func:`register_reader`, e.g. for resources this server exposes.
+
+Environment variables:
+
+- ``TOBE_MCP_SOURCES_ENABLED``: ``0`` removes the ``source`` argument
+  (default ``1``).
+- ``TOBE_MCP_SOURCE_ROOTS``: directories files may be read from, separated by
+  ``os.pathsep`` (default: the working directory with stdio, none with the
+  network transports).
+- ``TOBE_MCP_SOURCE_MAX_BYTES``: largest file read (default 16 MiB).
+- ``TOBE_MCP_SOURCE_CACHE_BYTES``: decoded text kept in memory (default
+  64 MiB, ``0`` disables caching).
+"""
+
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.prompts.base import Prompt, PromptArgument
+
+from src.logger import get_logger
+from src.registration import render_awaited, wrap_prompts
+
+SOURCE_ARGUMENT = "source"
+# Prompt name -> the argument a source replaces.
+SOURCE_ARGUMENTS = {
+    "review": "code",
+    "article_editor": "article_content",
+    "multilingual_content": "original_content",
+    "seo_optimization": "content",
+    "content_analysis": "content",
+}
+
+# Two or more scheme characters, so Windows drive letters stay paths.
+_URI = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]+://")
+
+logger = get_logger("sources")
+
+_readers: Dict[str, Callable[[str], str]] = {}
+
+
+class SourceError(ValueError):
+    """Raised when a source reference cannot be read."""
+
+
+def register_reader(scheme: str, reader: Callable[[str], str]):
+    """Read ``scheme://`` sources with ``reader(uri)``, which returns the text.
+
+    The reader is called in a worker thread and may block.
+    """
+    _readers[scheme.lower()] = reader
+
+
+class SourceConfig:
+    """Where files may be read from and how much is read and cached."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        roots: Optional[List[str]] = None,
+        max_bytes: int = 16 * 1024 * 1024,
+        cache_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.enabled = enabled
+        self.roots = [os.path.realpath(root) for root in roots or []]
+        self.max_bytes = max_bytes
+        self.cache_bytes = cache_bytes
+
+    @classmethod
+    def from_env(cls, default_roots: Optional[List[str]] = None) -> "SourceConfig":
+        roots = os.environ.get("TOBE_MCP_SOURCE_ROOTS")
+        defaults = cls()
+        return cls(
+            enabled=os.environ.get("TOBE_MCP_SOURCES_ENABLED", "1").lower() not in ("0", "false", "no", "off"),
+            roots=[root for root in roots.split(os.pathsep) if root] if roots is not None else default_roots,
+            max_bytes=int(os.environ.get("TOBE_MCP_SOURCE_MAX_BYTES", defaults.max_bytes)),
+            cache_bytes=int(os.environ.get("TOBE_MCP_SOURCE_CACHE_BYTES", defaults.cache_bytes)),
+        )
+
+
+def resolve_path(path: str, roots: List[str]) -> str:
+    """The real path of ``path``, which must lie under one of ``roots``."""
+    if not roots:
+        raise SourceError("Reading files is disabled; set TOBE_MCP_SOURCE_ROOTS to allow it")
+    real = os.path.realpath(os.path.expanduser(path))
+    for root in roots:
+        if real == root or real.startswith(root.rstrip(os.sep) + os.sep):
+            return real
+    raise SourceError(f"{path} is outside the allowed source directories")
+
+
+class SourceReader:
+    """Reads source references, caching decoded files by path and stamp."""
+
+    def __init__(self, config: SourceConfig):
+        self.config = config
+        self._cache: "OrderedDict[str, Tuple[Tuple[int, int], str]]" = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+
+    def read(self, reference: str) -> str:
+        if _URI.match(reference):
+            parts = urlsplit(reference)
+            scheme = parts.scheme.lower()
+            if scheme == "file":
+                if parts.netloc not in ("", "localhost"):
+                    raise SourceError(f"Remote file URIs are not supported: {reference}")
+                return self.read_file(unquote(parts.path))
+            reader = _readers.get(scheme)
+            if reader is None:
+                raise SourceError(f"Unsupported source URI scheme {scheme!r}")
+            return reader(reference)
+        return self.read_file(reference)
+
+    def read_file(self, path: str) -> str:
+        real = resolve_path(path, self.config.roots)
+        try:
+            stat = os.stat(real)
+        except OSError as e:
+            raise SourceError(f"Cannot read {path}: {e.strerror}") from None
+        if stat.st_size > self.config.max_bytes:
+            raise SourceError(f"{path} is {stat.st_size} bytes, over the {self.config.max_bytes} byte limit")
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._cache.get(real)
+            if entry is not None and entry[0] == stamp:
+                self._cache.move_to_end(real)
+                return entry[1]
+        text = _decode_file(real, path)
+        self._store(real, stamp, text)
+        return text
+
+    def _store(self, real: str, stamp: Tuple[int, int], text: str):
+        size = stamp[1]
+        if size > self.config.cache_bytes:
+            return
+        with self._lock:
+            previous = self._cache.pop(real, None)
+            if previous is not None:
+                self._cached_bytes -= previous[0][1]
+            self._cache[real] = (stamp, text)
+            self._cached_bytes += size
+            while self._cached_bytes > self.config.cache_bytes:
+                _, (old_stamp, _) = self._cache.popitem(last=False)
+                self._cached_bytes -= old_stamp[1]
+
+
+def _decode_file(real: str, path: str) -> str:
+    try:
+        with open(real, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ""
+            # Decode straight from the page cache: no intermediate bytes copy.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return str(mapped, "utf-8")
+    except UnicodeDecodeError as e:
+        raise SourceError(f"{path} is not valid UTF-8 (byte {e.start})") from None
+    except (OSError, ValueError) as e:
+        raise SourceError(f"Cannot read {path}: {e}") from None
+
+
+def _sourced(reader: SourceReader, prompt: Prompt, fn: Callable) -> Optional[Callable]:
+    target = SOURCE_ARGUMENTS.get(prompt.name)
+    if target is None:
+        return None
+    name = prompt.name
+    arguments = list(prompt.arguments or [])
+    for argument in arguments:
+        if argument.name == target:
+            argument.required = False
+    arguments.append(PromptArgument(
+        name=SOURCE_ARGUMENT,
+        description=f"Local file path or resource URI to read {target} from, instead of passing it inline",
+        required=False,
+    ))
+    prompt.arguments = arguments
+
+    async def render(**arguments: Any):
+        source = arguments.pop(SOURCE_ARGUMENT, None)
+        if source:
+            if arguments.get(target):
+                raise SourceError(f"{name}: pass either {target} or {SOURCE_ARGUMENT}, not both")
+            # Files and custom readers block on I/O; keep the event loop free.
+            arguments[target] = await anyio.to_thread.run_sync(reader.read, source)
+        elif target not in arguments:
+            raise SourceError(f"{name}: {target} or {SOURCE_ARGUMENT} is required")
+        return await render_awaited(fn, arguments)
+
+    render.__wrapped__ = fn
+    return render
+
+
+def install_sources(mcp: FastMCP, config: Optional[SourceConfig] = None) -> Optional[SourceReader]:
+    """Let the prompts in :data:`SOURCE_ARGUMENTS` take a ``source`` reference.
+
+    Install after the render cache, so cached renders are keyed by the text
+    read rather than by the reference.
+    """
+    config = config or SourceConfig.from_env([os.getcwd()])
+    if not config.enabled:
+        return None
+    reader = SourceReader(config)
+    wrap_prompts(mcp, lambda prompt, fn: _sourced(reader, prompt, fn), SOURCE_ARGUMENTS)
+    logger.debug("Source roots: %s", config.roots)
+    return reader
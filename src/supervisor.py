@@ -0,0 +1,203 @@
+"""Pre-fork supervisor for serving streamable HTTP from several processes.
+
+The supervisor builds the server (prompts, templates and the ASGI app) once,
+then forks ``workers`` processes that share it copy-on-write. Each worker
+runs its own uvicorn event loop on the listening socket:
+
+- by default the supervisor binds one socket and every worker accepts on it;
+- with ``reuse_port`` each worker binds its own ``SO_REUSEPORT`` socket and
+  the kernel balances new connections between them (Linux, BSD).
+
+Workers that exit unexpectedly are restarted, with a growing delay when they
+crash right after starting. ``SIGTERM`` or ``SIGINT`` stops the workers
+gracefully; any still running after ``graceful_timeout`` are killed.
+"""
+
+import gc
+import os
+import signal
+import socket
+import time
+from typing import Dict, List, Optional
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+
+from src.config import ServerConfig
+from src.logger import flush_logging, get_logger, shutdown_logging
+from src.metrics import get_metrics, start_snapshot_writer
+from src.server import http_app, uvicorn_server
+
+logger = get_logger("supervisor")
+
+# A worker that exits sooner than this after starting counts as a crash loop.
+MIN_UPTIME = 5.0
+MAX_RESTART_DELAY = 30.0
+POLL_INTERVAL = 0.2
+
+
+def bind_socket(config: ServerConfig, reuse_port: bool = False) -> socket.socket:
+    """Bind and listen on the configured address."""
+    family = socket.AF_INET6 if ":" in config.host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((config.host, config.port))
+    sock.listen(config.backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Worker:
+    """Bookkeeping for one worker slot."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.pid: Optional[int] = None
+        self.started = 0.0
+        self.failures = 0
+        self.restart_at = 0.0
+
+
+class Supervisor:
+    """Forks, watches and stops the worker processes."""
+
+    def __init__(self, tobe_mcp: FastMCP, config: ServerConfig):
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Multiple workers need os.fork, which this platform lacks")
+        if config.reuse_port and not hasattr(socket, "SO_REUSEPORT"):
+            raise RuntimeError("SO_REUSEPORT is not available on this platform")
+        self.tobe_mcp = tobe_mcp
+        self.config = config
+        self.workers = [Worker(index) for index in range(config.workers)]
+        self.socket: Optional[socket.socket] = None
+        self.stopping = False
+
+    def run(self):
+        """Serve until SIGTERM or SIGINT, then stop every worker."""
+        # Build the app before forking: its imports and objects are shared too.
+        app = http_app(self.tobe_mcp, self.config)
+        if not self.config.reuse_port:
+            self.socket = bind_socket(self.config)
+        previous = {
+            signum: signal.signal(signum, self._request_stop)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        logger.log_server_event("Supervisor starting", self.config.as_dict())
+        try:
+            for worker in self.workers:
+                self._spawn(worker, app)
+            while not self.stopping:
+                self._reap()
+                self._respawn(app)
+                time.sleep(POLL_INTERVAL)
+        finally:
+            self._stop_workers()
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+            if self.socket is not None:
+                self.socket.close()
+        logger.log_server_event("Supervisor stopped")
+
+    def _request_stop(self, signum, frame):
+        self.stopping = True
+
+    def _spawn(self, worker: Worker, app):
+        flush_logging()
+        # Objects created so far are never collected in the workers, which
+        # keeps their pages shared instead of touched by the garbage collector.
+        gc.freeze()
+        pid = os.fork()
+        if pid == 0:
+            self._worker_main(worker, app)
+        worker.pid = pid
+        worker.started = time.monotonic()
+        logger.info("Started worker %d (pid %d)", worker.index, pid)
+
+    def _worker_main(self, worker: Worker, app):
+        """Entry point of a forked worker; never returns."""
+        code = 0
+        try:
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, signal.SIG_DFL)
+            sock = self.socket or bind_socket(self.config, reuse_port=True)
+            snapshot_writer = start_snapshot_writer(get_metrics())
+            server = uvicorn_server(app, self.tobe_mcp, self.config)
+            try:
+                anyio.run(lambda: server.serve(sockets=[sock]))
+            finally:
+                if snapshot_writer is not None:
+                    snapshot_writer.stop()
+        except BaseException:
+            logger.exception("Worker %d failed", worker.index)
+            code = 1
+        finally:
+            shutdown_logging()
+            os._exit(code)
+
+    def _reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                for worker in self.workers:
+                    worker.pid = None
+                return
+            if pid == 0:
+                return
+            for worker in self.workers:
+                if worker.pid == pid:
+                    self._on_exit(worker, status)
+                    break
+
+    def _on_exit(self, worker: Worker, status: int):
+        worker.pid = None
+        if self.stopping:
+            return
+        uptime = time.monotonic() - worker.started
+        worker.failures = worker.failures + 1 if uptime < MIN_UPTIME else 0
+        delay = min(MAX_RESTART_DELAY, 0.5 * (2 ** worker.failures - 1))
+        worker.restart_at = time.monotonic() + delay
+        logger.warning(
+            "Worker %d exited (%s) after %.1fs; restarting in %.1fs",
+            worker.index, _describe_status(status), uptime, delay,
+        )
+
+    def _respawn(self, app):
+        now = time.monotonic()
+        for worker in self.workers:
+            if worker.pid is None and not self.stopping and now >= worker.restart_at:
+                self._spawn(worker, app)
+
+    def _stop_workers(self):
+        self._reap()
+        running = self._running()
+        for pid in running:
+            _signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.config.graceful_timeout
+        while self._running() and time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            self._reap()
+        for pid in self._running():
+            logger.warning("Killing worker pid %d after %.0fs", pid, self.config.graceful_timeout)
+            _signal(pid, signal.SIGKILL)
+        while self._running():
+            time.sleep(POLL_INTERVAL / 4)
+            self._reap()
+
+    def _running(self) -> List[int]:
+        return [worker.pid for worker in self.workers if worker.pid is not None]
+
+
+def _signal(pid: int, signum: int):
+    try:
+        os.kill(pid, signum)
+    except ProcessLookupError:
+        pass
+
+
+def _describe_status(status: int) -> str:
+    if os.WIFSIGNALED(status):
+        return f"signal {os.WTERMSIG(status)}"
+    return f"exit code {os.WEXITSTATUS(status)}"
@@ -0,0 +1,355 @@
+"""Compiled prompt templates for TOBE MCP Server.
+
+Prompt bodies are parsed once, when a module's ``*_prompt(mcp)`` registration
+function runs, into a flat table of static segments and argument slots.
+Rendering a request is then a single ``"".join`` over that table.
+
+Template syntax:
+
+- ``{name}`` inserts ``str(value)``.
+- ``{name?prefix}`` inserts ``prefix + str(value)`` when the value is truthy,
+  and nothing otherwise.
+- ``{name|fallback}`` inserts ``str(value)``, or ``fallback`` when the value
+  is falsy.
+- ``{{`` and ``}}`` are literal braces.
+
+Names passed as constants to :func:`compile_prompt` are folded into the static
+segments at compile time, so they cost nothing per request. Template sources
+and string constants are whitespace-compacted at compile time unless
+compaction is disabled (see :mod:`src.compaction`).
+"""
+
+import re
+import types
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from mcp.server.fastmcp.prompts.base import Message
+from mcp.types import TextContent
+
+from src import compaction
+
+# Slot kinds
+PLAIN = ""
+PREFIX = "?"
+FALLBACK = "|"
+
+
+# A "{name?prefix}" slot alone on its line, with the line break(s) before it.
+_OPTIONAL_LINE = re.compile(r"(\n{1,2})\{(\w+)\?([^{}\n]*)\}(?=\n|$)")
+
+
+class TemplateError(ValueError):
+    """Raised when a template cannot be parsed or rendered."""
+
+
+class Slot:
+    """An argument slot inside a template."""
+
+    __slots__ = ("name", "kind", "text")
+
+    def __init__(self, name: str, kind: str = PLAIN, text: str = ""):
+        self.name = name
+        self.kind = kind
+        self.text = text
+
+    def render(self, value: Any) -> str:
+        if self.kind == PREFIX:
+            return self.text + str(value) if value else ""
+        if self.kind == FALLBACK:
+            return str(value) if value else self.text
+        return str(value)
+
+    def __repr__(self) -> str:
+        return f"Slot({self.name!r}, {self.kind!r}, {self.text!r})"
+
+
+def parse(source: str) -> List[Any]:
+    """Split a template into a list of static strings and :class:`Slot` objects."""
+    segments: List[Any] = []
+    buffer: List[str] = []
+    i = 0
+    n = len(source)
+    while i < n:
+        char = source[i]
+        if char == "{" and source.startswith("{{", i):
+            buffer.append("{")
+            i += 2
+        elif char == "}" and source.startswith("}}", i):
+            buffer.append("}")
+            i += 2
+        elif char == "{":
+            end = source.find("}", i)
+            if end == -1:
+                raise TemplateError(f"Unclosed slot at offset {i}")
+            segments.append("".join(buffer))
+            buffer = []
+            segments.append(_parse_slot(source[i + 1:end], i))
+            i = end + 1
+        elif char == "}":
+            raise TemplateError(f"Single '}}' at offset {i}")
+        else:
+            nxt = _next_brace(source, i)
+            buffer.append(source[i:nxt])
+            i = nxt
+    segments.append("".join(buffer))
+    return [s for s in segments if s != ""]
+
+
+def unparse(segments: Iterable[Any]) -> str:
+    """Turn segments from :func:`parse` back into template source."""
+    parts = []
+    for segment in segments:
+        if isinstance(segment, str):
+            parts.append(segment.replace("{", "{{").replace("}", "}}"))
+        else:
+            parts.append("{%s%s%s}" % (segment.name, segment.kind, segment.text))
+    return "".join(parts)
+
+
+def _next_brace(source: str, start: int) -> int:
+    candidates = [p for p in (source.find("{", start), source.find("}", start)) if p != -1]
+    return min(candidates) if candidates else len(source)
+
+
+def _parse_slot(body: str, offset: int) -> Slot:
+    for kind in (PREFIX, FALLBACK):
+        name, sep, text = body.partition(kind)
+        if sep:
+            break
+    else:
+        name, kind, text = body, PLAIN, ""
+    if not name.isidentifier():
+        raise TemplateError(f"Invalid slot name {name!r} at offset {offset}")
+    return Slot(name, kind, text)
+
+
+def _generate(segments: Sequence[Any], code: Optional[types.CodeType] = None):
+    """Generate a render function that joins ``segments`` in one expression.
+
+    ``code`` is the ``__code__`` of a function generated earlier for the same
+    segments (see :mod:`src.bundle`); it is reused instead of compiling.
+    """
+    namespace: Dict[str, Any] = {"str": str}
+    items = []
+    for i, segment in enumerate(segments):
+        if isinstance(segment, str):
+            namespace[f"s{i}"] = segment
+            items.append(f"s{i}")
+            continue
+        value = f"v[{segment.name!r}]"
+        namespace[f"t{i}"] = segment.text
+        if segment.kind == PREFIX:
+            items.append(f"(t{i} + str({value}) if {value} else '')")
+        elif segment.kind == FALLBACK:
+            items.append(f"(str({value}) if {value} else t{i})")
+        else:
+            items.append(f"str({value})")
+    if code is not None:
+        return types.FunctionType(code, namespace, "render")
+    source = f"def render(v):\n    return ''.join(({''.join(item + ', ' for item in items)}))\n"
+    exec(compile(source, "<template>", "exec"), namespace)
+    return namespace["render"]
+
+
+class Template:
+    """A parsed template body: static segments interleaved with argument slots."""
+
+    __slots__ = ("segments", "slots", "_render")
+
+    def __init__(self, segments: Iterable[Any], code: Optional[types.CodeType] = None):
+        merged: List[Any] = []
+        for segment in segments:
+            if isinstance(segment, str) and merged and isinstance(merged[-1], str):
+                merged[-1] += segment
+            elif segment != "":
+                merged.append(segment)
+        self.segments: Tuple[Any, ...] = tuple(merged)
+        self.slots: Tuple[Slot, ...] = tuple(s for s in merged if isinstance(s, Slot))
+        self._render = _generate(self.segments, code)
+
+    @classmethod
+    def compile(cls, source: str, constants: Optional[Dict[str, Any]] = None) -> "Template":
+        """Parse ``source`` and fold ``constants`` into the static segments."""
+        segments = parse(source)
+        if constants:
+            segments = [
+                s.render(constants[s.name])
+                if isinstance(s, Slot) and s.name in constants else s
+                for s in segments
+            ]
+        return cls(segments)
+
+    def table(self) -> Tuple[Any, ...]:
+        """Segments as plain data: strings and ``(name, kind, text)`` tuples."""
+        return tuple(s if isinstance(s, str) else (s.name, s.kind, s.text) for s in self.segments)
+
+    @classmethod
+    def from_table(cls, table: Iterable[Any], code: Optional[types.CodeType] = None) -> "Template":
+        """Rebuild a template from :meth:`table`, optionally with its generated code."""
+        return cls((s if isinstance(s, str) else Slot(*s) for s in table), code)
+
+    @property
+    def code(self) -> types.CodeType:
+        return self._render.__code__
+
+    @property
+    def is_static(self) -> bool:
+        return not self.slots
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(s.name for s in self.slots))
+
+    def render(self, values: Dict[str, Any]) -> str:
+        try:
+            return self._render(values)
+        except KeyError as e:
+            raise TemplateError(f"Missing value for slot {e.args[0]!r}") from None
+
+    def __repr__(self) -> str:
+        return f"Template({self.segments!r})"
+
+
+def build_message(role: str, text: str, meta: Optional[Dict[str, Any]] = None) -> Message:
+    """Build a prompt message without per-call pydantic validation."""
+    fields: Dict[str, Any] = {"type": "text", "text": text}
+    if meta is not None:
+        fields["meta"] = meta
+    return Message.model_construct(role=role, content=TextContent.model_construct(**fields))
+
+
+def _message_factory(prototype: Message):
+    """Return a function building copies of ``prototype`` with new text.
+
+    Pydantic validation is skipped on purpose: the role and content type are
+    fixed at compile time, only the text changes per request.
+    """
+    new = object.__new__
+    setattr_ = object.__setattr__
+    message_cls = prototype.__class__
+    message_fields = prototype.__pydantic_fields_set__
+    role = prototype.role
+    content = prototype.content
+    content_cls = content.__class__
+    content_fields = content.__pydantic_fields_set__
+    content_dict = content.__dict__
+    content_has_extra = content.__pydantic_extra__ is not None
+
+    def factory(text: str) -> Message:
+        body = new(content_cls)
+        setattr_(body, "__dict__", {**content_dict, "text": text})
+        setattr_(body, "__pydantic_fields_set__", content_fields)
+        setattr_(body, "__pydantic_extra__", {} if content_has_extra else None)
+        setattr_(body, "__pydantic_private__", None)
+        message = new(message_cls)
+        setattr_(message, "__dict__", {"role": role, "content": body})
+        setattr_(message, "__pydantic_fields_set__", message_fields)
+        setattr_(message, "__pydantic_extra__", None)
+        setattr_(message, "__pydantic_private__", None)
+        return message
+
+    return factory
+
+
+def with_meta(message: Message, key: str, value: Any) -> Message:
+    """A copy of ``message`` whose content ``_meta`` also maps ``key`` to ``value``.
+
+    Like :func:`_message_factory`, copies the instance dicts instead of
+    validating; ``message`` itself, which may be cached, is left unchanged.
+    """
+    new = object.__new__
+    setattr_ = object.__setattr__
+    content = message.content
+    body = new(content.__class__)
+    setattr_(body, "__dict__", {**content.__dict__, "meta": {**(content.meta or {}), key: value}})
+    setattr_(body, "__pydantic_fields_set__", content.__pydantic_fields_set__ | {"meta"})
+    setattr_(body, "__pydantic_extra__", content.__pydantic_extra__)
+    setattr_(body, "__pydantic_private__", None)
+    copy = new(message.__class__)
+    setattr_(copy, "__dict__", {**message.__dict__, "content": body})
+    setattr_(copy, "__pydantic_fields_set__", message.__pydantic_fields_set__)
+    setattr_(copy, "__pydantic_extra__", message.__pydantic_extra__)
+    setattr_(copy, "__pydantic_private__", None)
+    return copy
+
+
+class MessageTemplate:
+    """A compiled message: fixed role plus a template for its text content.
+
+    ``meta`` is attached to the content of every rendered message as ``_meta``.
+    """
+
+    __slots__ = ("role", "template", "meta", "prototype", "_factory")
+
+    def __init__(self, role: str, template: Template, meta: Optional[Dict[str, Any]] = None):
+        self.role = role
+        self.template = template
+        self.meta = meta
+        self.prototype = build_message(role, template.render({}) if template.is_static else "", meta)
+        self._factory = _message_factory(self.prototype)
+
+    def render(self, values: Dict[str, Any]) -> Message:
+        if self.template.is_static:
+            return self.prototype
+        return self._factory(self.template.render(values))
+
+
+class PromptTemplate:
+    """A compiled prompt: an ordered list of message templates."""
+
+    __slots__ = ("messages",)
+
+    def __init__(self, messages: Sequence[MessageTemplate]):
+        self.messages = tuple(messages)
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(n for m in self.messages for n in m.template.names))
+
+    def render(self, **values: Any) -> List[Message]:
+        return [message.render(values) for message in self.messages]
+
+    def static_prefix(self) -> Tuple[int, int]:
+        """Where the text stops being the same for every request.
+
+        Returns the number of leading messages without slots and the length of
+        the static text at the start of the message after them.
+        """
+        for index, message in enumerate(self.messages):
+            if not message.template.is_static:
+                first = message.template.segments[0]
+                return index, len(first) if isinstance(first, str) else 0
+        return len(self.messages), 0
+
+    def render_text(self, **values: Any) -> List[Tuple[str, str]]:
+        """Render to ``(role, text)`` pairs without building message objects."""
+        return [(m.role, m.template.render(values)) for m in self.messages]
+
+
+def compile_prompt(
+    messages: Sequence[Tuple[str, str]], compact: Optional[bool] = None, **constants: Any
+) -> PromptTemplate:
+    """Compile ``(role, template)`` pairs into a :class:`PromptTemplate`.
+
+    ``compact`` defaults to :func:`src.compaction.is_enabled`.
+    """
+    if compact is None:
+        compact = compaction.is_enabled()
+    if compact:
+        messages = [(role, compaction.compact_text(source)) for role, source in messages]
+        constants = {
+            name: compaction.compact_text(value) if isinstance(value, str) else value
+            for name, value in constants.items()
+        }
+    return PromptTemplate(
+        [MessageTemplate(role, Template.compile(fold_optional_lines(source), constants)) for role, source in messages]
+    )
+
+
+def fold_optional_lines(source: str) -> str:
+    """Move the line break before a lone ``{name?prefix}`` slot into its prefix.
+
+    The slot's line, and one adjacent blank line, then disappear when the
+    value is empty instead of leaving a run of blank lines behind.
+    """
+    return _OPTIONAL_LINE.sub(lambda m: "{%s?%s%s}" % (m.group(2), m.group(1), m.group(3)), source)
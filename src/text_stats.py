@@ -0,0 +1,291 @@
+"""Deterministic text statistics for the writing prompts.
+
+:func:`analyze` computes word and character counts, sentence and paragraph
+length distributions, readability and repetition in one left-to-right pass
+over the text: a single regular expression yields words, Chinese runs,
+sentence ends and paragraph breaks, and every figure is updated as tokens go
+by. Time and memory grow linearly with the text (per-sentence lengths and a
+word frequency table are the only collections kept). A single line break
+ends a sentence only next to a heading or list item; the lines of a
+hard-wrapped paragraph are joined.
+
+Chinese has no spaces, so every Han character counts as one word, as in the
+usual Chinese word count. English readability (Flesch) is computed from the
+English words alone, the sentences containing them and estimated syllables,
+and is reported only when most of the words are English: the formulas mean
+nothing for Chinese.
+
+    python -m src.text_stats article.md   # print the metrics block
+"""
+
+import re
+import sys
+from collections import Counter
+from typing import Dict, List
+
+# Han ideographs, extension A and compatibility ideographs.
+_HAN = "㐀-䶿一-鿿豈-﫿"
+
+_TOKEN = re.compile(
+    rf"(?P<han>[{_HAN}]+)"
+    r"|(?P<number>\d+(?:[.,:]\d+)*)"
+    r"|(?P<word>[^\W\d_]+(?:['’-][^\W\d_]+)*)"
+    r"|(?P<end>[.!?]+(?=[\s\"'”’)\]]|$)|[。！？!?]+|…+)"
+    r"|(?P<paragraph>\n[ \t]*\n\s*)"
+    r"|(?P<line>\n)"
+)
+_VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+# A heading or list item line: "# Title", "- item", "* item", "1. item".
+_BLOCK_LINE = re.compile(r"[ \t]*(?:#|[-*+][ \t]|\d+[.)][ \t])")
+
+# Excluded from "most repeated" terms.
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have he her his i in is it its of on or our she so that the "
+    "their them they this to was we were will with you your not no do does did can could would should "
+    "than then there these those which who what when where how all any also been more most other some such".split()
+)
+LONG_SENTENCE_WORDS = 25
+TOP_TERMS = 5
+
+
+def syllables(word: str) -> int:
+    """Estimated English syllables: vowel groups, minus a silent final e."""
+    groups = len(_VOWEL_GROUPS.findall(word))
+    if word.endswith("e") and not word.endswith(("le", "ee")) and groups > 1:
+        groups -= 1
+    return max(1, groups)
+
+
+class TextStats:
+    """Figures computed by :func:`analyze`."""
+
+    def __init__(self):
+        self.characters = 0
+        self.non_space_characters = 0
+        self.english_words = 0
+        self.han_characters = 0
+        self.numbers = 0
+        self.syllables = 0
+        self.english_sentences = 0
+        self.sentence_lengths: List[int] = []
+        self.paragraph_lengths: List[int] = []
+        self.paragraph_sentences: List[int] = []
+        self.terms: Counter = Counter()
+        self.duplicate_sentences = 0
+        self.doubled_words = 0
+
+    @property
+    def words(self) -> int:
+        return self.english_words + self.han_characters + self.numbers
+
+    @property
+    def lexical_diversity(self) -> float:
+        counted = sum(self.terms.values())
+        return len(self.terms) / counted if counted else 0.0
+
+    def flesch(self):
+        """(reading ease, grade level) of the English text, or ``None``."""
+        sentences = self.english_sentences
+        if not sentences or self.english_words * 2 < self.words:
+            return None
+        words_per_sentence = self.english_words / sentences
+        syllables_per_word = self.syllables / self.english_words
+        ease = 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word
+        grade = 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59
+        return ease, grade
+
+    def most_repeated(self, count: int = TOP_TERMS):
+        return [(term, n) for term, n in self.terms.most_common(count) if n > 1]
+
+    def as_dict(self) -> Dict[str, object]:
+        flesch = self.flesch()
+        return {
+            "characters": self.characters,
+            "non_space_characters": self.non_space_characters,
+            "words": self.words,
+            "english_words": self.english_words,
+            "han_characters": self.han_characters,
+            "sentences": _distribution(self.sentence_lengths),
+            "paragraphs": _distribution(self.paragraph_lengths),
+            "sentences_per_paragraph": _distribution(self.paragraph_sentences),
+            "long_sentences": sum(1 for n in self.sentence_lengths if n > LONG_SENTENCE_WORDS),
+            "flesch_reading_ease": round(flesch[0], 1) if flesch else None,
+            "flesch_kincaid_grade": round(flesch[1], 1) if flesch else None,
+            "lexical_diversity": round(self.lexical_diversity, 3),
+            "most_repeated": self.most_repeated(),
+            "duplicate_sentences": self.duplicate_sentences,
+            "doubled_words": self.doubled_words,
+        }
+
+    def summary(self) -> str:
+        """A compact Markdown block for a prompt."""
+        if not self.words:
+            return "- No words found."
+        sentences = _distribution(self.sentence_lengths)
+        paragraphs = _distribution(self.paragraph_lengths)
+        per_paragraph = _distribution(self.paragraph_sentences)
+        words = f"{self.words:,}"
+        if self.han_characters and (self.english_words or self.numbers):
+            words += f" ({self.english_words:,} English, {self.han_characters:,} Chinese characters)"
+        elif self.han_characters:
+            words += " (Chinese characters)"
+        lines = [
+            f"- Words: {words}; characters: {self.characters:,} ({self.non_space_characters:,} excluding spaces)",
+            f"- Sentences: {sentences['count']:,}; words per sentence: mean {sentences['mean']}, "
+            f"median {sentences['median']}, p90 {sentences['p90']}, max {sentences['max']}; "
+            f"over {LONG_SENTENCE_WORDS} words: {sum(1 for n in self.sentence_lengths if n > LONG_SENTENCE_WORDS):,}",
+            f"- Paragraphs: {paragraphs['count']:,}; words per paragraph: mean {paragraphs['mean']}, "
+            f"max {paragraphs['max']}; sentences per paragraph: mean {per_paragraph['mean']}",
+        ]
+        flesch = self.flesch()
+        if flesch:
+            ease, grade = flesch
+            lines.append(
+                f"- Readability: Flesch reading ease {ease:.1f} ({_ease_label(ease)}), "
+                f"Flesch-Kincaid grade {max(grade, 0):.1f}"
+            )
+        repeated = ", ".join(f"{term} ({n})" for term, n in self.most_repeated()) or "none"
+        lines.append(
+            f"- Repetition: lexical diversity {self.lexical_diversity:.2f}; most repeated: {repeated}; "
+            f"duplicate sentences: {self.duplicate_sentences}; doubled words: {self.doubled_words}"
+        )
+        return "\n".join(lines)
+
+
+def _distribution(values: List[int]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0, "mean": 0, "median": 0, "p90": 0, "max": 0}
+    # Counting, not sorting: lengths repeat a lot, so this stays linear.
+    counts = sorted(Counter(values).items())
+    total = len(values)
+    ranks = {"median": total // 2, "p90": min(total - 1, int(total * 0.9))}
+    result = {"count": total, "mean": round(sum(values) / total, 1), "max": counts[-1][0]}
+    seen = 0
+    for value, count in counts:
+        seen += count
+        for key, rank in list(ranks.items()):
+            if rank < seen:
+                result[key] = value
+                del ranks[key]
+        if not ranks:
+            break
+    return result
+
+
+def _ease_label(ease: float) -> str:
+    for bound, label in ((90, "very easy"), (70, "easy"), (60, "standard"), (50, "fairly difficult"), (30, "difficult")):
+        if ease >= bound:
+            return label
+    return "very difficult"
+
+
+def analyze(text: str) -> TextStats:
+    """Compute :class:`TextStats` for ``text`` in a single pass."""
+    stats = TextStats()
+    stats.characters = len(text)
+    stats.non_space_characters = len(text) - sum(map(text.count, " \t\n\r\u3000"))
+    terms = stats.terms
+    sentence_lengths = stats.sentence_lengths
+    syllable_cache: Dict[str, int] = {}
+    seen_sentences = set()
+    english_words = han_characters = numbers = syllable_total = doubled = 0
+    sentence_words = sentence_english = paragraph_words = paragraph_sentences = 0
+    sentence_key: List[str] = []
+    previous = None
+    previous_end = 0
+
+    def end_sentence():
+        nonlocal sentence_words, sentence_english, paragraph_sentences
+        if sentence_words:
+            sentence_lengths.append(sentence_words)
+            if sentence_english:
+                stats.english_sentences += 1
+            paragraph_sentences += 1
+            key = hash(tuple(sentence_key))
+            if key in seen_sentences:
+                stats.duplicate_sentences += 1
+            else:
+                seen_sentences.add(key)
+        sentence_words = sentence_english = 0
+        sentence_key.clear()
+
+    def end_paragraph():
+        nonlocal paragraph_words, paragraph_sentences
+        end_sentence()
+        if paragraph_words:
+            stats.paragraph_lengths.append(paragraph_words)
+            stats.paragraph_sentences.append(paragraph_sentences)
+        paragraph_words = 0
+        paragraph_sentences = 0
+
+    for match in _TOKEN.finditer(text):
+        kind = match.lastgroup
+        if kind == "word":
+            word = match.group().lower()
+            english_words += 1
+            count = syllable_cache.get(word)
+            if count is None:
+                count = syllable_cache[word] = syllables(word)
+            syllable_total += count
+            if word not in STOP_WORDS and len(word) > 2:
+                terms[word] += 1
+            start = match.start()
+            # "the the", but not "data, data": only whitespace in between.
+            if word == previous and text[previous_end:start].isspace():
+                doubled += 1
+            previous = word
+            previous_end = match.end()
+            sentence_words += 1
+            sentence_english += 1
+            paragraph_words += 1
+            sentence_key.append(word)
+        elif kind == "han":
+            run = match.group()
+            size = len(run)
+            han_characters += size
+            sentence_words += size
+            paragraph_words += size
+            sentence_key.append(run)
+            # Chinese terms: character bigrams within the run.
+            if size > 1:
+                terms.update([run[i:i + 2] for i in range(size - 1)])
+            previous = None
+        elif kind == "number":
+            numbers += 1
+            sentence_words += 1
+            paragraph_words += 1
+            sentence_key.append(match.group())
+            previous = None
+        elif kind == "end":
+            end_sentence()
+            previous = None
+        elif kind == "paragraph":
+            end_paragraph()
+            previous = None
+        else:
+            # A single line break ends a heading or list item, not a paragraph;
+            # inside a hard-wrapped paragraph it is only whitespace.
+            start = match.start()
+            if _BLOCK_LINE.match(text, text.rfind("\n", 0, start) + 1) or _BLOCK_LINE.match(text, start + 1):
+                end_sentence()
+    end_paragraph()
+    stats.english_words = english_words
+    stats.han_characters = han_characters
+    stats.numbers = numbers
+    stats.syllables = syllable_total
+    stats.doubled_words = doubled
+    return stats
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    if path is None:
+        text = sys.stdin.read()
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    print(analyze(text).summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""MCP tools of the TOBE MCP server."""
+
+from mcp.server.fastmcp import FastMCP
+
+from src.artifacts import artifacts_enabled
+from src.tools.artifacts import artifact_tool
+from src.tools.batch import batch_tool
+
+
+def register_tools(mcp: FastMCP):
+    """Register every tool on ``mcp``."""
+    batch_tool(mcp)
+    if artifacts_enabled():
+        artifact_tool(mcp)
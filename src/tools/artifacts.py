@@ -0,0 +1,63 @@
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+
+from src.artifacts import ARTIFACT_SCHEME, get_artifact_store
+from src.logger import get_logger
+from src.sources import SourceError, register_reader
+
+
+def read_artifact_source(uri: str) -> str:
+    """Source reader for ``artifact://<key>`` references."""
+    artifact = get_artifact_store().get(urlsplit(uri).netloc)
+    if artifact is None:
+        raise SourceError(f"No artifact {uri}")
+    return artifact["content"]
+
+
+def artifact_tool(mcp: FastMCP):
+
+    logger = get_logger("artifact_tool")
+
+    @mcp.tool(
+        name="save_artifact",
+        description="Save the output generated for a prompt and its arguments, so it can be reused instead of regenerated.",
+    )
+    async def save_artifact(
+        prompt: str, arguments: Dict[str, Any], content: str, metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        saved = await anyio.to_thread.run_sync(get_artifact_store().put, prompt, arguments, content, metadata)
+        logger.info("Saved artifact %s for %s (%d bytes)", saved["key"], prompt, saved["size"])
+        return saved
+
+    @mcp.tool(
+        name="find_artifact",
+        description="Look up a previously saved output for a prompt and its arguments before generating it again.",
+    )
+    async def find_artifact(prompt: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        artifact = await anyio.to_thread.run_sync(get_artifact_store().lookup, prompt, arguments)
+        return {"found": artifact is not None, "artifact": artifact}
+
+    @mcp.tool(
+        name="list_artifacts",
+        description="List saved outputs, newest first, optionally for one prompt and no older than max_age seconds.",
+    )
+    async def list_artifacts(prompt: Optional[str] = None, max_age: Optional[float] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        return await anyio.to_thread.run_sync(get_artifact_store().list, prompt, max_age, max(1, min(limit, 1000)))
+
+    @mcp.resource(
+        f"{ARTIFACT_SCHEME}://{{key}}",
+        name="artifact",
+        description="The content of a saved artifact",
+        mime_type="text/markdown",
+    )
+    async def artifact_resource(key: str) -> str:
+        artifact = await anyio.to_thread.run_sync(get_artifact_store().get, key)
+        if artifact is None:
+            raise ValueError(f"No artifact {key}")
+        return artifact["content"]
+
+    # Prompts taking a ``source`` can read a saved artifact directly.
+    register_reader(ARTIFACT_SCHEME, read_artifact_source)
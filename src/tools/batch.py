@@ -0,0 +1,50 @@
+import os
+from typing import Any, Dict, List, Optional
+
+import anyio
+from mcp.server.fastmcp import Context, FastMCP
+from pydantic import BaseModel, Field
+
+from src.batch import default_workers, render_batch
+from src.logger import get_logger
+
+
+class PromptRequest(BaseModel):
+    prompt: str = Field(description="Prompt name")
+    arguments: Dict[str, Any] = Field(default_factory=dict, description="Prompt arguments")
+
+
+def max_batch_items() -> int:
+    return int(os.environ.get("TOBE_MCP_BATCH_MAX_ITEMS", "10000"))
+
+
+def batch_tool(mcp: FastMCP):
+
+    logger = get_logger("batch_tool")
+
+    @mcp.tool(
+        name="render_prompts",
+        description="Render many prompts in one call. Each result carries the rendered messages or its own error.",
+    )
+    async def render_prompts(
+        items: List[PromptRequest],
+        ordered: bool = True,
+        max_parallel: Optional[int] = None,
+        ctx: Optional[Context] = None,
+    ) -> List[Dict[str, Any]]:
+        limit = max_batch_items()
+        if len(items) > limit:
+            raise ValueError(f"A batch takes at most {limit} items, got {len(items)}")
+        workers = max(1, min(max_parallel or default_workers(), default_workers(), len(items) or 1))
+        logger.info("Rendering a batch of %d prompts with %d workers", len(items), workers)
+
+        def run() -> List[Dict[str, Any]]:
+            results = []
+            pairs = [(item.prompt, item.arguments) for item in items]
+            for result in render_batch(mcp, pairs, workers=workers, ordered=ordered):
+                results.append(result.as_dict())
+                if ctx is not None:
+                    anyio.from_thread.run(ctx.report_progress, len(results), len(items))
+            return results
+
+        return await anyio.to_thread.run_sync(run)
@@ -0,0 +1,25 @@
+from typing import Any, Dict, Optional
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+
+from src.codeindex import CodeIndexer
+from src.logger import get_logger
+
+
+def code_index_tool(mcp: FastMCP, indexer: CodeIndexer):
+
+    logger = get_logger("code_index_tool")
+
+    @mcp.tool(
+        name="index_codebase",
+        description=(
+            "Index a local repository and return a compact map of its modules and top-level symbols. "
+            "Only files changed since the last call are parsed again. Pass the design requirements as "
+            "query to keep the most relevant files when the map is cut to max_tokens."
+        ),
+    )
+    async def index_codebase(path: str, query: str = "", max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        summary, stats = await anyio.to_thread.run_sync(indexer.summary, path, query, max_tokens)
+        logger.info("Indexed %s: %d files, %d parsed in %.3fs", path, stats["files"], stats["parsed"], stats["seconds"])
+        return {**stats, "map": summary}
@@ -0,0 +1,46 @@
+"""The precompiled bundle must survive installation: new paths, new mtimes."""
+
+import os
+import shutil
+
+import pytest
+
+from src.bundle import load_bundle, write_bundle
+from src.prompt_store import DATA_DIR, PromptStore, load_directory
+
+
+@pytest.fixture
+def installed(tmp_path):
+    """A bundle built from the source tree, and a copy of the data files made
+    the way an installer copies them: elsewhere, with fresh modification times."""
+    bundle = tmp_path / "site-packages" / "bundle.bin"
+    bundle.parent.mkdir()
+    write_bundle(bundle, DATA_DIR)
+    data = tmp_path / "site-packages" / "data"
+    shutil.copytree(DATA_DIR, data, copy_function=shutil.copyfile)
+    for path in data.rglob("*.toml"):
+        os.utime(path, ns=(1, 1))
+    return bundle, data
+
+
+def test_installed_bundle_is_loaded(installed):
+    bundle, data = installed
+    specs = load_bundle(data, bundle)
+    assert specs is not None
+    assert set(specs) == set(load_directory(DATA_DIR))
+    assert all(data in spec.path.parents for spec in specs.values())
+
+
+def test_prompt_store_uses_installed_bundle(installed, monkeypatch):
+    bundle, data = installed
+    monkeypatch.setenv("TOBE_MCP_PROMPT_BUNDLE", str(bundle))
+    specs = PromptStore(data).specs
+    # Specs read from the bundle arrive compiled; from source they compile on first use.
+    assert specs and all(spec._compiled is not None for spec in specs.values())
+
+
+def test_edited_data_file_makes_bundle_stale(installed):
+    bundle, data = installed
+    path = next(data.rglob("*.toml"))
+    path.write_text(path.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    assert load_bundle(data, bundle) is None
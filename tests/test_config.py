@@ -0,0 +1,30 @@
+"""Boolean settings read from JSON mean the same as in the environment."""
+
+import pytest
+
+from src.budgets import BudgetConfig
+from src.cache import RenderCacheConfig
+from src.config import ServerConfig, parse_flag
+from src.instrumentation import InstrumentationConfig
+
+
+@pytest.mark.parametrize("value", [False, 0, "0", "false", "False", "no", "off", " OFF "])
+def test_false_values(value):
+    assert parse_flag(value) is False
+
+
+@pytest.mark.parametrize("value", [True, 1, "1", "true", "yes", "on"])
+def test_true_values(value):
+    assert parse_flag(value) is True
+
+
+@pytest.mark.parametrize("config", [BudgetConfig, RenderCacheConfig, InstrumentationConfig])
+def test_string_false_disables(config):
+    settings = config.from_dict({"enabled": "false", "prompts": {"review": {"enabled": "off"}}})
+    assert settings.enabled is False
+    assert settings.prompts["review"].enabled is False
+
+
+def test_server_flags_from_strings():
+    config = ServerConfig.from_dict({"stateless_http": "false", "json_response": "no", "reuse_port": "0"})
+    assert (config.stateless_http, config.json_response, config.reuse_port) == (False, False, False)
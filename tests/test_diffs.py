@@ -0,0 +1,58 @@
+"""Reading a repository's diff must not run programs its configuration names."""
+
+import shutil
+import subprocess
+
+import pytest
+
+from src.diffs import DiffConfig, DiffReader
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def _git(repository, *args):
+    subprocess.run(["git", "-C", str(repository), *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def hostile(tmp_path):
+    """A repository with an uncommitted change and every command hook configured."""
+    repository = tmp_path / "repo"
+    repository.mkdir()
+    ran = tmp_path / "ran"
+    ran.mkdir()
+    _git(repository, "init", "-q")
+    (repository / "notes.txt").write_text("first\n")
+    (repository / ".gitattributes").write_text("*.txt filter=evil diff=evil\n")
+    _git(repository, "add", ".")
+    _git(repository, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "initial")
+    hook = tmp_path / "hook.sh"
+    hook.write_text(f'#!/bin/sh\ntouch "{ran}/$1"\ncat "${{2:-/dev/null}}" 2>/dev/null\n')
+    hook.chmod(0o755)
+    for key, name in (
+        ("core.fsmonitor", "fsmonitor"),
+        ("filter.evil.clean", "clean"),
+        ("filter.evil.process", "process"),
+        ("diff.evil.textconv", "textconv"),
+        ("diff.evil.command", "command"),
+        ("diff.external", "external"),
+    ):
+        _git(repository, "config", key, f"{hook} {name}")
+    (repository / "notes.txt").write_text("second\n")
+    return repository, ran
+
+
+def test_configured_commands_never_run(hostile):
+    repository, ran = hostile
+    text = DiffReader(DiffConfig(roots=[str(repository.parent)])).read(str(repository))
+    assert "+second" in text and "-first" in text
+    assert sorted(path.name for path in ran.iterdir()) == []
+
+
+def test_fixture_hooks_do_run_under_plain_git(hostile):
+    # Guards the test above: the hooks are live for an unprotected git diff.
+    repository, ran = hostile
+    subprocess.run(["git", "-C", str(repository), "diff", "HEAD"], capture_output=True)
+    names = {path.name for path in ran.iterdir()}
+    # A filter's process command, where configured, replaces its clean command.
+    assert "fsmonitor" in names and names & {"clean", "process"}
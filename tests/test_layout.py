@@ -0,0 +1,31 @@
+"""The stable layout must render a byte-identical prefix whatever the arguments."""
+
+import logging
+
+import pytest
+
+from src.layout import CACHE_META, STABLE, check_prefix, compile_spec
+from src.prompt_store import DATA_DIR, load_directory
+
+SPECS = load_directory(DATA_DIR)
+
+
+def test_stable_prefix_is_identical_across_arguments(capsys):
+    try:
+        passed = check_prefix()
+    finally:
+        logging.disable(logging.NOTSET)
+    assert passed, capsys.readouterr().out
+
+
+@pytest.mark.parametrize("name", sorted(SPECS))
+def test_stable_layout_marks_the_cache_breakpoint(name):
+    template = compile_spec(SPECS[name], STABLE)
+    static, static_chars = template.static_prefix()
+    meta = [message.prototype.content.meta[CACHE_META] for message in template.messages]
+    assert [entry["static"] for entry in meta] == [index < static for index in range(len(meta))]
+    last = meta[static - 1]
+    assert last["breakpoint"] is True
+    assert last["prefix_chars"] > 0 and len(last["prefix_digest"]) == 32
+    assert meta[static]["static_chars"] == static_chars
+    assert sum(1 for entry in meta if entry.get("breakpoint")) == 1
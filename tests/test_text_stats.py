@@ -0,0 +1,21 @@
+"""Line breaks end headings and list items, not the lines of a wrapped paragraph."""
+
+from src.text_stats import analyze
+
+WRAPPED = (
+    "Performance work starts with a measurement that everyone on the team\n"
+    "agrees on, because without a shared number every change looks like an\n"
+    "improvement to somebody and the discussion never settles on anything.\n"
+)
+
+
+def test_hard_wrapped_paragraph_is_one_sentence():
+    stats = analyze(WRAPPED)
+    assert stats.sentence_lengths == [33]
+    assert stats.as_dict()["long_sentences"] == 1
+    assert stats.paragraph_sentences == [1]
+
+
+def test_headings_and_list_items_end_at_the_line_break():
+    stats = analyze("# Results\nThe numbers\n- faster builds\n* smaller images\n+ fewer retries\n")
+    assert stats.sentence_lengths == [1, 2, 2, 2, 2]